@@ -0,0 +1,91 @@
+# ai-code-reviewer/benchmarks/corpus.py
+import argparse
+import os
+import random
+from typing import List
+
+# Literals mixed into the generated code; 0, 1 and -1 are below the magic-number threshold
+NUMERIC_LITERALS = [0, 1, 2, 3, 7, 10, 42, 60, 100, 255, 404, 1000, 1024, 3600, 86400, 0.5, 3.14, 9.81, 1e-6]
+WORDS = ["value", "total", "count", "limit", "offset", "size", "rate", "delay", "score", "index"]
+
+
+def _literal(rng: random.Random) -> str:
+    return repr(rng.choice(NUMERIC_LITERALS))
+
+
+def _expression(rng: random.Random, names: List[str], literal_density: float) -> str:
+    terms = []
+    for _ in range(rng.randint(1, 4)):
+        terms.append(_literal(rng) if rng.random() < literal_density else rng.choice(names))
+    return f" {rng.choice(['+', '-', '*'])} ".join(terms)
+
+
+def generate_module(rng: random.Random, functions: int, statements: int, literal_density: float) -> str:
+    """
+    Builds one syntactically valid module. literal_density is the chance
+    (0..1) that an operand is a numeric literal rather than a variable.
+    """
+    lines = ['"""Synthetic module generated for benchmarking."""', "import math", ""]
+    for index in range(functions):
+        params = rng.sample(WORDS, 3)
+        lines.append(f"def {rng.choice(WORDS)}_{index}({', '.join(params)}):")
+        lines.append(f'    """Computes {params[0]} from {params[1]} and {params[2]}."""')
+        names = list(params)
+        for step in range(statements):
+            target = f"{rng.choice(WORDS)}_{step}"
+            if rng.random() < 0.2:
+                lines.append(f"    if {rng.choice(names)} > {_expression(rng, names, literal_density)}:")
+                lines.append(f"        {target} = {_expression(rng, names, literal_density)}")
+                lines.append("    else:")
+                lines.append(f"        {target} = {rng.choice(names)}")
+            elif rng.random() < 0.1:
+                lines.append(f"    {target} = \"label {rng.randint(0, 9999)}\"")
+            else:
+                lines.append(f"    {target} = {_expression(rng, names, literal_density)}")
+            names.append(target)
+        lines.append(f"    return {rng.choice(names)}")
+        lines.append("")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_corpus(output_dir: str, files: int = 100, functions: int = 10, statements: int = 12,
+                    literal_density: float = 0.3, seed: int = 0, literal_free: float = 0.0) -> List[str]:
+    """
+    Writes a deterministic corpus of `files` modules (spread over a few packages)
+    and returns their paths. The same arguments always produce the same corpus.
+    A `literal_free` fraction of the modules has numbers only inside strings.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for index in range(files):
+        package = os.path.join(output_dir, f"pkg_{index % 10}")
+        os.makedirs(package, exist_ok=True)
+        path = os.path.join(package, f"module_{index}.py")
+        density = 0.0 if literal_free and rng.random() < literal_free else literal_density
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate_module(rng, functions, statements, density))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Python corpus for benchmarks.")
+    parser.add_argument("output_dir", help="Directory to write the corpus into.")
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--functions", type=int, default=10, help="Functions per module.")
+    parser.add_argument("--statements", type=int, default=12, help="Statements per function.")
+    parser.add_argument("--literal-density", type=float, default=0.3,
+                        help="Chance (0..1) that an operand is a numeric literal.")
+    parser.add_argument("--literal-free", type=float, default=0.0,
+                        help="Fraction (0..1) of modules without numeric literals outside strings.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.output_dir, args.files, args.functions, args.statements,
+                            args.literal_density, args.seed, args.literal_free)
+    print(f"Wrote {len(paths)} file(s) to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
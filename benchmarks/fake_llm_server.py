@@ -0,0 +1,141 @@
+# ai-code-reviewer/benchmarks/fake_llm_server.py
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# Batch prompts list issues as "[id] ..." lines (see SuggestionGenerator.build_batch_messages)
+BATCH_ID_PATTERN = re.compile(r"^\[(\w+)\]", re.MULTILINE)
+
+
+class FakeLLMServer:
+    """
+    Local Groq/OpenAI-compatible chat completions endpoint for benchmarks.
+
+    Every request sleeps for `latency` seconds (plus up to `jitter`), and a
+    `rate_limit` fraction of requests is answered with HTTP 429 and a
+    Retry-After header. JSON-mode requests get a JSON object with one
+    suggestion per batched issue id. Point the client at `base_url`.
+    """
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, rate_limit: float = 0.0,
+                 retry_after: float = 0.1, host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not self.path.endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                status, payload, headers = server.respond(json.loads(body or b"{}"))
+                self._send(status, payload, headers)
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def respond(self, request: dict):
+        """Returns (status, payload, headers) for one chat completion request."""
+        with self._lock:
+            self.requests += 1
+            limited = self._rng.random() < self.rate_limit
+            delay = self.latency + self._rng.random() * self.jitter
+            if limited:
+                self.rate_limited += 1
+
+        if limited:
+            return 429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}}, \
+                {"Retry-After": str(self.retry_after)}
+
+        time.sleep(delay)
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        if request.get("response_format", {}).get("type") == "json_object":
+            content = json.dumps({issue_id: f"Replace the literal in issue {issue_id} with a named constant."
+                                  for issue_id in BATCH_ID_PATTERN.findall(prompt)})
+        else:
+            content = "Extract the literal into a descriptively named module-level constant."
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        return 200, {
+            "id": f"chatcmpl-fake-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }, {}
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Groq-compatible chat completions server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds each request takes.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency of up to this many seconds.")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction (0..1) of requests answered with 429.")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After value sent with 429 responses.")
+    args = parser.parse_args()
+
+    server = FakeLLMServer(args.latency, args.jitter, args.rate_limit, args.retry_after, port=args.port)
+    print(f"Fake LLM server listening on {server.base_url} (use --llm-base-url {server.base_url})")
+    try:
+        server.start()._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
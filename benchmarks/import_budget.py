@@ -0,0 +1,89 @@
+# ai-code-reviewer/benchmarks/import_budget.py
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cumulative import time allowed for the CLI module, in milliseconds. About twice what a
+# developer laptop measures, since shared CI runners are that much slower; the forbidden
+# modules below catch eager imports regardless of the machine.
+DEFAULT_BUDGET_MS = 120.0
+DEFAULT_MODULE = "cli.main"
+# Heavy dependencies that must only load when a code path actually needs them
+FORBIDDEN_MODULES = (
+    "asyncio", "multiprocessing", "concurrent.futures", "subprocess", "ctypes", "httpx", "groq", "pandas",
+    "pyarrow", "streamlit", "fastapi", "uvicorn", "core.analysis.parallel_runner", "core.autofix.fixer",
+)
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)\s*$")
+
+
+def measure_once(module: str) -> Tuple[float, List[str]]:
+    """
+    Imports the module in a fresh interpreter. Returns (cumulative import time
+    in ms, forbidden modules that ended up loaded).
+    """
+    probe = f"import sys, {module}; print(','.join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": ROOT},
+    )
+    if completed.returncode:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(errors[-5:]))
+    cumulative_us = None
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and match.group(2) == module:
+            cumulative_us = int(match.group(1))
+    if cumulative_us is None:
+        raise RuntimeError(f"No import timing found for {module}")
+    loaded = [name for name in completed.stdout.strip().split(",") if name]
+    return cumulative_us / 1000, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if the CLI's cold import time exceeds a budget "
+                                                 "or it eagerly loads heavy dependencies.")
+    parser.add_argument("--module", type=str, default=DEFAULT_MODULE, help=f"Module to import (default: {DEFAULT_MODULE}).")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Allowed median cumulative import time in ms (default: {DEFAULT_BUDGET_MS:g}).")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to sample; the median is compared.")
+    args = parser.parse_args()
+
+    samples, loaded = [], set()
+    try:
+        # The first run also writes bytecode caches, so it is not counted
+        measure_once(args.module)
+        for _ in range(max(1, args.repeat)):
+            elapsed_ms, forbidden = measure_once(args.module)
+            samples.append(elapsed_ms)
+            loaded.update(forbidden)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    median_ms = statistics.median(samples)
+    print(f"import {args.module}: median {median_ms:.1f} ms over {len(samples)} run(s) "
+          f"(min {min(samples):.1f} ms, max {max(samples):.1f} ms), budget {args.budget_ms:g} ms")
+
+    failed = False
+    if median_ms > args.budget_ms:
+        print(f"  ❌ Over budget by {median_ms - args.budget_ms:.1f} ms. "
+              f"Run `python -X importtime -c 'import {args.module}'` to find the slow import.")
+        failed = True
+    if loaded:
+        print(f"  ❌ Heavy modules imported eagerly: {', '.join(sorted(loaded))}")
+        failed = True
+    if not failed:
+        print("  ✅ Within budget.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
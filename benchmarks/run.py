@@ -0,0 +1,382 @@
+# ai-code-reviewer/benchmarks/run.py
+import argparse
+import ast
+import contextlib
+import io
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Allow `python benchmarks/run.py` as well as `python -m benchmarks.run`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.fake_llm_server import FakeLLMServer
+from core.analysis.analyzer import Analyzer
+from core.autofix.fixer import Fixer
+from core.parser.python_parser import PythonParser
+from core.report.json_reporter import build_metadata, load_report, open_report_writer, summarize_file_result
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+# Allowed relative slowdown before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.25
+# Latency increases smaller than this are timer/scheduler noise, not regressions
+MIN_LATENCY_DELTA_MS = 1.0
+# Stages bound by the fake server's sleep rather than the CPU, so not scaled by the calibration
+UNSCALED_STAGES = ("llm",)
+
+# Corpus shapes: (files, functions per file, statements per function)
+PROFILES = {
+    "small": {"files": 50, "functions": 8, "statements": 10},
+    "medium": {"files": 500, "functions": 10, "statements": 12},
+    "large": {"files": 2000, "functions": 12, "statements": 15},
+}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of the samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(q / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(stage: str, files: int, issues: int, seconds: float, latencies: List[float]) -> Dict[str, Any]:
+    return {
+        "stage": stage,
+        "files": files,
+        "issues": issues,
+        "seconds": round(seconds, 4),
+        "files_per_s": round(files / seconds, 2) if seconds else 0.0,
+        "issues_per_s": round(issues / seconds, 2) if seconds else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def time_per_item(items: List[Any], work: Callable[[Any], int]):
+    """Runs work(item) for each item; returns (total seconds, per-item latencies, summed counts)."""
+    latencies = []
+    count = 0
+    start = time.perf_counter()
+    for item in items:
+        item_start = time.perf_counter()
+        count += work(item) or 0
+        latencies.append(time.perf_counter() - item_start)
+    return time.perf_counter() - start, latencies, count
+
+
+def median_run(repeat: int, bench: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Runs a repeatable stage several times and keeps the run with the median throughput."""
+    runs = sorted((bench() for _ in range(max(1, repeat))), key=lambda run: run["files_per_s"])
+    return runs[len(runs) // 2]
+
+
+def calibrate(repeat: int = 10) -> float:
+    """
+    Milliseconds this machine takes for a fixed parse-walk-serialize workload
+    (best of repeat runs, as with timeit, since noise only ever adds).
+    Baselines store it, so results from a faster or slower machine are
+    compared in proportion instead of in absolute terms.
+    """
+    source = "\n".join(f"def f{i}(x):\n    return [x * {i} + j for j in range({i % 7 + 3})]\n" for i in range(400))
+    samples = []
+    # The first run pays for warming up the allocator and caches, so it is not counted
+    for _ in range(max(1, repeat) + 1):
+        start = time.perf_counter()
+        tree = ast.parse(source)
+        constants = [node.value for node in ast.walk(tree) if isinstance(node, ast.Constant)]
+        json.dumps(constants)
+        samples.append(time.perf_counter() - start)
+    return round(min(samples[1:]) * 1000, 3)
+
+
+def bench_parse(paths: List[str]) -> Dict[str, Any]:
+    def parse(path):
+        PythonParser.parse_ast(PythonParser.load_document(path))
+    seconds, latencies, _ = time_per_item(paths, parse)
+    return summarize("parse", len(paths), 0, seconds, latencies)
+
+
+def bench_analyze(paths: List[str], issues_by_file: Dict[str, List[Dict[str, Any]]],
+                  prefilter: bool = True) -> Dict[str, Any]:
+    def analyze(path):
+        issues = Analyzer(PythonParser.load_document(path), filename=path, prefilter=prefilter).analyze()
+        for issue in issues:
+            issue['file'] = path
+        issues_by_file[path] = issues
+        return len(issues)
+    seconds, latencies, count = time_per_item(paths, analyze)
+    # "analyze_full" parses and walks every file: the path the token prefilter is measured against
+    return summarize("analyze" if prefilter else "analyze_full", len(paths), count, seconds, latencies)
+
+
+def prefilter_mismatches(filtered: Dict[str, List[Any]], full: Dict[str, List[Any]]) -> List[str]:
+    """Files where the prefiltered analysis found a different issue set than the full parse and walk."""
+    def issue_set(issues):
+        return sorted(json.dumps(issue.to_dict(), sort_keys=True, default=str) for issue in issues)
+    return [path for path in full if issue_set(filtered.get(path, [])) != issue_set(full[path])]
+
+
+def bench_fix_prepare(paths: List[str], issues_by_file: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    def prepare(path):
+        fixer = Fixer(PythonParser.load_document(path))
+        for issue in issues_by_file[path]:
+            fixed, description = fixer.generate_fix(issue)
+            issue['autofix_status'] = "Prepared" if fixed else "Not Available"
+            issue['autofix_description'] = description
+        return len(issues_by_file[path])
+    seconds, latencies, count = time_per_item(paths, prepare)
+    return summarize("fix_prepare", len(paths), count, seconds, latencies)
+
+
+def bench_report(paths: List[str], issues_by_file: Dict[str, List[Dict[str, Any]]], fmt: str,
+                 output_path: str) -> Dict[str, Any]:
+    writer = open_report_writer(output_path, fmt)
+
+    def write(path):
+        for issue in issues_by_file[path]:
+            writer.write_issue(issue)
+        return len(issues_by_file[path])
+    seconds, latencies, count = time_per_item(paths, write)
+    start = time.perf_counter()
+    summaries = [summarize_file_result({"file": path, "issues": issues_by_file[path]}) for path in paths]
+    writer.close(build_metadata(summaries, count))
+    seconds += time.perf_counter() - start
+    return summarize(f"report_{fmt}", len(paths), count, seconds, latencies)
+
+
+def bench_fix_apply(corpus_dir: str, paths: List[str], report_path: str, work_dir: str) -> Dict[str, Any]:
+    """Applies every prepared fix from the report to a scratch copy of the corpus."""
+    scratch = os.path.join(work_dir, "fix_corpus")
+    shutil.copytree(corpus_dir, scratch)
+    start = time.perf_counter()
+    _, report_issues = load_report(report_path)
+    # Same per-file grouping as apply_fixes_from_report, pointed at the scratch copy
+    fixes_by_file: Dict[str, List[Dict[str, Any]]] = {}
+    for issue in report_issues:
+        if issue.get('autofix_status') == 'Prepared':
+            target = os.path.join(scratch, os.path.relpath(issue['file'], corpus_dir))
+            fixes_by_file.setdefault(target, []).append(issue)
+    seconds = time.perf_counter() - start
+
+    # The fixer prints a line per fix; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        apply_seconds, latencies, applied = time_per_item(
+            sorted(fixes_by_file), lambda path: Fixer.apply_fixes_to_file(path, fixes_by_file[path]))
+    return summarize("fix_apply", len(paths), applied, seconds + apply_seconds, latencies)
+
+
+def bench_llm(paths: List[str], issues_by_file: Dict[str, List[Dict[str, Any]]], max_issues: int,
+              concurrency: int, batch_size: int, latency: float, rate_limit: float) -> Optional[Dict[str, Any]]:
+    """Enriches up to max_issues findings through the real client against the fake server."""
+    # The Groq backend needs a key to consider itself available; the fake server accepts any key
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    from core.llm.suggestion_generator import SuggestionGenerator
+    from core.llm.async_enricher import AsyncEnricher
+
+    request_latencies: List[float] = []
+
+    class TimedSuggestionGenerator(SuggestionGenerator):
+        async def request_suggestion_async(self, messages, json_mode=False):
+            start = time.perf_counter()
+            try:
+                return await super().request_suggestion_async(messages, json_mode)
+            finally:
+                request_latencies.append(time.perf_counter() - start)
+
+    jobs = []
+    documents = {}
+    for path in paths:
+        for issue in issues_by_file[path]:
+            if len(jobs) >= max_issues:
+                break
+            if path not in documents:
+                documents[path] = PythonParser.load_document(path)
+            jobs.append((dict(issue), documents[path]))
+
+    with FakeLLMServer(latency=latency, rate_limit=rate_limit, retry_after=0.05) as server:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator = TimedSuggestionGenerator(base_url=server.base_url)
+        if not generator.available:
+            print(f"  Skipping llm stage: {generator.backend.unavailable_reason}")
+            return None
+        enricher = AsyncEnricher(generator, concurrency=concurrency, batch_size=batch_size,
+                                 backoff_base=0.05, backoff_max=1.0)
+        try:
+            start = time.perf_counter()
+            enricher.enrich(jobs)
+            seconds = time.perf_counter() - start
+        finally:
+            enricher.close()
+
+    result = summarize("llm", len(documents), len(jobs), seconds, request_latencies)
+    result.update({"requests": server.requests, "rate_limited": server.rate_limited, "retries": enricher.retries})
+    return result
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float,
+            speed: float = 1.0) -> List[str]:
+    """
+    Lists metrics that are worse than the baseline by more than the tolerance.
+    speed is this machine's calibration time over the baseline's: at 2.0, half
+    the baseline throughput and twice its latency are expected.
+    """
+    regressions = []
+    for stage, result in results.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        scale = 1.0 if stage in UNSCALED_STAGES else speed
+        # Higher is better for throughput, lower is better for latency and memory
+        for metric in ("files_per_s", "issues_per_s"):
+            expected = base.get(metric, 0) / scale
+            if expected and result[metric] < expected * (1 - tolerance):
+                regressions.append(f"{stage}.{metric}: {result[metric]} < baseline {expected:.2f}")
+        for metric in ("p50_ms", "p99_ms", "peak_rss_mb"):
+            floor = MIN_LATENCY_DELTA_MS if metric.endswith("_ms") else 0.0
+            expected = base.get(metric, 0) * (scale if metric.endswith("_ms") else 1.0)
+            if expected and result[metric] > max(expected * (1 + tolerance), expected + floor):
+                regressions.append(f"{stage}.{metric}: {result[metric]} > baseline {expected:.3f}")
+    return regressions
+
+
+def load_baselines(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsing, detection, fixing, reporting and LLM enrichment.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small", help="Size of the synthetic corpus.")
+    parser.add_argument("--files", type=int, default=None, help="Override the profile's number of files.")
+    parser.add_argument("--literal-density", type=float, default=0.3,
+                        help="Chance (0..1) that an operand in the corpus is a numeric literal.")
+    parser.add_argument("--literal-free", type=float, default=0.0,
+                        help="Fraction (0..1) of generated modules with numbers only inside strings.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", type=str, default=None,
+                        help="Benchmark an existing directory instead of a generated corpus.")
+    parser.add_argument("--skip-llm", action="store_true", help="Skip the LLM enrichment stage.")
+    parser.add_argument("--llm-issues", type=int, default=200, help="Number of findings sent to the fake LLM server.")
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="Fake server latency per request in seconds.")
+    parser.add_argument("--llm-rate-limit", type=float, default=0.05, help="Fraction of fake requests answered with 429.")
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--llm-batch-size", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs of each in-memory stage; the median run is reported (default: 3).")
+    parser.add_argument("--output", "-o", type=str, default=None, help="Write the results as JSON to this path.")
+    parser.add_argument("--baseline", type=str, default=BASELINE_PATH, help="Baselines file to compare against.")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the baseline for the profile instead of comparing.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Relative slowdown allowed before a metric is flagged (default: 0.25).")
+    args = parser.parse_args()
+
+    shape = dict(PROFILES[args.profile])
+    if args.files:
+        shape["files"] = args.files
+
+    # Sampled before, during and after the stages, so it reflects the machine while they ran
+    calibrations = [calibrate()]
+    work_dir = tempfile.mkdtemp(prefix="code-reviewer-bench-")
+    try:
+        if args.corpus:
+            corpus_dir = args.corpus
+            from core.analysis.file_discovery import discover_python_files
+            paths = discover_python_files([corpus_dir])
+        else:
+            corpus_dir = os.path.join(work_dir, "corpus")
+            paths = generate_corpus(corpus_dir, shape["files"], shape["functions"], shape["statements"],
+                                    args.literal_density, args.seed, args.literal_free)
+        print(f"Benchmarking {len(paths)} file(s) from {corpus_dir}")
+
+        issues_by_file: Dict[str, List[Dict[str, Any]]] = {}
+        full_issues_by_file: Dict[str, List[Dict[str, Any]]] = {}
+        report_path = os.path.join(work_dir, "report.json")
+        ndjson_path = os.path.join(work_dir, "report.ndjson")
+        # Fix application rewrites files, so it runs once on a scratch copy
+        stages = [
+            median_run(args.repeat, lambda: bench_parse(paths)),
+            median_run(args.repeat, lambda: bench_analyze(paths, full_issues_by_file, prefilter=False)),
+            median_run(args.repeat, lambda: bench_analyze(paths, issues_by_file)),
+        ]
+        # Compared before fix preparation adds fields to the prefiltered issues
+        mismatches = prefilter_mismatches(issues_by_file, full_issues_by_file)
+        calibrations.append(calibrate())
+        stages += [
+            median_run(args.repeat, lambda: bench_fix_prepare(paths, issues_by_file)),
+            median_run(args.repeat, lambda: bench_report(paths, issues_by_file, "json", report_path)),
+            median_run(args.repeat, lambda: bench_report(paths, issues_by_file, "ndjson", ndjson_path)),
+            bench_fix_apply(corpus_dir, paths, report_path, work_dir),
+        ]
+        calibrations.append(calibrate())
+        if not args.skip_llm:
+            stages.append(bench_llm(paths, issues_by_file, args.llm_issues, args.llm_concurrency,
+                                    args.llm_batch_size, args.llm_latency, args.llm_rate_limit))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {stage["stage"]: stage for stage in stages if stage}
+    calibration_ms = sorted(calibrations)[len(calibrations) // 2]
+    print(f"\nCalibration workload: {calibration_ms} ms")
+    print(f"\n{'stage':<14}{'files/s':>12}{'issues/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'rss MB':>9}")
+    for stage in results.values():
+        print(f"{stage['stage']:<14}{stage['files_per_s']:>12}{stage['issues_per_s']:>12}"
+              f"{stage['p50_ms']:>10}{stage['p99_ms']:>10}{stage['peak_rss_mb']:>9}")
+
+    if mismatches:
+        print(f"\n🛑 The prefiltered analysis disagrees with the full parse on {len(mismatches)} file(s):")
+        for path in mismatches[:10]:
+            print(f"  - {path}")
+        return 1
+    print(f"\n✅ Prefiltered and full analysis found the same issues in all {len(paths)} file(s).")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"profile": args.profile, "calibration_ms": calibration_ms, "stages": results}, f, indent=4)
+
+    # Baselines are only comparable for generated corpora of the same profile
+    profile_key = args.profile if not (args.corpus or args.files or args.literal_free) else None
+    baselines = load_baselines(args.baseline)
+    if args.save_baseline:
+        if profile_key is None:
+            print("Baselines are only stored for unmodified profiles (no --corpus / --files).")
+            return 1
+        baselines[profile_key] = {"calibration_ms": calibration_ms, "stages": results}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=4, sort_keys=True)
+        print(f"\nSaved baseline for '{profile_key}' to {args.baseline}")
+        return 0
+
+    if profile_key in baselines:
+        baseline = baselines[profile_key]
+        speed = calibration_ms / baseline["calibration_ms"]
+        print(f"\nThis machine runs the calibration workload at {1 / speed:.2f}x the baseline machine's speed.")
+        regressions = compare(results, baseline["stages"], args.tolerance, speed)
+        if regressions:
+            print(f"\n🛑 {len(regressions)} regression(s) against the '{profile_key}' baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\n✅ No regressions against the '{profile_key}' baseline (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
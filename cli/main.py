@@ -1,91 +1,346 @@
-# ai-code-reviewer/cli/main.py (Updated with --fix flag)
+# ai-code-reviewer/cli/main.py
 import argparse
-import json
 import os
-from core.analysis.analyzer import Analyzer
-from core.llm.suggestion_generator import SuggestionGenerator
-from core.autofix.fixer import Fixer # Make sure this import is present
+import sys
+from core.analysis.file_discovery import discover_python_files, select_files
+from core.analysis.watcher import DEFAULT_DEBOUNCE
+# The shared option helpers import only constants; the LLM stack is imported when a run needs it
+from cli.options import (add_detector_arguments, add_llm_arguments, add_rule_arguments, build_analysis_version,
+                         build_detector_config, build_enricher, build_rule_table, build_suggestion_version,
+                         remember_result)
+# Likewise for analysis, fixing and reporting: --fix never loads the detectors, a review never loads
+# subprocess unless it is a --diff run, and the history store is only opened with --history-db
+from core.report.json_reporter import REPORT_FORMATS, REPORT_EXTENSIONS
+from core.report.history_store import DEFAULT_HISTORY_PATH
+from core import telemetry
 
 REPORT_PATH = "code_reviewer_report.json"
+PROFILE_PATH = "code_reviewer.prof"
+
+def default_report_path(fmt):
+    return os.path.splitext(REPORT_PATH)[0] + REPORT_EXTENSIONS[fmt]
 
 def main():
-    parser = argparse.ArgumentParser(description="AI Code Reviewer Tool")
-    parser.add_argument("file_path", type=str, help="Path to the Python file to analyze.")
+    # `python -m cli.main serve ...` starts the long-running review daemon instead
+    if sys.argv[1:2] == ["serve"]:
+        from cli.server import serve_main
+        serve_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="AI Code Reviewer Tool",
+                                     epilog="Run `python -m cli.main serve --help` for the review daemon.")
+    parser.add_argument("paths", type=str, nargs="*",
+                        help="Python files, directories or glob patterns to analyze (optional with --diff).")
+    parser.add_argument("--diff", type=str, default=None, metavar="BASE..HEAD",
+                        help="Review only lines changed in a git revision range (e.g. origin/main...HEAD; the "
+                             "working tree must be at HEAD), or in a unified diff read from stdin with '-'. "
+                             "Only changed files are parsed and only issues on changed lines are kept and enriched.")
+    parser.add_argument("--include", action="append", default=None, metavar="PATTERN",
+                        help="Glob pattern of files to include when walking directories (default: *.py). Repeatable.")
+    parser.add_argument("--exclude", action="append", default=None, metavar="PATTERN",
+                        help="Glob pattern of files or directories to skip. Repeatable.")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Number of worker processes for parsing and detection (default: one per CPU).")
+    add_detector_arguments(parser)
+    add_rule_arguments(parser)
+    add_llm_arguments(parser)
+    parser.add_argument("--no-llm", action="store_true",
+                        help="Static analysis and fix preparation only: never loads the LLM stack or sends requests.")
+    parser.add_argument("--consolidate-literals", action="store_true",
+                        help="Index every magic number project-wide (<cache-dir>/literals.sqlite3), give each value "
+                             "one shared constant name in every file, rank values by frequency and request one "
+                             "AI suggestion per distinct value. The report streams once all files are analyzed.")
+    parser.add_argument("--no-incremental", action="store_true",
+                        help="Re-analyze every file instead of reusing results for unchanged files.")
+    parser.add_argument("--output", "-o", type=str, default=None,
+                        help=f"Path of the report to write (default: {REPORT_PATH}, with the extension matching --format).")
+    parser.add_argument("--format", choices=sorted(REPORT_FORMATS), default="json",
+                        help="Report format: indented JSON, NDJSON streamed one issue per line (tail -f friendly), "
+                             "or columnar Parquet (requires pyarrow) for fast dashboard loading.")
+    parser.add_argument("--metrics-out", type=str, default=None, metavar="PATH",
+                        help="Export stage timings, LLM latency/token histograms and retry counts "
+                             "as a Prometheus text file (.prom) or JSON (any other extension).")
+    parser.add_argument("--profile", type=str, nargs="?", const=PROFILE_PATH, default=None, metavar="PATH",
+                        help=f"Write cProfile/pstats output for the run (default: {PROFILE_PATH}). "
+                             "Analysis runs in-process so the hot path shows up in the profile.")
+    parser.add_argument("--history-db", type=str, nargs="?", const=DEFAULT_HISTORY_PATH, default=None, metavar="PATH",
+                        help=f"Also record the run in a SQLite review history (default: {DEFAULT_HISTORY_PATH}) "
+                             "that the dashboard queries for filtering, run comparisons and trends.")
     # New argument for applying fixes
     parser.add_argument("--fix", action="store_true", help="Apply all prepared fixes from the latest report.")
-    
+    parser.add_argument("--watch", action="store_true",
+                        help="After the review, keep watching the paths (inotify on Linux, polling elsewhere) and "
+                             "re-analyze only saved files, appending per-file updates to <report>.updates.ndjson.")
+    parser.add_argument("--watch-debounce", type=float, default=DEFAULT_DEBOUNCE, metavar="SECONDS",
+                        help=f"Quiet period that ends a burst of saves in --watch mode (default: {DEFAULT_DEBOUNCE:g}s).")
+    parser.add_argument("--watch-poll", action="store_true",
+                        help="Use the polling watcher even where inotify is available (e.g. network file systems).")
+
     args = parser.parse_args()
-    file_path = args.file_path
+    if not args.paths and not args.diff:
+        parser.error("give at least one path, or --diff")
+    if args.watch and (args.diff or args.fix or not args.paths):
+        parser.error("--watch needs paths and can't be combined with --diff or --fix")
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        report_path = run(args)
+        if args.watch and report_path:
+            from cli.watch import watch
+            watch(args, report_path)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            write_profile(profiler, args.profile)
+        if args.metrics_out:
+            telemetry.get_telemetry().write(args.metrics_out)
+            print(f"  📈 Metrics written to: {args.metrics_out}")
+
+def write_profile(profiler, path):
+    """Dumps pstats data and prints the hottest functions by cumulative time."""
+    import pstats
+    profiler.dump_stats(path)
+    print(f"\n⏱️  Profile written to: {path} (inspect with `python -m pstats {path}`)")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
 
-    if not os.path.exists(file_path):
-        print(f"Error: File not found at {file_path}")
+def run(args):
+    """Reviews the given paths once. Returns the report path, or None if nothing was written."""
+    scope = None
+    if args.diff:
+        from core.analysis.diff_scope import DiffScope, filter_to_scope
+        try:
+            with telemetry.span("diff"):
+                scope = DiffScope.from_spec(args.diff)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return
+
+    with telemetry.span("discover"):
+        if scope is None:
+            file_paths = discover_python_files(args.paths, include=args.include, exclude=args.exclude)
+        elif args.paths:
+            # Paths narrow the diff down further
+            file_paths = [path for path in discover_python_files(args.paths, include=args.include, exclude=args.exclude)
+                          if scope.covers_file(path)]
+        else:
+            file_paths = select_files(scope.paths, include=args.include, exclude=args.exclude)
+    if scope is not None:
+        print(f"  🔀 Diff {scope.spec}: {len(file_paths)} changed Python file(s) to review; "
+              f"the diff adds or changes {scope.changed_lines} line(s).")
+    if not file_paths:
+        if scope is not None:
+            print("🎉 No changed Python files to review.")
+        else:
+            print(f"Error: No Python files found for {', '.join(args.paths)}")
         return
 
     # --- AUTO-FIX MODE ---
     if args.fix:
-        # We only need the Fixer here, not the Analyzer or LLM
-        # Read file content for the Fixer (needed for line management)
-        with open(file_path, 'r', encoding='utf-8') as f:
-            code = f.read()
-            
-        fixer = Fixer(code)
-        fixer.apply_fixes_from_report(REPORT_PATH, file_path)
+        # We only need the Fixer here, not the Analyzer or LLM.
+        # The report is read once and fixes are applied per file in a single pass each.
+        from core.autofix.fixer import Fixer
+        report_path = args.output or default_report_path(args.format)
+        Fixer.apply_fixes_from_report(report_path, file_paths=file_paths)
         return
 
     # --- ANALYSIS MODE (Original Logic) ---
+    from core.analysis.parallel_runner import iter_file_results, resolve_jobs, get_detector_set
+    from core.analysis.pipeline import enrich_results, DEFAULT_ENRICH_CHUNK
+    from core.analysis.manifest import AnalysisManifest
+    from core.report.json_reporter import TOOL_VERSION, TeeReportWriter, build_metadata, open_report_writer, summarize_file_result
+    output_path = args.output or default_report_path(args.format)
     print("\n🚨 Starting AI Code Review...")
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        code = f.read()
-        
-    analyzer = Analyzer(code)
-    issues = analyzer.analyze()
-    
-    if not issues:
-        print("🎉 No code smells found!")
+
+    try:
+        detector_config = build_detector_config(args)
+        detector_set = get_detector_set(detector_config)
+        rules = build_rule_table(args)
+    except ValueError as e:
+        print(f"Error: {e}")
         return
+    print(f"  🔍 Detectors: {', '.join(detector_set.names) or 'none'}")
+    if rules is not None:
+        print(f"  📐 Suggestion rules: {len(rules)} well-known literal(s) answered without the LLM.")
 
-    # Initialize LLM and Fixer
-    llm_generator = SuggestionGenerator()
-    fixer = Fixer(code)
-    
-    print(f"\n🚨 Code Smell Detection & AI Enrichment: Found {len(issues)} issue(s)...")
-
-    for i, issue in enumerate(issues):
-        # 1. Generate AI Suggestion
-        print(f"  🧠 Requesting AI suggestion for L{issue['line']}...")
-        issue['suggestion'] = llm_generator.generate_suggestion(issue, code)
-        
-        # 2. Generate Fix Data
-        fix_success, fix_description = fixer.generate_fix(issue)
-        if fix_success:
-            issue['autofix_status'] = "Prepared"
-            issue['autofix_description'] = fix_description
-        else:
-            issue['autofix_status'] = "Not Available"
-            issue['autofix_description'] = "Automatic fix not supported for this issue type."
-
-    print(f"  🛑 Found and enriched {len(issues)} total issue(s).")
-    for issue in issues:
-        print(f"    [L{issue['line']}] {issue['type']}: Fix Status: {issue['autofix_status']}")
-
-    # --- Generate Final Report ---
-    report = {
-        "metadata": {
-            "file": file_path,
-            "total_issues": len(issues),
-            "tool_version": "0.1.0"
-        },
-        "issues": issues
-    }
-
-    print(f"\n📑 Generating Report:")
+    # Unchanged files reuse their stored, already-enriched issues. Diff runs only
+    # keep part of each file's issues, so they neither use nor update the manifest.
+    incremental = not args.no_incremental and scope is None
+    analysis_version = build_analysis_version(detector_set, args, rules)
+    suggestion_version = build_suggestion_version(args)
+    manifest = AnalysisManifest(args.cache_dir, analysis_version, suggestion_version) if incremental else None
+    if manifest is not None:
+        with telemetry.span("manifest_check"):
+            reused, stale_paths = manifest.partition(file_paths)
+    else:
+        reused, stale_paths = {}, file_paths
+    # Worker processes don't show up in a profile, so profiling analyzes in-process
+    jobs = 1 if args.profile else args.jobs
+
+    literal_index = None
+    if args.consolidate_literals:
+        from core.analysis.literal_index import LiteralIndex, index_literals
+        from core.autofix.fixer import shared_constant_name
+        literal_index = LiteralIndex(args.cache_dir)
+        # Reused files keep their index rows unless the index itself is new or out of date
+        for path, issues in reused.items():
+            if not literal_index.is_current(os.path.abspath(path), manifest.entries[path]["sha256"]):
+                literal_index.update_file(os.path.abspath(path), manifest.entries[path]["sha256"], issues)
+
+    if reused:
+        print(f"  ♻️  Reusing stored results for {len(reused)} unchanged file(s).")
+    if stale_paths:
+        print(f"  📂 Analyzing {len(stale_paths)} file(s) with {min(resolve_jobs(jobs), len(stale_paths))} worker(s)...")
+
+    # Opened up front so a missing optional dependency fails before any work is done
+    history = None
     try:
-        with open(REPORT_PATH, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=4)
-        print(f"  ✅ Report written successfully to: {REPORT_PATH}")
-    except Exception as e:
-        print(f"  ❌ Error writing report: {e}")
+        report_writer = open_report_writer(output_path, args.format)
+        if args.history_db:
+            import sqlite3
+            from core.report.history_store import HistoryWriter
+            try:
+                recorded_version = analysis_version + (f";llm={suggestion_version}" if suggestion_version else "")
+                history = HistoryWriter(args.history_db, recorded_version, output_path,
+                                        scope.spec if scope is not None else None, TOOL_VERSION)
+            except (OSError, sqlite3.Error) as e:
+                report_writer.abort()
+                raise RuntimeError(f"Could not open the review history {args.history_db}: {e}")
+            report_writer = TeeReportWriter(report_writer, history)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        if literal_index is not None:
+            literal_index.close()
+        return
+
+    cache = None
+    enricher = None
+    results = iter([])
+    try:
+        if stale_paths:
+            # Stages: parse + detect + prepare fixes (process pool) -> enrich (async, chunked)
+            results = iter_file_results(stale_paths, jobs=jobs, detector_config=detector_config,
+                                        shared_constants=args.consolidate_literals, rules=rules)
+            if literal_index is not None:
+                # Indexed before diff filtering, so the index always holds whole files
+                results = index_literals(results, literal_index)
+            if scope is not None:
+                results = filter_to_scope(results, scope)
+            if args.no_llm:
+                print("  ⏭️  Skipping AI suggestions (--no-llm).")
+            else:
+                enricher, cache = build_enricher(args)
+                chunk_size = max(DEFAULT_ENRICH_CHUNK, args.llm_concurrency * args.llm_batch_size * 4)
+                results = enrich_results(results, enricher, chunk_size=chunk_size)
+    except BaseException:
+        # The writers only clean up once entered, so no temp report or 'running' history row is left behind
+        report_writer.abort()
+        if literal_index is not None:
+            literal_index.close()
+        raise
+
+    # --- Stream the Report ---
+    # Each file's issues are written as soon as they are enriched, in the requested order
+    print(f"\n📑 Streaming Report to: {output_path}")
+    file_summaries = []
+    total_issues = 0
+    literal_counts = {}
+    rule_answered = 0
+    try:
+        with report_writer as writer:
+            for path in file_paths:
+                if path in reused:
+                    result = {"file": path, "issues": reused[path], "error": None,
+                              "sha256": manifest.entries[path]["sha256"]}
+                    if literal_index is not None:
+                        # Frequencies may have changed since these issues were stored
+                        literal_index.annotate(result["issues"], literal_counts)
+                else:
+                    # Fresh results arrive in stale_paths order, a subsequence of file_paths
+                    result = next(results)
+                    if result["error"]:
+                        print(f"  ⚠️  {result['file']}: {result['error']}")
+                    if manifest is not None:
+                        remember_result(manifest, result, enricher)
+
+                with telemetry.span("report_write"):
+                    for issue in result["issues"]:
+                        writer.write_issue(issue)
+                for issue in result["issues"]:
+                    print(f"    [{issue['file']}:L{issue['line']}] {issue['type']}: Fix Status: {issue['autofix_status']}")
+                total_issues += len(result["issues"])
+                rule_answered += sum(1 for issue in result["issues"] if issue.get('rule'))
+                file_summaries.append(summarize_file_result(result))
+
+            metadata = build_metadata(file_summaries, total_issues)
+            metadata["llm_cache"] = cache.stats() if cache is not None else {"enabled": False}
+            metadata["incremental"] = {
+                "enabled": manifest is not None,
+                "reused_files": len(reused),
+                "analyzed_files": len(stale_paths),
+            }
+            if scope is not None:
+                metadata["diff"] = {"spec": scope.spec, "changed_lines": scope.changed_lines}
+            metadata["suggestion_rules"] = {
+                "enabled": rules is not None,
+                "version": rules.version if rules is not None else None,
+                "answered_issues": rule_answered,
+            }
+            if literal_index is not None:
+                top_literals = literal_index.ranked()
+                for entry in top_literals:
+                    entry["constant_name"] = shared_constant_name(entry["value"])
+                metadata["literal_index"] = {**literal_index.stats(), "top": top_literals}
+            metadata["metrics"] = telemetry.get_telemetry().summary()
+            with telemetry.span("report_write"):
+                writer.close(metadata)
+    finally:
+        # Whatever finished before an interruption is kept for the next run
+        if manifest is not None:
+            with telemetry.span("manifest_save"):
+                manifest.save()
+        if enricher is not None:
+            enricher.close()
+        if cache is not None:
+            cache.close()
+        if literal_index is not None:
+            literal_index.close()
+
+    if history is not None:
+        print(f"  🗄️  Recorded run #{history.run_id} in the review history: {args.history_db}")
+    if rule_answered:
+        print(f"  📐 Answered {rule_answered} issue(s) with local suggestion rules instead of the LLM.")
+    if enricher is not None:
+        if enricher.deduplicated:
+            print(f"  🧩 Collapsed {enricher.deduplicated} duplicate finding(s) into shared requests.")
+        if enricher.batch_fallbacks:
+            print(f"  ↩️  {enricher.batch_fallbacks} batched issue(s) fell back to individual requests.")
+        if enricher.retries:
+            print(f"  🔁 Retried {enricher.retries} LLM request(s) after rate limiting or transient errors.")
+        if enricher.scheduler is not None and enricher.scheduler.waited:
+            print(f"  🚦 Waited {enricher.scheduler.waited:.1f}s for LLM rate budget.")
+        if enricher.deferred:
+            print(f"  ⏳ Deferred {enricher.deferred} issue(s) past the LLM rate budget; they are retried next run.")
+    if literal_index is not None and top_literals:
+        ranking = ", ".join(f"{entry['value']} ×{entry['occurrences']} in {entry['files']} file(s)"
+                            for entry in top_literals[:5])
+        print(f"  🔢 Most repeated literals: {ranking}")
+    if cache is not None:
+        print(f"  💾 Suggestion cache: {cache.hits} hit(s), {cache.misses} miss(es).")
+    stage_totals = telemetry.get_telemetry().stage_totals()
+    if stage_totals:
+        timings = ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in stage_totals.items())
+        print(f"  ⏱️  Time per stage (summed across workers): {timings}")
+
+    if total_issues:
+        print(f"  🛑 Found {'' if args.no_llm else 'and enriched '}{total_issues} total issue(s).")
+    else:
+        print("🎉 No code smells found!")
+    print(f"  ✅ Report written successfully to: {output_path}")
+    return output_path
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,172 @@
+# ai-code-reviewer/cli/options.py
+import json
+# Only constants from the LLM modules here; the LLM stack itself is imported when a run needs it
+from core.llm.backends import LLM_BACKENDS, DEFAULT_POOL_SIZE, DEFAULT_CONNECT_TIMEOUT, create_backend
+from core.llm.suggestion_cache import DEFAULT_CACHE_DIR
+from core.llm.prompt_builder import CONTEXT_MODES, DEFAULT_CONTEXT_MODE, DEFAULT_CONTEXT_TOKENS
+from core.llm.scheduler import DEFAULT_MAX_WAIT
+
+def parse_detector_options(values):
+    """Turns repeated NAME.KEY=VALUE strings into {name: {key: value}}."""
+    options = {}
+    for item in values or []:
+        target, _, raw_value = item.partition("=")
+        name, _, key = target.partition(".")
+        if not (name and key and raw_value):
+            raise ValueError(f"Invalid detector option '{item}', expected NAME.KEY=VALUE")
+        try:
+            value = json.loads(raw_value)
+        except ValueError:
+            value = raw_value
+        options.setdefault(name, {})[key] = value
+    return options
+
+def add_detector_arguments(parser):
+    """Detector selection options shared by the review and serve commands."""
+    parser.add_argument("--enable-detector", action="append", default=None, metavar="NAME",
+                        help="Run only the named detector(s). Repeatable.")
+    parser.add_argument("--disable-detector", action="append", default=None, metavar="NAME",
+                        help="Skip the named detector. Repeatable.")
+    parser.add_argument("--detector-option", action="append", default=None, metavar="NAME.KEY=VALUE",
+                        help="Pass an option to a detector, e.g. magic-number.threshold=10. Repeatable.")
+
+def add_rule_arguments(parser):
+    """Local suggestion rule options shared by the review and serve commands."""
+    parser.add_argument("--rules", type=str, default=None, metavar="PATH",
+                        help="JSON file extending or overriding the built-in suggestion rules "
+                             "(math constants, HTTP statuses, time units, byte sizes).")
+    parser.add_argument("--no-rules", action="store_true",
+                        help="Don't answer well-known literals locally; every issue goes to the LLM.")
+
+def add_llm_arguments(parser):
+    """LLM backend, request and suggestion cache options shared by the review and serve commands."""
+    parser.add_argument("--llm-concurrency", type=int, default=8,
+                        help="Maximum number of LLM requests in flight at once.")
+    parser.add_argument("--llm-batch-size", type=int, default=1,
+                        help="Pack up to K distinct issues into one LLM prompt with a JSON reply (default: 1, no batching).")
+    parser.add_argument("--llm-timeout", type=float, default=30.0, help="Per-request LLM timeout in seconds.")
+    parser.add_argument("--llm-retries", type=int, default=4,
+                        help="Retries per LLM request on 429, 5xx and timeouts (exponential backoff with jitter).")
+    parser.add_argument("--llm-context", choices=CONTEXT_MODES, default=DEFAULT_CONTEXT_MODE,
+                        help=f"Code sent with each issue: its line, its enclosing statement or its enclosing "
+                             f"function (default: {DEFAULT_CONTEXT_MODE}).")
+    parser.add_argument("--llm-context-tokens", type=int, default=DEFAULT_CONTEXT_TOKENS,
+                        help=f"Cap on the estimated tokens of context per issue (default: {DEFAULT_CONTEXT_TOKENS}).")
+    parser.add_argument("--llm-tpm", type=int, default=None,
+                        help="Tokens-per-minute budget for LLM requests, e.g. your Groq tier's limit (default: unlimited).")
+    parser.add_argument("--llm-rpm", type=int, default=None,
+                        help="Requests-per-minute budget for LLM requests (default: unlimited).")
+    parser.add_argument("--llm-max-wait", type=float, default=DEFAULT_MAX_WAIT,
+                        help=f"With --llm-tpm/--llm-rpm, the longest a request waits for budget before the "
+                             f"remaining issues are marked deferred (default: {DEFAULT_MAX_WAIT:g}s).")
+    parser.add_argument("--llm-backend", choices=sorted(LLM_BACKENDS), default="groq",
+                        help="LLM backend: Groq Cloud (needs GROQ_API_KEY), any OpenAI-compatible server "
+                             "such as a local Ollama or llama.cpp (openai), or the in-process stub.")
+    parser.add_argument("--llm-model", type=str, default=None,
+                        help="Model name (default: the backend's default, e.g. llama-3.1-8b-instant on Groq).")
+    parser.add_argument("--llm-base-url", type=str, default=None,
+                        help="Override the backend's base URL, e.g. http://localhost:11434/v1 for Ollama "
+                             "with --llm-backend openai.")
+    parser.add_argument("--llm-pool-size", type=int, default=None,
+                        help=f"Keep-alive HTTP connections shared by LLM requests "
+                             f"(default: the larger of {DEFAULT_POOL_SIZE} and --llm-concurrency).")
+    parser.add_argument("--llm-connect-timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT,
+                        help="Seconds allowed to establish a connection to the LLM endpoint.")
+    parser.add_argument("--cache-dir", type=str, default=DEFAULT_CACHE_DIR,
+                        help=f"Directory of the persistent LLM suggestion cache (default: {DEFAULT_CACHE_DIR}).")
+    parser.add_argument("--no-cache", action="store_true", help="Always query the LLM, bypassing the suggestion cache.")
+
+def build_detector_config(args):
+    """The detector config dict accepted by get_detector_set (raises ValueError for bad options)."""
+    return {
+        "enabled": args.enable_detector,
+        "disabled": args.disable_detector,
+        "options": parse_detector_options(args.detector_option),
+    }
+
+def build_rule_table(args):
+    """The suggestion rule table, or None with --no-rules (raises ValueError for a bad rules file)."""
+    from core.autofix.rules import RuleTable
+    return None if args.no_rules else RuleTable.from_config(args.rules)
+
+def build_llm_backend(args):
+    return create_backend(
+        args.llm_backend,
+        base_url=args.llm_base_url,
+        pool_size=args.llm_pool_size or max(DEFAULT_POOL_SIZE, args.llm_concurrency),
+        timeout=args.llm_timeout,
+        connect_timeout=args.llm_connect_timeout,
+    )
+
+def build_prompt_builder(args):
+    from core.llm.prompt_builder import PromptBuilder
+    return PromptBuilder(context=args.llm_context, max_context_tokens=args.llm_context_tokens)
+
+def enricher_options(args):
+    """AsyncEnricher keyword arguments from the LLM options."""
+    options = {
+        "concurrency": args.llm_concurrency,
+        "timeout": args.llm_timeout,
+        "max_retries": args.llm_retries,
+        "batch_size": args.llm_batch_size,
+        "per_literal": getattr(args, "consolidate_literals", False),
+    }
+    if args.llm_tpm or args.llm_rpm:
+        from core.llm.scheduler import RequestScheduler
+        options["scheduler"] = RequestScheduler(tpm=args.llm_tpm, rpm=args.llm_rpm, max_wait=args.llm_max_wait)
+    return options
+
+
+def build_enricher(args):
+    """Initializes the LLM stack for a review: (AsyncEnricher, SuggestionCache or None)."""
+    from core.llm.suggestion_generator import SuggestionGenerator
+    from core.llm.async_enricher import AsyncEnricher
+    from core.llm.suggestion_cache import SuggestionCache
+    cache = None if args.no_cache else SuggestionCache(args.cache_dir)
+    llm_generator = SuggestionGenerator(model=args.llm_model, cache=cache, backend=build_llm_backend(args),
+                                        prompt_builder=build_prompt_builder(args))
+    if llm_generator.available:
+        print(f"  🧠 Requesting AI suggestions from {llm_generator.backend.describe()} "
+              f"({llm_generator.model}, {args.llm_concurrency} concurrent request(s))...")
+    else:
+        print(f"WARNING: {llm_generator.backend.unavailable_reason}. LLM functionality disabled "
+              "(pass --no-llm to skip it explicitly).")
+    return AsyncEnricher(llm_generator, **enricher_options(args)), cache
+
+def remember_result(manifest, result, enricher):
+    """
+    Records a fresh result in the manifest. Files with read errors or failed
+    suggestions are retried next run, as are files whose issues were never
+    enriched (--no-llm).
+    """
+    retry = bool(result["error"])
+    if not retry and result["issues"]:
+        if enricher is None:
+            retry = True
+        else:
+            from core.llm.suggestion_generator import is_failed_suggestion
+            retry = any(is_failed_suggestion(issue.get('suggestion')) for issue in result["issues"])
+    if retry:
+        manifest.forget(result["file"])
+    else:
+        manifest.record(result)
+
+def build_analysis_version(detector_set, args, rules):
+    """
+    The version stored results are valid for. Consolidated fixes are named
+    differently and rules change fixes and suggestions, so both are part of it.
+    """
+    version = detector_set.version + (";shared-constants" if args.consolidate_literals else "")
+    return version + (f";rules={rules.version}" if rules is not None else "")
+
+def build_suggestion_version(args):
+    """
+    The LLM settings stored suggestions are valid for: backend, model, endpoint
+    and prompt shape. None for --no-llm, which reuses suggestions from any.
+    """
+    if args.no_llm:
+        return None
+    version = f"{args.llm_backend}:{args.llm_model or LLM_BACKENDS[args.llm_backend].default_model}"
+    if args.llm_base_url:
+        version += f"@{args.llm_base_url}"
+    return version + f";context={args.llm_context}/{args.llm_context_tokens};batch={args.llm_batch_size}"
@@ -0,0 +1,155 @@
+# ai-code-reviewer/cli/server.py
+import argparse
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from cli.options import (add_detector_arguments, add_llm_arguments, add_rule_arguments, build_detector_config,
+                         build_llm_backend, build_prompt_builder, build_rule_table, enricher_options)
+from core.llm.suggestion_cache import SuggestionCache
+from core.llm.suggestion_generator import SuggestionGenerator
+from core.service import ReviewService, DEFAULT_PARSE_CACHE_SIZE
+from core import telemetry
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class SourceRequest(BaseModel):
+    """A file on the server's disk ('path') or an editor buffer ('code'), exactly one of the two."""
+    path: Optional[str] = None
+    code: Optional[str] = None
+    # Name reported for buffers (defaults to the path, or "<buffer>")
+    filename: Optional[str] = None
+
+
+class AnalyzeRequest(SourceRequest):
+    enrich: bool = False
+
+
+class IssuesRequest(SourceRequest):
+    issues: List[Dict[str, Any]]
+
+
+class ApplyFixesRequest(SourceRequest):
+    # Fixes to apply, as returned by /analyze or /fixes/prepare; default: every prepared fix
+    issues: Optional[List[Dict[str, Any]]] = None
+
+
+def create_app(service: ReviewService) -> FastAPI:
+    """
+    HTTP API over a warm ReviewService. CPU-bound endpoints are plain functions
+    (run in FastAPI's thread pool); LLM endpoints are async and share the
+    service's event loop and connection pool.
+    """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await service.aclose()
+
+    app = FastAPI(title="AI Code Reviewer", lifespan=lifespan)
+
+    def analyze_source(request: SourceRequest):
+        try:
+            return service.analyze(path=request.path, code=request.code, filename=request.filename)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except (OSError, UnicodeDecodeError) as e:
+            raise HTTPException(status_code=404 if isinstance(e, FileNotFoundError) else 400,
+                                detail=f"Could not read file: {e}")
+
+    async def enrich_source(issues: List[Dict[str, Any]], request: SourceRequest):
+        try:
+            return await service.enrich(issues, path=request.path, code=request.code)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except OSError as e:
+            raise HTTPException(status_code=404, detail=f"Could not read file: {e}")
+
+    @app.get("/health")
+    async def health():
+        return service.health()
+
+    @app.get("/metrics")
+    async def metrics():
+        return telemetry.get_telemetry().summary()
+
+    @app.post("/analyze")
+    async def analyze(request: AnalyzeRequest):
+        # Parsing and detection are CPU-bound; keep them off the event loop
+        issues, cached = await run_in_threadpool(analyze_source, request)
+        if request.enrich and issues:
+            await enrich_source(issues, request)
+        return {"file": request.filename or request.path or "<buffer>", "cached": cached,
+                "total_issues": len(issues), "issues": issues}
+
+    @app.post("/enrich")
+    async def enrich(request: IssuesRequest):
+        return {"issues": await enrich_source(request.issues, request)}
+
+    @app.post("/fixes/prepare")
+    def prepare_fixes(request: SourceRequest):
+        issues, cached = analyze_source(request)
+        prepared = [issue for issue in issues if issue.get('autofix_status') == 'Prepared']
+        return {"file": request.filename or request.path or "<buffer>", "cached": cached,
+                "total_fixes": len(prepared), "issues": prepared}
+
+    @app.post("/fixes/apply")
+    def apply_fixes(request: ApplyFixesRequest):
+        try:
+            applied, new_code = service.apply_fixes(path=request.path, code=request.code, issues=request.issues)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except OSError as e:
+            raise HTTPException(status_code=404, detail=f"Could not read file: {e}")
+        response = {"applied": applied}
+        if new_code is not None:
+            response["code"] = new_code
+        return response
+
+    return app
+
+
+def serve_main(argv=None):
+    """Entry point of `python -m cli.main serve`."""
+    parser = argparse.ArgumentParser(prog="cli.main serve",
+                                     description="Run the review daemon: a warm HTTP API for editors and hooks.")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST,
+                        help=f"Interface to bind (default: {DEFAULT_HOST}). The API reads and rewrites files "
+                             "by path, so only expose it to trusted clients.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT}).")
+    parser.add_argument("--parse-cache-size", type=int, default=DEFAULT_PARSE_CACHE_SIZE,
+                        help="Analysis results kept in memory per distinct file content.")
+    parser.add_argument("--no-llm", action="store_true", help="Serve analysis and fixes only; /enrich returns 503.")
+    add_detector_arguments(parser)
+    add_rule_arguments(parser)
+    add_llm_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        detector_config = build_detector_config(args)
+        generator = cache = None
+        if not args.no_llm:
+            cache = None if args.no_cache else SuggestionCache(args.cache_dir)
+            generator = SuggestionGenerator(model=args.llm_model, cache=cache, backend=build_llm_backend(args),
+                                            prompt_builder=build_prompt_builder(args))
+        service = ReviewService(detector_config, generator=generator, cache=cache,
+                                enricher_options=enricher_options(args), parse_cache_size=args.parse_cache_size,
+                                rules=build_rule_table(args))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    import uvicorn
+    print(f"🚀 Review daemon listening on http://{args.host}:{args.port} "
+          f"(detectors: {', '.join(service.detectors.names) or 'none'})")
+    if service.generator is None:
+        print("  ⏭️  LLM enrichment disabled (--no-llm).")
+    elif not service.generator.available:
+        print(f"WARNING: {service.generator.backend.unavailable_reason}. LLM functionality disabled.")
+    uvicorn.run(create_app(service), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,208 @@
+# ai-code-reviewer/cli/watch.py
+import fnmatch
+import glob
+import os
+import time
+from typing import Any, Dict, List, Set
+
+from cli.options import (build_analysis_version, build_detector_config, build_enricher, build_rule_table,
+                         build_suggestion_version, remember_result)
+from core.analysis.file_discovery import discover_python_files, select_files
+from core.analysis.literal_index import LiteralIndex
+from core.analysis.manifest import AnalysisManifest, hash_content
+from core.analysis.parallel_runner import analyze_file, get_detector_set
+from core.analysis.pipeline import enrich_results
+from core.analysis.watcher import create_watcher, next_changes, watch_roots
+from core.report.json_reporter import build_metadata, load_report, open_report_writer, summarize_file_result
+from core.report.update_log import ReportUpdateLog
+from core import telemetry
+
+# Per-file updates appended before the report is rewritten in full
+COMPACT_EVERY = 500
+
+
+class WatchSession:
+    """
+    Keeps a review current while files are edited. Each debounced batch of
+    changes re-analyzes (and re-enriches) only the files whose content changed,
+    in-process so there is no pool start-up, and appends one journal entry per
+    file to the report (see ReportUpdateLog). The full report is rewritten
+    every COMPACT_EVERY updates and on exit.
+    """
+    def __init__(self, args, report_path: str):
+        self.args = args
+        self.report_path = report_path
+        self.targets = [os.path.normpath(target) for target in args.paths]
+        self.detector_config = build_detector_config(args)
+        detector_set = get_detector_set(self.detector_config)
+        self.rules = build_rule_table(args)
+        version = build_analysis_version(detector_set, args, self.rules)
+        self.manifest = (None if args.no_incremental
+                         else AnalysisManifest(args.cache_dir, version, build_suggestion_version(args)))
+        self.literal_index = LiteralIndex(args.cache_dir) if args.consolidate_literals else None
+        self.enricher = self.cache = None
+        if not args.no_llm:
+            self.enricher, self.cache = build_enricher(args)
+
+        # The report just written is the starting state; issues are grouped per file
+        metadata, issues = load_report(report_path)
+        self.metadata = metadata
+        self.summaries: Dict[str, Dict[str, Any]] = {entry["path"]: entry for entry in metadata.get("files", [])}
+        self.issues: Dict[str, List[Dict[str, Any]]] = {path: [] for path in self.summaries}
+        for issue in issues:
+            self.issues.setdefault(issue["file"], []).append(issue)
+        self.journal = ReportUpdateLog(report_path)
+        self.updates = 0
+        # Content hash of each file analyzed this session, for results the manifest doesn't keep (--no-llm)
+        self.digests: Dict[str, str] = {}
+
+    def _in_targets(self, path: str) -> bool:
+        """Whether a new file falls under the paths given on the command line."""
+        for target in self.targets:
+            if glob.has_magic(target):
+                if fnmatch.fnmatch(path, target):
+                    return True
+            elif path == target or target == os.curdir or path.startswith(target.rstrip(os.sep) + os.sep):
+                return True
+        return False
+
+    def _expand(self, changed: Set[str]) -> Set[str]:
+        """Files to reconsider: changed files under the targets, and everything under changed directories."""
+        args = self.args
+        paths = set()
+        for path in changed:
+            if os.path.isdir(path):
+                # New, moved-in or (after an event overflow) unknown content: rediscover it
+                paths.update(found for found in discover_python_files([path], include=args.include, exclude=args.exclude)
+                             if self._in_targets(found))
+            prefix = path.rstrip(os.sep) + os.sep
+            paths.update(known for known in self.summaries if known == path or known.startswith(prefix))
+            if os.path.isfile(path) and self._in_targets(path):
+                paths.update(select_files([path], include=args.include, exclude=args.exclude))
+        return paths
+
+    def _unchanged(self, path: str) -> bool:
+        """Saving without edits (or touching a file) keeps the stored result."""
+        if path not in self.summaries:
+            return False
+        if self.manifest is not None and self.manifest.lookup(path) is not None:
+            return True
+        digest = self.digests.get(path)
+        if digest is None:
+            return False
+        try:
+            with open(path, 'rb') as f:
+                return hash_content(f.read()) == digest
+        except OSError:
+            return False
+
+    def process(self, changed: Set[str]) -> int:
+        """Brings the report up to date for a batch of changed paths. Returns the files updated."""
+        start = time.perf_counter()
+        stale, removed = [], []
+        for path in sorted(self._expand(changed)):
+            if not os.path.isfile(path):
+                if path in self.summaries:
+                    removed.append(path)
+            elif not self._unchanged(path):
+                stale.append(path)
+        if not stale and not removed:
+            return 0
+
+        args = self.args
+        with telemetry.span("watch_analyze"):
+            results = [analyze_file(path, self.detector_config, args.consolidate_literals, self.rules)
+                       for path in stale]
+        if self.literal_index is not None:
+            # Only the changed files' frequencies are refreshed until the next full run
+            for result in results:
+                sha256 = None if result.get("error") else result.get("sha256")
+                self.literal_index.update_file(os.path.abspath(result["file"]), sha256, result["issues"])
+                self.literal_index.annotate(result["issues"])
+        if self.enricher is not None:
+            results = list(enrich_results(results, self.enricher))
+
+        for result in results:
+            path = result["file"]
+            if result["error"]:
+                print(f"  ⚠️  {path}: {result['error']}")
+            if self.manifest is not None:
+                remember_result(self.manifest, result, self.enricher)
+            if result.get("sha256"):
+                self.digests[path] = result["sha256"]
+            before = len(self.issues.get(path, []))
+            summary = summarize_file_result(result)
+            self.issues[path] = result["issues"]
+            self.summaries[path] = summary
+            self.journal.append(path, result["issues"], summary)
+            print(f"  🔄 {path}: {len(result['issues'])} issue(s) ({len(result['issues']) - before:+d})")
+        for path in removed:
+            self.issues.pop(path, None)
+            self.summaries.pop(path, None)
+            self.digests.pop(path, None)
+            if self.manifest is not None:
+                self.manifest.forget(path)
+            if self.literal_index is not None:
+                self.literal_index.update_file(os.path.abspath(path), None, [])
+            self.journal.append(path, None)
+            print(f"  🗑️  {path}: removed from the report")
+
+        self.updates += len(results) + len(removed)
+        total = sum(len(issues) for issues in self.issues.values())
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        telemetry.observe("watch_update_seconds", elapsed_ms / 1000)
+        print(f"  ⚡ Report updated in {elapsed_ms:.0f} ms: {total} issue(s) in {len(self.summaries)} file(s).")
+        if self.journal.entries >= COMPACT_EVERY:
+            self.compact()
+        return len(results) + len(removed)
+
+    def compact(self):
+        """Rewrites the full report from the in-memory state and starts an empty journal."""
+        order = sorted(self.summaries)
+        total = sum(len(self.issues.get(path, [])) for path in order)
+        # Run-level entries (cache, rules, metrics...) from the initial run are kept
+        metadata = {**self.metadata, **build_metadata([self.summaries[path] for path in order], total)}
+        metadata["watch"] = {"updates": self.updates}
+        with telemetry.span("report_write"):
+            with open_report_writer(self.report_path, self.args.format) as writer:
+                for path in order:
+                    for issue in self.issues.get(path, []):
+                        writer.write_issue(issue)
+                writer.close(metadata)
+        self.journal.reset()
+        if self.manifest is not None:
+            with telemetry.span("manifest_save"):
+                self.manifest.save()
+
+    def close(self):
+        try:
+            if self.journal.entries:
+                self.compact()
+            elif self.manifest is not None:
+                self.manifest.save()
+        finally:
+            self.journal.close()
+            if self.enricher is not None:
+                self.enricher.close()
+            if self.cache is not None:
+                self.cache.close()
+            if self.literal_index is not None:
+                self.literal_index.close()
+
+
+def watch(args, report_path: str):
+    """Entry point of --watch, after the initial review has written report_path."""
+    roots = watch_roots(args.paths)
+    watcher = create_watcher(roots, include=args.include, exclude=args.exclude, polling=args.watch_poll)
+    session = WatchSession(args, report_path)
+    print(f"\n👀 Watching {', '.join(roots)} ({watcher.name}, {args.watch_debounce * 1000:.0f} ms debounce). "
+          "Press Ctrl+C to stop.")
+    try:
+        while True:
+            session.process(next_changes(watcher, args.watch_debounce))
+    except KeyboardInterrupt:
+        print("\n  ⏹️  Stopping watch mode.")
+    finally:
+        watcher.close()
+        session.close()
+    print(f"  ✅ Report written successfully to: {report_path}")
@@ -1,55 +1,120 @@
 # ai-code-reviewer/core/analysis/analyzer.py
 import ast
-from typing import List, Dict, Any
+import time
+from bisect import bisect_left
+from typing import List, Iterator, Optional, Union
 
-class MagicNumberVisitor(ast.NodeVisitor):
-    """
-    AST visitor to find instances of 'Magic Numbers' (raw, hardcoded numbers) 
-    in assignment statements and simple expressions.
-    """
-    def __init__(self):
-        self.issues = []
-
-    def visit_Constant(self, node):
-        """Called for literal constant values like 5, 100, "hello"."""
-        # Check if the constant is an integer or float (but not 0, 1, -1)
-        if isinstance(node.value, (int, float)):
-            # Ignore common constants like 0, 1, -1, 2 (often used for loops, booleans, etc.)
-            if abs(node.value) > 2 and not isinstance(node.value, bool):
-                self.issues.append({
-                    "type": "MagicNumber",
-                    "line": node.lineno,
-                    "col": node.col_offset,
-                    "value": node.value,
-                    "message": f"Found magic number: {node.value}. Consider using a named constant."
-                })
-        
-        # Continue traversing the children of this node
-        self.generic_visit(node)
+from core.detectors import DetectorSet, DetectionContext, create_detector_set
+from core.detectors.base import SCOPE_NODES
+from core.models import Issue
+from core.parser.source_document import SourceDocument, as_document
+from core import telemetry
+
+_default_detector_set: Optional[DetectorSet] = None
+# Stack marker popped after the last child of a scope node
+_EXIT_SCOPE = object()
+
+
+def default_detector_set() -> DetectorSet:
+    """The detector set used when none is configured; built once per process."""
+    global _default_detector_set
+    if _default_detector_set is None:
+        _default_detector_set = create_detector_set()
+    return _default_detector_set
+
+
+def _spans_candidate(node: ast.stmt, lines: List[int]) -> bool:
+    """Whether a statement, decorators included, spans one of the (sorted) candidate lines."""
+    start = node.lineno
+    decorators = getattr(node, "decorator_list", None)
+    if decorators:
+        start = min(start, decorators[0].lineno)
+    index = bisect_left(lines, start)
+    return index < len(lines) and lines[index] <= node.end_lineno
 
 
 class Analyzer:
     """
     Performs static code analysis on a given Python file content.
+    The tree is walked once and every node is dispatched to all detectors
+    interested in its type, so adding a detector doesn't add a traversal.
+
+    With prefilter (the default), detectors first name their candidate lines
+    from a token scan (see Detector.candidate_lines): files without any are
+    never parsed, and statements without any are not walked.
     """
-    def __init__(self, code: str):
-        self.code = code
+    def __init__(self, code: Union[str, SourceDocument], filename: str = "<unknown>",
+                 detectors: Optional[DetectorSet] = None, prefilter: bool = True):
+        self.document = as_document(code, filename)
+        self.filename = filename
+        self.detectors = detectors or default_detector_set()
+        self.prefilter = prefilter
 
-    def analyze(self) -> List[Dict[str, Any]]:
-        """Parses the code and runs all checks."""
-        issues = []
+    def iter_issues(self) -> Iterator[Issue]:
+        """Parses the code and yields issues from all detectors, in source order."""
+        candidates = None
         try:
-            # 1. Parse the code into an Abstract Syntax Tree (AST)
-            tree = ast.parse(self.code)
-            
-            # 2. Run the MagicNumber check
-            visitor = MagicNumberVisitor()
-            visitor.visit(tree)
-            issues.extend(visitor.issues)
+            if self.prefilter:
+                with telemetry.span("prefilter"):
+                    lines = self.detectors.candidate_lines(self.document)
+                if lines is not None:
+                    if not lines:
+                        telemetry.incr("prefilter_skipped_files_total")
+                        return
+                    candidates = sorted(lines)
 
+            # 1. Parse the code into an Abstract Syntax Tree (AST)
+            with telemetry.span("parse"):
+                tree = ast.parse(self.document.text, filename=self.filename)
         except SyntaxError as e:
-            print(f"Error: Could not parse file due to a Syntax Error on line {e.lineno}.")
+            print(f"Error: Could not parse {self.filename} due to a Syntax Error on line {e.lineno}.")
+            return
+        except Exception as e:
+            print(f"An unexpected analysis error occurred in {self.filename}: {e}")
+            return
+
+        # 2. Single pre-order walk (source order), dispatching each node through the precomputed table
+        context = DetectionContext(self.filename, self.document)
+        dispatch = self.detectors.dispatch
+        stack = [tree]
+        # Detection time excludes the time downstream stages spend between yields
+        elapsed = 0.0
+        resumed = time.perf_counter()
+        try:
+            while stack:
+                node = stack.pop()
+                if node is _EXIT_SCOPE:
+                    context.scopes.pop()
+                    continue
+                handlers = dispatch.get(type(node))
+                if handlers is not None:
+                    for handler in handlers:
+                        for issue in handler(node, context):
+                            if isinstance(issue, dict):
+                                issue = Issue.from_dict(issue)
+                            elapsed += time.perf_counter() - resumed
+                            yield issue
+                            resumed = time.perf_counter()
+                if isinstance(node, SCOPE_NODES):
+                    # Decorators and defaults are visited inside the scope too; detectors only need an approximation
+                    context.scopes.append(node.name)
+                    stack.append(_EXIT_SCOPE)
+                children = list(ast.iter_child_nodes(node))
+                if candidates is not None:
+                    # Statements without a candidate line can't hold an issue; skip their whole subtree
+                    children = [child for child in children
+                                if not isinstance(child, ast.stmt) or _spans_candidate(child, candidates)]
+                stack.extend(reversed(children))
         except Exception as e:
-            print(f"An unexpected analysis error occurred: {e}")
-            
-        return issues
\ No newline at end of file
+            print(f"An unexpected analysis error occurred in {self.filename}: {e}")
+        finally:
+            elapsed += time.perf_counter() - resumed
+            telemetry.observe("stage_seconds", elapsed, stage="detect")
+
+    @property
+    def code(self) -> str:
+        return self.document.text
+
+    def analyze(self) -> List[Issue]:
+        """Parses the code and runs all checks."""
+        return list(self.iter_issues())
@@ -0,0 +1,163 @@
+# ai-code-reviewer/core/analysis/diff_scope.py
+import os
+import re
+import subprocess
+import sys
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# "@@ -12,3 +14,5 @@": 3 old lines from line 12 became 5 new lines from line 14; counts default to 1
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+# Reading a unified diff from stdin instead of running git
+STDIN_SPEC = "-"
+
+
+def _diff_path(header: str) -> Optional[str]:
+    """The path from a '+++ b/path' line; None for deleted files."""
+    path = header[4:].split("\t", 1)[0].strip()
+    if path == "/dev/null":
+        return None
+    if path.startswith('"') and path.endswith('"'):
+        # git quotes unusual paths C-style
+        path = path[1:-1].encode("latin-1", "backslashreplace").decode("unicode_escape").encode("latin-1").decode("utf-8")
+    return path[2:] if path.startswith("b/") else path
+
+
+def _to_ranges(lines: Iterable[int]) -> List[Tuple[int, int]]:
+    """Merges sorted line numbers into inclusive (start, end) ranges."""
+    ranges: List[Tuple[int, int]] = []
+    for line in lines:
+        if ranges and line <= ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], line))
+        else:
+            ranges.append((line, line))
+    return ranges
+
+
+def parse_unified_diff(text: str) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Maps each file in a unified diff to the inclusive line ranges added or
+    changed in its new version. Context lines and pure deletions don't count,
+    so diffs with or without context (-U0) give the same result.
+    """
+    changed: Dict[str, List[int]] = {}
+    current: Optional[List[int]] = None
+    new_line = old_left = new_left = 0
+    for line in text.splitlines():
+        if old_left > 0 or new_left > 0:
+            # Inside a hunk, so "--- x" is a removed line, not a file header
+            if line.startswith("+"):
+                if current is not None:
+                    current.append(new_line)
+                new_line += 1
+                new_left -= 1
+            elif line.startswith("-"):
+                old_left -= 1
+            elif line.startswith(" "):
+                new_line += 1
+                old_left -= 1
+                new_left -= 1
+            # "\ No newline at end of file" belongs to neither side
+            continue
+
+        match = HUNK_HEADER.match(line)
+        if match:
+            old_left = int(match.group(1) or 1)
+            new_line = int(match.group(2))
+            new_left = int(match.group(3) or 1)
+        elif line.startswith("diff "):
+            current = None
+        elif line.startswith("+++ "):
+            path = _diff_path(line)
+            current = changed.setdefault(path, []) if path else None
+    return {path: _to_ranges(sorted(lines)) for path, lines in changed.items()}
+
+
+def _git(args: List[str], cwd: Optional[str] = None) -> str:
+    try:
+        completed = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    except OSError as e:
+        raise RuntimeError(f"Could not run git: {e}")
+    if completed.returncode:
+        raise RuntimeError(f"git {' '.join(args)} failed: {completed.stderr.strip()}")
+    return completed.stdout
+
+
+def git_toplevel(cwd: Optional[str] = None) -> Optional[str]:
+    """The root of the git work tree containing cwd, or None outside a repository."""
+    try:
+        return _git(["rev-parse", "--show-toplevel"], cwd).strip()
+    except RuntimeError:
+        return None
+
+
+def git_diff(spec: str, cwd: Optional[str] = None) -> str:
+    """
+    Unified diff without context for a revision range ("base..head",
+    "base...head") or a single revision (compared with the working tree),
+    restricted to added, copied, modified and renamed files.
+    """
+    return _git(["diff", "--unified=0", "--no-color", "--no-ext-diff", "--find-renames",
+                 "--diff-filter=ACMR", spec, "--"], cwd)
+
+
+class DiffScope:
+    """
+    The changed lines of a diff, keyed by absolute path. Analysis keeps only
+    issues on these lines, so work scales with the size of the change.
+    """
+    def __init__(self, changes: Dict[str, List[Tuple[int, int]]], root: str, spec: str = STDIN_SPEC):
+        self.spec = spec
+        self.root = root
+        self.ranges = {os.path.abspath(os.path.join(root, path)): ranges for path, ranges in changes.items()}
+        # Range starts per file, for bisecting
+        self._starts = {path: [start for start, _ in ranges] for path, ranges in self.ranges.items()}
+
+    @classmethod
+    def from_spec(cls, spec: str, cwd: Optional[str] = None, stdin_text: Optional[str] = None) -> "DiffScope":
+        """
+        Builds the scope from local git ("base..head") or, for "-", from a
+        unified diff read from stdin (paths relative to the repository root,
+        or to cwd outside a repository).
+        """
+        cwd = cwd or os.getcwd()
+        root = git_toplevel(cwd)
+        if spec == STDIN_SPEC:
+            if stdin_text is None:
+                stdin_text = sys.stdin.read()
+            return cls(parse_unified_diff(stdin_text), root or cwd, spec)
+        if root is None:
+            raise RuntimeError(f"--diff {spec} needs a git repository ({cwd} is not inside one)")
+        return cls(parse_unified_diff(git_diff(spec, root)), root, spec)
+
+    @property
+    def paths(self) -> List[str]:
+        """Changed files that still exist, relative to the current directory when possible."""
+        found = []
+        for path in sorted(self.ranges):
+            if self.ranges[path] and os.path.isfile(path):
+                relative = os.path.relpath(path)
+                found.append(path if relative.startswith("..") else relative)
+        return found
+
+    @property
+    def changed_lines(self) -> int:
+        return sum(end - start + 1 for ranges in self.ranges.values() for start, end in ranges)
+
+    def contains(self, path: str, line: int) -> bool:
+        path = os.path.abspath(path)
+        ranges = self.ranges.get(path)
+        if not ranges:
+            return False
+        index = bisect_right(self._starts[path], line) - 1
+        return index >= 0 and line <= ranges[index][1]
+
+    def covers_file(self, path: str) -> bool:
+        return bool(self.ranges.get(os.path.abspath(path)))
+
+
+def filter_to_scope(file_results: Iterable[dict], scope: DiffScope) -> Iterator[dict]:
+    """Pipeline stage: drops issues outside the changed lines, before they are enriched."""
+    for result in file_results:
+        result["issues"] = [issue for issue in result["issues"] if scope.contains(result["file"], issue["line"])]
+        yield result
@@ -0,0 +1,80 @@
+# ai-code-reviewer/core/analysis/file_discovery.py
+import fnmatch
+import glob
+import os
+from typing import Iterable, List, Optional
+
+# Directories that never contain reviewable project code
+DEFAULT_EXCLUDES = [
+    ".git", ".hg", ".svn", "__pycache__", ".venv", "venv",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", "node_modules", "*.egg-info",
+]
+
+DEFAULT_INCLUDES = ["*.py"]
+
+
+def matches_patterns(path: str, patterns: Iterable[str]) -> bool:
+    """True if the path, or any of its components, matches one of the glob patterns."""
+    normalized = path.replace(os.sep, "/")
+    parts = normalized.split("/")
+    for pattern in patterns:
+        if fnmatch.fnmatch(normalized, pattern):
+            return True
+        if any(fnmatch.fnmatch(part, pattern) for part in parts):
+            return True
+    return False
+
+
+def discover_python_files(
+    targets: Iterable[str],
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Expands files, directories and glob patterns into a sorted, de-duplicated
+    list of Python files to review.
+    """
+    include = include or DEFAULT_INCLUDES
+    exclude = DEFAULT_EXCLUDES + (exclude or [])
+    found = set()
+
+    for target in targets:
+        # Globs are expanded first; anything else is treated as a literal path
+        if glob.has_magic(target):
+            candidates = glob.glob(target, recursive=True)
+        else:
+            candidates = [target]
+
+        for candidate in candidates:
+            if os.path.isdir(candidate):
+                for root, dirs, files in os.walk(candidate):
+                    # Prune excluded directories in place so os.walk never enters them
+                    dirs[:] = [d for d in dirs if not matches_patterns(d, exclude)]
+                    for name in files:
+                        path = os.path.normpath(os.path.join(root, name))
+                        if matches_patterns(name, include) and not matches_patterns(path, exclude):
+                            found.add(path)
+            elif os.path.isfile(candidate):
+                # Explicitly named files are only filtered by the exclude list
+                path = os.path.normpath(candidate)
+                if not matches_patterns(path, exclude):
+                    found.add(path)
+
+    return sorted(found)
+
+
+def select_files(
+    paths: Iterable[str],
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Applies the include and exclude filters to an explicit list of existing
+    files, e.g. the files changed in a diff.
+    """
+    include = include or DEFAULT_INCLUDES
+    exclude = DEFAULT_EXCLUDES + (exclude or [])
+    return sorted({
+        os.path.normpath(path) for path in paths
+        if os.path.isfile(path) and matches_patterns(os.path.basename(path), include) and not matches_patterns(path, exclude)
+    })
@@ -0,0 +1,151 @@
+# ai-code-reviewer/core/analysis/literal_index.py
+import ast
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core import telemetry
+
+INDEX_FILENAME = "literals.sqlite3"
+# Literals that occur at least this often are reported as consolidation candidates
+MIN_SHARED_OCCURRENCES = 2
+DEFAULT_TOP_LITERALS = 20
+
+
+def literal_key(value: Any) -> str:
+    """Index key of a literal; the type is part of it, so 200 and 200.0 stay apart."""
+    return f"{type(value).__name__}:{value!r}"
+
+
+def literal_from_key(key: str) -> Any:
+    return ast.literal_eval(key.partition(":")[2])
+
+
+class LiteralIndex:
+    """
+    Project-wide inverted index from literal value to its occurrences
+    (file, line, col, enclosing scope), stored in SQLite next to the other caches.
+    Workers find the literals (map); the parent replaces each analyzed file's
+    rows (reduce), so unchanged files keep theirs and updates are incremental.
+    """
+    def __init__(self, cache_dir: str):
+        self.path = os.path.join(cache_dir, INDEX_FILENAME)
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " sha256 TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS occurrences ("
+            " value TEXT NOT NULL,"
+            " path TEXT NOT NULL,"
+            " line INTEGER NOT NULL,"
+            " col INTEGER NOT NULL,"
+            " scope TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_occurrences_value ON occurrences (value)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_occurrences_path ON occurrences (path)")
+
+    def is_current(self, path: str, sha256: str) -> bool:
+        row = self._conn.execute("SELECT sha256 FROM files WHERE path = ?", (path,)).fetchone()
+        return row is not None and row[0] == sha256
+
+    def update_file(self, path: str, sha256: Optional[str], issues: Iterable[Dict[str, Any]]):
+        """Replaces the file's occurrences with the MagicNumber findings of its latest analysis."""
+        rows = [
+            (literal_key(issue['value']), path, issue['line'], issue.get('col') or 0, issue.get('scope'))
+            for issue in issues if issue['type'] == "MagicNumber" and issue.get('value') is not None
+        ]
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM occurrences WHERE path = ?", (path,))
+            conn.executemany("INSERT INTO occurrences (value, path, line, col, scope) VALUES (?, ?, ?, ?, ?)", rows)
+            if sha256:
+                conn.execute("INSERT OR REPLACE INTO files (path, sha256) VALUES (?, ?)", (path, sha256))
+            else:
+                # Unreadable files are simply dropped from the index
+                conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def prune(self) -> int:
+        """Forgets files that no longer exist. Returns how many were removed."""
+        missing = [path for (path,) in self._conn.execute("SELECT path FROM files") if not os.path.exists(path)]
+        for path in missing:
+            self.update_file(path, None, [])
+        return len(missing)
+
+    def counts(self, value: Any) -> Tuple[int, int]:
+        """(occurrences, distinct files) of a literal across the project."""
+        return self._conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT path) FROM occurrences WHERE value = ?", (literal_key(value),)
+        ).fetchone()
+
+    def occurrences(self, value: Any) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT path, line, col, scope FROM occurrences WHERE value = ? ORDER BY path, line, col",
+            (literal_key(value),),
+        )
+        return [{"file": path, "line": line, "col": col, "scope": scope} for path, line, col, scope in rows]
+
+    def ranked(self, limit: int = DEFAULT_TOP_LITERALS,
+               min_occurrences: int = MIN_SHARED_OCCURRENCES) -> List[Dict[str, Any]]:
+        """Literals ordered by how often they occur, most frequent first."""
+        rows = self._conn.execute(
+            "SELECT value, COUNT(*) AS n, COUNT(DISTINCT path) FROM occurrences"
+            " GROUP BY value HAVING n >= ? ORDER BY n DESC, value LIMIT ?",
+            (min_occurrences, limit),
+        )
+        return [{"value": literal_from_key(key), "occurrences": count, "files": files} for key, count, files in rows]
+
+    def annotate(self, issues: Iterable[Dict[str, Any]], counts: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        Tags MagicNumber issues with their project-wide frequency.
+        'counts' memoizes lookups across calls.
+        """
+        counts = {} if counts is None else counts
+        for issue in issues:
+            if issue['type'] != "MagicNumber" or issue.get('value') is None:
+                continue
+            key = literal_key(issue['value'])
+            if key not in counts:
+                counts[key] = self.counts(issue['value'])
+            issue['literal_occurrences'], issue['literal_files'] = counts[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Index totals for the report metadata."""
+        (files,) = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()
+        occurrences, distinct = self._conn.execute("SELECT COUNT(*), COUNT(DISTINCT value) FROM occurrences").fetchone()
+        return {"path": self.path, "files": files, "occurrences": occurrences, "distinct_values": distinct}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def index_literals(file_results: Iterable[Dict[str, Any]], index: LiteralIndex) -> Iterator[Dict[str, Any]]:
+    """
+    Pipeline stage: reduces every file's findings into the index, then tags each
+    MagicNumber issue with its project-wide frequency. Frequencies are only known
+    once every file is in, so this stage holds the results until the input is exhausted.
+    """
+    results = list(file_results)
+    with telemetry.span("literal_index"):
+        for result in results:
+            # Files that could not be read lose their stale occurrences
+            sha256 = None if result.get("error") else result.get("sha256")
+            index.update_file(os.path.abspath(result["file"]), sha256, result["issues"])
+        index.prune()
+
+        counts: Dict[str, Tuple[int, int]] = {}
+        for result in results:
+            index.annotate(result["issues"], counts)
+    yield from results
@@ -0,0 +1,118 @@
+# ai-code-reviewer/core/analysis/manifest.py
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.models import as_dict
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_FORMAT = 1
+
+
+def hash_content(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class AnalysisManifest:
+    """
+    Per-project record of every analyzed file: path, size, mtime, content hash,
+    the detector-set version that produced its findings, and the enriched issues.
+    Files whose content and detector version are unchanged reuse the stored issues.
+    With a suggestion version (the LLM settings), issues suggested under other
+    settings are not reused either; without one, any stored suggestions are.
+    """
+    def __init__(self, cache_dir: str, detector_version: str, suggestion_version: Optional[str] = None):
+        self.path = os.path.join(cache_dir, MANIFEST_FILENAME)
+        self.detector_version = detector_version
+        self.suggestion_version = suggestion_version
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # A corrupt manifest only costs a full re-analysis
+            print(f"WARNING: Ignoring unreadable analysis manifest {self.path}: {e}")
+            return
+        if data.get("format") == MANIFEST_FORMAT:
+            self.entries = data.get("files", {})
+
+    def lookup(self, file_path: str) -> Optional[List[Dict[str, Any]]]:
+        """Returns the stored issues if the file is unchanged, otherwise None."""
+        entry = self.entries.get(file_path)
+        if entry is None or entry["detector_version"] != self.detector_version:
+            return None
+        if (self.suggestion_version is not None and entry["issues"]
+                and entry.get("suggestion_version") != self.suggestion_version):
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        if stat.st_size != entry["size"]:
+            return None
+        # Fast path: same size and mtime means we trust the stored hash without reading the file
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return entry["issues"]
+
+        # The file was touched; only a content change invalidates the entry
+        with open(file_path, 'rb') as f:
+            if hash_content(f.read()) != entry["sha256"]:
+                return None
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self._dirty = True
+        return entry["issues"]
+
+    def partition(self, file_paths: List[str]) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str]]:
+        """Splits paths into (reusable issues by path, paths that need analysis)."""
+        reused = {}
+        stale = []
+        for path in file_paths:
+            issues = self.lookup(path)
+            if issues is None:
+                stale.append(path)
+            else:
+                reused[path] = issues
+        return reused, stale
+
+    def record(self, file_result: Dict[str, Any]):
+        """Stores a freshly analyzed (and enriched) file result."""
+        entry = {
+            "size": file_result["size"],
+            "mtime_ns": file_result["mtime_ns"],
+            "sha256": file_result["sha256"],
+            "detector_version": self.detector_version,
+            "issues": [as_dict(issue) for issue in file_result["issues"]],
+        }
+        if self.suggestion_version is not None:
+            entry["suggestion_version"] = self.suggestion_version
+        self.entries[file_result["file"]] = entry
+        self._dirty = True
+
+    def forget(self, file_path: str):
+        if self.entries.pop(file_path, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        """Writes the manifest atomically so an interrupted run never leaves it half-written."""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".manifest-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"format": MANIFEST_FORMAT, "files": self.entries}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._dirty = False
@@ -0,0 +1,150 @@
+# ai-code-reviewer/core/analysis/parallel_runner.py
+import json
+import os
+from collections import deque
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+from core.analysis.analyzer import Analyzer
+from core.detectors import DetectorSet, create_detector_set
+from core.parser.source_document import SourceDocument
+from core.analysis.pipeline import prepare_fixes
+from core.autofix.fixer import Fixer
+from core.autofix.rules import RuleTable
+from core import telemetry
+
+# Target number of chunks handed to each worker; more chunks balance uneven file sizes
+CHUNKS_PER_WORKER = 4
+# Upper bound on files per chunk so results start streaming back early
+MAX_CHUNK_FILES = 64
+# Chunks in flight per worker; bounds how many finished results wait in memory
+IN_FLIGHT_PER_WORKER = 2
+
+# Detector sets built in this process, keyed by their serialized config
+_detector_sets: Dict[str, DetectorSet] = {}
+
+
+def get_detector_set(detector_config: Optional[Dict[str, Any]] = None) -> DetectorSet:
+    """
+    Builds (once per process) the detector set for a config dict with optional
+    'enabled', 'disabled' and 'options' keys, as accepted by create_detector_set.
+    """
+    key = json.dumps(detector_config or {}, sort_keys=True)
+    if key not in _detector_sets:
+        _detector_sets[key] = create_detector_set(**(detector_config or {}))
+    return _detector_sets[key]
+
+
+def _tag_file(issues: Iterator[Dict[str, Any]], file_path: str) -> Iterator[Dict[str, Any]]:
+    for issue in issues:
+        issue['file'] = file_path
+        yield issue
+
+
+def analyze_file(file_path: str, detector_config: Optional[Dict[str, Any]] = None,
+                 shared_constants: bool = False, rules: Optional[RuleTable] = None) -> Dict[str, Any]:
+    """
+    Parses, analyzes and prepares fixes for a single file.
+    Runs inside a worker process, so it must stay a top-level (picklable) function.
+    With shared_constants, fixes name constants after their value; with rules,
+    well-known literals get their rule's fix and suggestion (see Fixer).
+    """
+    result = {"file": file_path, "issues": [], "error": None}
+    try:
+        # Read once; the analyzer and the fixer share the same document
+        with telemetry.span("read"):
+            document = SourceDocument.from_path(file_path)
+            # Decode up front so non-UTF-8 files are reported as read errors
+            document.text
+    except (OSError, UnicodeDecodeError) as e:
+        result["error"] = f"Could not read file: {e}"
+        return result
+
+    # Recorded in the analysis manifest so unchanged files can be skipped next run
+    result["size"] = document.size
+    result["mtime_ns"] = document.mtime_ns
+    result["sha256"] = document.sha256
+
+    # Detection and fix preparation are chained generator stages
+    analyzer = Analyzer(document, filename=file_path, detectors=get_detector_set(detector_config))
+    try:
+        result["issues"] = list(prepare_fixes(_tag_file(analyzer.iter_issues(), file_path),
+                                                 Fixer(document, shared_constants=shared_constants, rules=rules)))
+    except Exception as e:
+        # One file's failure (a detector or fixer bug) must not take down the whole pool run
+        result["error"] = f"Analysis failed: {e}"
+    finally:
+        document.close()
+    return result
+
+
+def analyze_chunk(
+    file_paths: List[str],
+    detector_config: Optional[Dict[str, Any]] = None,
+    shared_constants: bool = False,
+    rules: Optional[RuleTable] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Worker entry point: analyzes a batch of files to amortize IPC overhead.
+    Returns the results plus the chunk's telemetry snapshot for the parent to merge.
+    """
+    with telemetry.collect() as metrics:
+        results = [analyze_file(path, detector_config, shared_constants, rules) for path in file_paths]
+    return results, metrics.snapshot()
+
+
+def _collect_chunk(future) -> List[Dict[str, Any]]:
+    results, snapshot = future.result()
+    telemetry.get_telemetry().merge(snapshot)
+    return results
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Maps the --jobs value to a worker count (0 or None means one per CPU)."""
+    if not jobs or jobs < 1:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def iter_file_results(
+    file_paths: List[str],
+    jobs: Optional[int] = None,
+    detector_config: Optional[Dict[str, Any]] = None,
+    shared_constants: bool = False,
+    rules: Optional[RuleTable] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Fans analysis out across a process pool and yields per-file results in the
+    same order as the input paths, as soon as they are available. Only a bounded
+    window of chunks is in flight, so memory doesn't grow with the tree size.
+    """
+    workers = min(resolve_jobs(jobs), max(len(file_paths), 1))
+
+    # A pool is pure overhead for a single worker or a single file
+    if workers == 1:
+        for path in file_paths:
+            yield analyze_file(path, detector_config, shared_constants, rules)
+        return
+
+    # Batch small files together so IPC cost doesn't dominate on large trees
+    chunk_files = min(MAX_CHUNK_FILES, max(1, len(file_paths) // (workers * CHUNKS_PER_WORKER)))
+    chunks = (file_paths[i:i + chunk_files] for i in range(0, len(file_paths), chunk_files))
+
+    # multiprocessing is slow to import; single-worker runs never need it
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(analyze_chunk, chunk, detector_config, shared_constants, rules))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                yield from _collect_chunk(pending.popleft())
+        while pending:
+            yield from _collect_chunk(pending.popleft())
+
+
+def analyze_files(
+    file_paths: List[str],
+    jobs: Optional[int] = None,
+    detector_config: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Collects iter_file_results into a list, in the same order as the input paths."""
+    return list(iter_file_results(file_paths, jobs=jobs, detector_config=detector_config))
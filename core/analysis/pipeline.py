@@ -0,0 +1,81 @@
+# ai-code-reviewer/core/analysis/pipeline.py
+import time
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from core.autofix.fixer import Fixer
+from core.models import Issue, PREPARED, NOT_AVAILABLE, NOT_AVAILABLE_DESCRIPTION
+from core.parser.source_document import SourceDocument
+from core import telemetry
+
+# Issues buffered before an enrichment round; bounds memory while keeping the LLM busy
+DEFAULT_ENRICH_CHUNK = 256
+
+
+def prepare_fixes(issues: Iterable[Dict[str, Any]], fixer: Fixer) -> Iterator[Dict[str, Any]]:
+    """Pipeline stage: attaches fix status, description and patch data to each issue."""
+    elapsed = 0.0
+    for issue in issues:
+        start = time.perf_counter()
+        fix_success, fix_description = fixer.generate_fix(issue)
+        elapsed += time.perf_counter() - start
+        issue['autofix_status'] = PREPARED if fix_success else NOT_AVAILABLE
+        # Issue objects render these descriptions from the status and patch on demand
+        if not isinstance(issue, Issue):
+            issue['autofix_description'] = fix_description if fix_success else NOT_AVAILABLE_DESCRIPTION
+        yield issue
+    telemetry.observe("stage_seconds", elapsed, stage="fix_prepare")
+
+
+def _open_analyzed(result: Dict[str, Any]) -> Optional[SourceDocument]:
+    """The file as it was analyzed, or None (with the result's error set) if it is gone or has changed."""
+    try:
+        document = SourceDocument.from_path(result["file"])
+    except OSError as e:
+        result["error"] = f"Could not reopen the file for AI suggestions: {e}"
+        return None
+    if result.get("sha256") and document.sha256 != result["sha256"]:
+        document.close()
+        result["error"] = "The file changed after it was analyzed; AI suggestions were skipped."
+        return None
+    return document
+
+
+def enrich_results(
+    file_results: Iterable[Dict[str, Any]],
+    enricher,
+    chunk_size: int = DEFAULT_ENRICH_CHUNK,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Pipeline stage: fills in LLM suggestions for per-file results.
+    Files are buffered until about chunk_size issues are waiting, enriched
+    concurrently, then yielded in their original order. A file deleted or
+    edited since it was analyzed can't give its issues context; they are left
+    without suggestions and the result gets an error, so it is retried.
+    """
+    buffered: List[Dict[str, Any]] = []
+    documents: List[SourceDocument] = []
+    jobs: List[Tuple[Dict[str, Any], SourceDocument]] = []
+
+    for result in file_results:
+        buffered.append(result)
+        if result["issues"]:
+            # Prompts only need a few lines, looked up through the document's line index
+            document = _open_analyzed(result)
+            if document is not None:
+                documents.append(document)
+                jobs.extend((issue, document) for issue in result["issues"])
+
+        if len(jobs) >= chunk_size:
+            with telemetry.span("enrich"):
+                enricher.enrich(jobs)
+            for document in documents:
+                document.close()
+            yield from buffered
+            buffered, documents, jobs = [], [], []
+
+    if buffered:
+        with telemetry.span("enrich"):
+            enricher.enrich(jobs)
+        for document in documents:
+            document.close()
+        yield from buffered
@@ -0,0 +1,229 @@
+# ai-code-reviewer/core/analysis/watcher.py
+import errno
+import glob
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from core.analysis.file_discovery import DEFAULT_EXCLUDES, DEFAULT_INCLUDES, matches_patterns
+
+# Quiet period that ends a burst of changes (editors often write, rename and chmod per save)
+DEFAULT_DEBOUNCE = 0.05
+DEFAULT_POLL_INTERVAL = 0.5
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+# Files count as changed once written and closed, or renamed into place (atomic saves)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def watch_roots(targets: Iterable[str]) -> List[str]:
+    """Directories to watch for the CLI targets: directories themselves, a file's directory, a glob's fixed prefix."""
+    roots = set()
+    for target in targets:
+        if glob.has_magic(target):
+            prefix = []
+            for part in target.split(os.sep):
+                if glob.has_magic(part):
+                    break
+                prefix.append(part)
+            target = os.sep.join(prefix) or "."
+        elif not os.path.isdir(target):
+            target = os.path.dirname(target) or "."
+        roots.add(os.path.normpath(target))
+    # Nested roots are covered by their parents
+    return sorted(root for root in roots
+                  if not any(other != root and root.startswith(other.rstrip(os.sep) + os.sep) for other in roots))
+
+
+class PollingWatcher:
+    """Portable fallback: rescans (mtime, size) of matching files every interval."""
+    name = "polling"
+
+    def __init__(self, roots: List[str], include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                 interval: float = DEFAULT_POLL_INTERVAL):
+        self.roots = roots
+        self.include = include or DEFAULT_INCLUDES
+        self.exclude = DEFAULT_EXCLUDES + (exclude or [])
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot = {}
+        for root in self.roots:
+            for directory, dirs, files in os.walk(root):
+                dirs[:] = [d for d in dirs if not matches_patterns(d, self.exclude)]
+                for name in files:
+                    if not matches_patterns(name, self.include):
+                        continue
+                    path = os.path.normpath(os.path.join(directory, name))
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """Paths created, modified or deleted since the last poll; waits at most 'timeout' (None: until a change)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if now < self._next_scan:
+                if deadline is not None and deadline < self._next_scan:
+                    time.sleep(max(0.0, deadline - now))
+                    return set()
+                time.sleep(self._next_scan - now)
+            snapshot = self._scan()
+            self._next_scan = time.monotonic() + self.interval
+            changed = {path for path in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(path) != self._snapshot.get(path)}
+            self._snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux inotify through ctypes: one watch per directory, events read from a
+    single non-blocking descriptor, so a save is noticed within milliseconds
+    without scanning the tree. New directories are watched as they appear.
+    """
+    name = "inotify"
+
+    def __init__(self, roots: List[str], include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+        self.roots = roots
+        self.include = include or DEFAULT_INCLUDES
+        self.exclude = DEFAULT_EXCLUDES + (exclude or [])
+        # Imported here so that the CLI doesn't load ctypes unless it watches
+        import ctypes
+        import ctypes.util
+        self._get_errno = ctypes.get_errno
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._init = libc.inotify_init1
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = self._init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            code = self._get_errno()
+            raise OSError(code, f"inotify_init1 failed: {os.strerror(code)}")
+        self._directories: Dict[int, str] = {}
+        try:
+            for root in roots:
+                self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, root: str) -> Set[str]:
+        """Watches root and its subdirectories; returns the files already inside (created before the watch)."""
+        files = set()
+        for directory, dirs, names in os.walk(root):
+            dirs[:] = [d for d in dirs if not matches_patterns(d, self.exclude)]
+            wd = self._add_watch(self._fd, os.fsencode(directory), WATCH_MASK | IN_ONLYDIR)
+            if wd < 0:
+                code = self._get_errno()
+                if code in (errno.ENOSPC, errno.ENOMEM):
+                    raise OSError(code, "inotify watch limit reached (see fs.inotify.max_user_watches)")
+                # The directory disappeared while we were walking it
+                continue
+            self._directories[wd] = os.path.normpath(directory)
+            files.update(os.path.normpath(os.path.join(directory, name)) for name in names)
+        return files
+
+    def _read_events(self) -> Set[str]:
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                raw_name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost: report the roots so the caller rescans them
+                    changed.update(self.roots)
+                    continue
+                directory = self._directories.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._directories[wd]
+                    continue
+                if not raw_name:
+                    # The watched directory itself was deleted or moved away
+                    if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                        changed.add(directory)
+                    continue
+                path = os.path.normpath(os.path.join(directory, os.fsdecode(raw_name)))
+                if mask & IN_ISDIR:
+                    if matches_patterns(os.path.basename(path), self.exclude):
+                        continue
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed.update(self._watch_tree(path))
+                    else:
+                        # Files under a removed directory produce no events of their own
+                        changed.add(path)
+                elif not mask & IN_CREATE:
+                    # A created file is reported once it has been written and closed
+                    changed.add(path)
+
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """Paths created, modified or deleted; waits at most 'timeout' (None: until a change)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            changed = self._read_events() if ready else set()
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        if self._fd is not None and self._fd >= 0:
+            os.close(self._fd)
+        self._fd = None
+
+
+def create_watcher(roots: List[str], include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                   polling: bool = False, interval: float = DEFAULT_POLL_INTERVAL):
+    """inotify on Linux, otherwise (or when it is unavailable) the polling watcher."""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots, include, exclude)
+        except (OSError, AttributeError) as e:
+            print(f"WARNING: inotify unavailable ({e}); falling back to polling every {interval:g}s.")
+    return PollingWatcher(roots, include, exclude, interval)
+
+
+def next_changes(watcher, debounce: float = DEFAULT_DEBOUNCE) -> Set[str]:
+    """Blocks until something changes, then gathers the rest of the burst until 'debounce' seconds pass quietly."""
+    changed = set()
+    while not changed:
+        changed = watcher.poll(None)
+    while True:
+        more = watcher.poll(debounce)
+        if not more:
+            return changed
+        changed |= more
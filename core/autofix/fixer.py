@@ -1,107 +1,341 @@
 # ai-code-reviewer/core/autofix/fixer.py (Updated with apply_fixes_from_report)
+import ast
 import os
-import json
-from typing import Dict, Any, List, Tuple
+import shutil
+import tempfile
+import tokenize
+from collections import defaultdict
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+from core.autofix.rewriter import SourceRewriter, RewriteConflict, literal_value
+from core.autofix.rules import LiteralContexts, RuleTable, SuggestionRule
+from core.report.json_reporter import load_report
+from core.models import FixPatch
+from core.parser.source_document import SourceDocument, as_document
+from core import telemetry
+
+CONSTANTS_HEADER = "# --- AUTO-GENERATED CONSTANTS ---"
+CONSTANTS_FOOTER = "# --------------------------------"
+CONSTANT_PREFIX = "MAGIC_NUM_"
+
+
+def shared_constant_name(value: Any) -> str:
+    """
+    One name per literal value, the same in every file: 200 -> MAGIC_NUM_200,
+    3.14 -> MAGIC_NUM_3_14, 200.0 -> MAGIC_NUM_200_0.
+    """
+    return CONSTANT_PREFIX + "".join(c if c.isalnum() else "_" for c in repr(value)).upper()
+
 
 class Fixer:
     """
     Manages the creation and application of automatic code fixes (patches).
     """
-    def __init__(self, code: str):
-        self.code_lines = code.splitlines()
+    def __init__(self, code: Union[str, SourceDocument], shared_constants: bool = False,
+                 rules: Optional[RuleTable] = None):
+        self.document = as_document(code)
+        # Name constants after their value (see shared_constant_name) instead of their line
+        self.shared_constants = shared_constants
+        # Well-known literals get a stdlib expression or conventional name, and a local suggestion
+        self.rules = rules
+        # Built on the first rule that needs to know how its literal is used
+        self._contexts: Optional[LiteralContexts] = None
+        # Constant names handed out in this file, so two literals on one line don't collide
+        self._constant_values: Dict[str, Any] = {}
+
+    def _constant_name(self, line_num: int, col: int, value: Any) -> str:
+        if self.shared_constants:
+            return shared_constant_name(value)
+        name = f"{CONSTANT_PREFIX}{line_num}"
+        if self._constant_values.setdefault(name, value) != value:
+            name = f"{CONSTANT_PREFIX}{line_num}_{col}"
+            self._constant_values[name] = value
+        return name
+
+    def _match_rule(self, issue: Dict[str, Any], value: Any) -> Optional[SuggestionRule]:
+        """The rule answering this literal, if the way the literal is used supports it."""
+        rule = self.rules.match(value) if self.rules is not None else None
+        if rule is None or rule.context is None:
+            return rule
+        if self._contexts is None:
+            try:
+                tree = ast.parse(self.document.text)
+            except (SyntaxError, ValueError):
+                tree = ast.Module(body=[], type_ignores=[])
+            self._contexts = LiteralContexts(tree)
+        return rule if rule.applies_to(self._contexts.names(issue['line'], issue.get('col'))) else None
 
     def generate_fix(self, issue: Dict[str, Any]) -> Tuple[bool, str]:
         """Generates a fix description for a supported issue type."""
         issue_type = issue['type']
         line_num = issue['line']
         value = issue.get('value')
-        
+
         if issue_type == "MagicNumber" and value is not None:
-            # We will use a generic constant name for simplicity
-            constant_name = f"MAGIC_NUM_{line_num}" 
-            
-            # This is the patch data stored in the report
-            # The description explains the fix to the user in the dashboard
-            description = (
-                f"Define a new constant: `{constant_name} = {value}` (at the top of the file).\n"
-                f"Replace the detected value `{value}` on line {line_num} with `{constant_name}`."
-            )
-            
+            rule = self._match_rule(issue, value)
+            if rule is not None:
+                constant_name = rule.replacement
+                # Answered locally; the LLM is not asked about this issue
+                issue['rule'] = rule.name
+                issue['suggestion'] = rule.render_suggestion(value)
+            else:
+                # No rule, or the context doesn't back it: a generic name, and the LLM is asked
+                # We will use a generic constant name for simplicity
+                constant_name = self._constant_name(line_num, issue.get('col', 0), value)
+
             # The patch data itself (used by the apply_fixes_from_report method)
-            # Storing the specific line change instruction is easier than using a full diff format
-            issue['fix_patch'] = {
-                "constant_name": constant_name,
-                "constant_value": value,
-                "line_to_replace": line_num,
-                "old_code": self.code_lines[line_num - 1].strip(),
-            }
-            
-            return True, description
-        
+            # The column pins the exact token, so other occurrences on the line are left alone
+            patch = FixPatch(
+                constant_name,
+                value,
+                line_num,
+                col=issue.get('col'),
+                old_code=self.document.line(line_num).strip(),
+                shared=self.shared_constants,
+                import_statement=rule.import_statement if rule is not None else None,
+            )
+            issue['fix_patch'] = patch
+
+            # The description explains the fix to the user in the dashboard
+            return True, patch.description
+
         return False, "Not Available"
 
-    def apply_fixes_from_report(self, report_path: str, file_path: str):
-        """Reads the report and applies all 'Prepared' fixes to the source file."""
+    @staticmethod
+    def apply_fixes_from_report(report_path: str, file_path: Optional[str] = None,
+                                file_paths: Optional[Iterable[str]] = None) -> int:
+        """
+        Reads the report once and applies all 'Prepared' fixes, grouped per file.
+        Restrict the run with file_path / file_paths; by default every file in the
+        report is fixed. Returns the number of fixes applied.
+        """
         if not os.path.exists(report_path):
             print(f"Error: Report file not found at {report_path}.")
-            return
+            return 0
+
+        with telemetry.span("report_load"):
+            metadata, report_issues = load_report(report_path)
 
-        with open(report_path, 'r', encoding='utf-8') as f:
-            report_data = json.load(f)
+        targets = None
+        if file_path is not None or file_paths is not None:
+            targets = {os.path.normpath(p) for p in ([file_path] if file_path else []) + list(file_paths or [])}
 
-        issues_to_fix = [
-            issue for issue in report_data.get('issues', []) 
-            if issue.get('autofix_status') == 'Prepared' and 'fix_patch' in issue
-        ]
-        
-        if not issues_to_fix:
+        # Multi-file reports tag every issue with its file; older reports only name it in the metadata
+        fixes_by_file: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for issue in report_issues:
+            if issue.get('autofix_status') != 'Prepared' or 'fix_patch' not in issue:
+                continue
+            issue_file = issue.get('file') or file_path or metadata.get('file')
+            if not issue_file:
+                continue
+            issue_file = os.path.normpath(issue_file)
+            if targets is None or issue_file in targets:
+                fixes_by_file[issue_file].append(issue)
+
+        if not fixes_by_file:
             print("No auto-fixable issues found in the report.")
-            return
+            return 0
 
-        print(f"Applying {len(issues_to_fix)} fixes to {file_path}...")
+        # Content hashes recorded at analysis time, when the report has them
+        expected_hashes = {
+            os.path.normpath(entry["path"]): entry["sha256"]
+            for entry in metadata.get("files", []) if entry.get("sha256")
+        }
 
-        # Read the original file content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content_lines = f.readlines()
+        total = 0
+        for path in sorted(fixes_by_file):
+            with telemetry.span("fix_apply"):
+                total += Fixer.apply_fixes_to_file(path, fixes_by_file[path], expected_hashes.get(path))
 
-        # Group fixes by type (we only handle MagicNumber here)
-        magic_number_fixes = [
-            issue['fix_patch'] for issue in issues_to_fix 
-            if issue['type'] == 'MagicNumber'
-        ]
-
-        # 1. Prepare constant definitions for MagicNumber fixes
-        new_constants = []
-        for fix in magic_number_fixes:
-            new_constants.append(f"{fix['constant_name']} = {fix['constant_value']}\n")
-            
-        # 2. Insert constants at the top of the file (after imports/docstrings, simple for now)
-        # Find the line to insert (usually after the first line or first import)
-        insertion_point = 0
-        if content_lines:
-             # Skip empty lines or docstrings to find a good insertion point
-            for i, line in enumerate(content_lines):
-                if line.strip() and not line.strip().startswith(('"""', "'''")):
-                    insertion_point = i
-                    break
-        
-        # Insert a constant block
-        content_lines.insert(insertion_point, "# --- AUTO-GENERATED CONSTANTS ---\n")
-        for constant_line in reversed(new_constants):
-            content_lines.insert(insertion_point + 1, constant_line)
-        content_lines.insert(insertion_point + len(new_constants) + 1, "# --------------------------------\n\n")
-
-        # 3. Apply line replacements (from bottom up to preserve line numbers)
-        for fix in sorted(magic_number_fixes, key=lambda x: x['line_to_replace'], reverse=True):
-            line_index = fix['line_to_replace'] - 1
-            old_line = content_lines[line_index]
-            new_line = old_line.replace(str(fix['constant_value']), fix['constant_name'])
-            content_lines[line_index] = new_line
-            print(f"  -> Applied fix for L{fix['line_to_replace']}: Replaced '{fix['constant_value']}' with '{fix['constant_name']}'")
+        print(f"\n✅ Applied {total} fix(es) across {len(fixes_by_file)} file(s).")
+        return total
+
+    @staticmethod
+    def apply_fixes_to_file(file_path: str, issues: List[Dict[str, Any]], expected_sha256: Optional[str] = None) -> int:
+        """
+        Applies the prepared MagicNumber fixes for one file in a single rewrite pass.
+        The result is re-parsed before it is written, and written atomically.
+        With expected_sha256, a file that changed since it was analyzed is left alone.
+        """
+        print(f"Applying {len(issues)} fixes to {file_path}...")
+        try:
+            document = SourceDocument.from_path(file_path)
+            # Decoded straight from the raw bytes, so the file's own line endings are kept
+            code = document.text
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  ❌ Skipping {file_path}: {e}")
+            return 0
+        if expected_sha256 and document.sha256 != expected_sha256:
+            print(f"  ⚠️  Skipping {file_path}: the file changed since the report was written; re-run the analysis.")
+            return 0
 
+        new_code, applied = Fixer.apply_fixes_to_code(code, issues, filename=file_path)
+        if not applied:
+            return 0
 
         # 4. Write the modified content back to the file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.writelines(content_lines)
+        Fixer._atomic_write(file_path, new_code)
+        print(f"✅ {applied} fix(es) applied successfully to {file_path}.")
+        return applied
+
+    @staticmethod
+    def apply_fixes_to_code(code: str, issues: List[Dict[str, Any]], filename: str = "<buffer>") -> Tuple[str, int]:
+        """
+        Applies prepared MagicNumber fixes to source text without touching the disk.
+        Returns (new_code, applied); the original code comes back unchanged when nothing applies.
+        """
+        try:
+            rewriter = SourceRewriter(code)
+            tree = ast.parse(code, filename=filename)
+        except (tokenize.TokenError, SyntaxError) as e:
+            print(f"  ❌ Skipping {filename}: {e}")
+            return code, 0
+
+        # Module-level constants that already exist, e.g. from an earlier --fix run
+        existing = Fixer._module_constants(tree)
+        # Literals that already *are* a module-level constant definition are left alone
+        definition_sites = {
+            (node.value.lineno, node.value.col_offset) for node in tree.body
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant)
+        }
+
+        # Generated names by value, so a value that already has one reuses it instead of gaining a duplicate.
+        # The type is part of the key, so 100, 100.0 and True don't share a name.
+        generated = {(type(value), value): name for name, value in existing.items()
+                     if name.startswith(CONSTANT_PREFIX) and value is not None}
+
+        # Group fixes by type (we only handle MagicNumber here)
+        new_constants: Dict[str, Any] = {}
+        # Imports needed by rule-based replacements such as math.pi
+        new_imports: Dict[str, None] = {}
+        applied = 0
+        for issue in issues:
+            if issue['type'] != 'MagicNumber':
+                continue
+            fix = issue['fix_patch']
+            name, value = fix['constant_name'], literal_value(fix['constant_value'])
+            import_statement = fix.get('import_statement')
+            col = fix.get('col', issue.get('col'))
+            if (fix['line_to_replace'], col) in definition_sites:
+                print(f"  -> Skipped L{fix['line_to_replace']}: '{value}' is already a named module-level constant.")
+                continue
+
+            if not import_statement and name.startswith(CONSTANT_PREFIX):
+                name = generated.setdefault((type(value), value), name)
+            bound = value if import_statement else new_constants.get(name, existing.get(name, value))
+            if bound != value:
+                print(f"  ⚠️  L{fix['line_to_replace']}: constant {name} is already bound to {bound}; skipped.")
+                continue
+            span = rewriter.find_number(fix['line_to_replace'], col, value)
+            if span is None:
+                print(f"  ⚠️  L{fix['line_to_replace']}: literal {value} not found (file changed since the report?); skipped.")
+                continue
+
+            rewriter.replace(span[0], span[1], name)
+            if import_statement:
+                new_imports[import_statement] = None
+            else:
+                new_constants[name] = value
+            applied += 1
+            print(f"  -> Applied fix for L{fix['line_to_replace']}: Replaced '{value}' with '{name}'")
+
+        if not applied:
+            return code, 0
+
+        try:
+            imports = [statement for statement in new_imports if not Fixer._has_import(tree, statement)]
+            Fixer._insert_constants(rewriter, tree, {n: v for n, v in new_constants.items() if n not in existing},
+                                    imports)
+            new_code = rewriter.render()
+            # Never hand back code we can't parse back
+            ast.parse(new_code, filename=filename)
+        except (RewriteConflict, SyntaxError) as e:
+            print(f"  ❌ Fixes for {filename} were not applied: {e}")
+            return code, 0
+        return new_code, applied
+
+    @staticmethod
+    def _module_constants(tree: ast.Module) -> Dict[str, Any]:
+        """Maps module-level `NAME = <literal>` assignments to their values."""
+        constants = {}
+        for node in tree.body:
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        constants[target.id] = node.value.value if isinstance(node.value, ast.Constant) else None
+        return constants
+
+    @staticmethod
+    def _import_bindings(nodes: Iterable[ast.stmt]) -> set:
+        """(module, name, alias) for every top-level absolute import among the nodes."""
+        bindings = set()
+        for node in nodes:
+            if isinstance(node, ast.Import):
+                bindings.update(("", alias.name, alias.asname) for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and not node.level:
+                bindings.update((node.module, alias.name, alias.asname) for alias in node.names)
+        return bindings
+
+    @staticmethod
+    def _has_import(tree: ast.Module, statement: str) -> bool:
+        return Fixer._import_bindings(ast.parse(statement).body) <= Fixer._import_bindings(tree.body)
+
+    @staticmethod
+    def _insert_constants(rewriter: SourceRewriter, tree: ast.Module, constants: Dict[str, Any],
+                          imports: Iterable[str] = ()):
+        """
+        Adds constant definitions, reusing an existing auto-generated block if
+        there is one, and any missing imports after the leading ones.
+        """
+        imports = list(imports)
+        if not constants and not imports:
+            return
+        code = rewriter.code
+        newline = "\r\n" if code.split("\n", 1)[0].endswith("\r") else "\n"
+        definitions = "".join(f"{name} = {value!r}{newline}" for name, value in constants.items())
+
+        lines = code.splitlines()
+        block = ""
+        if CONSTANTS_HEADER in lines:
+            if constants:
+                header = lines.index(CONSTANTS_HEADER)
+                footer = next((i for i in range(header + 1, len(lines)) if lines[i] == CONSTANTS_FOOTER), header)
+                rewriter.insert(rewriter.offset(footer + 1, 0), definitions)
+        elif constants:
+            block = f"{CONSTANTS_HEADER}{newline}{definitions}{CONSTANTS_FOOTER}{newline}{newline}"
+
+        # New imports and a new block go after the module docstring and the leading imports
+        insertion_line = 1
+        has_imports = False
+        for index, node in enumerate(tree.body):
+            is_docstring = index == 0 and isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) \
+                and isinstance(node.value.value, str)
+            if not (is_docstring or isinstance(node, (ast.Import, ast.ImportFrom))):
+                break
+            has_imports = has_imports or not is_docstring
+            insertion_line = node.end_lineno + 1
+
+        if imports:
+            # A new import section is separated from the code that follows it
+            separator = newline if not has_imports else ""
+            block = "".join(f"{statement}{newline}" for statement in imports) + separator + block
+        if not block:
+            return
+        offset = rewriter.offset(insertion_line, 0) if insertion_line < len(rewriter.line_starts) else len(code)
+        prefix = newline if offset == len(code) and code and not code.endswith(("\n", "\r")) else ""
+        # One insertion, so imports always precede the constants block
+        rewriter.insert(offset, prefix + block)
 
-        print(f"\n✅ All {len(issues_to_fix)} fixes applied successfully to {file_path}.")
\ No newline at end of file
+    @staticmethod
+    def _atomic_write(file_path: str, content: str):
+        """Writes via a temp file in the same directory and renames it over the original."""
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".fix-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+            shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
@@ -0,0 +1,104 @@
+# ai-code-reviewer/core/autofix/rewriter.py
+import ast
+import io
+import tokenize
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RewriteConflict(Exception):
+    """Raised when two edits touch overlapping source ranges."""
+
+
+def literal_value(text: Any) -> Any:
+    """Normalizes a token string (or a stringified report value) to its Python value."""
+    if isinstance(text, str):
+        try:
+            return ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return None
+    return text
+
+
+class SourceRewriter:
+    """
+    Token-accurate source rewriter.
+
+    Edits are recorded as (start, end, replacement) character ranges located
+    through the tokenizer, never by textual search, so a `100` inside `1000`
+    or inside a string literal is never touched. render() sorts the edits,
+    rejects overlapping ones and builds the new text in a single linear pass.
+    """
+    def __init__(self, code: str):
+        self.code = code
+        self.edits: List[Tuple[int, int, str]] = []
+
+        # Character offset at which every line starts (index 0 is line 1)
+        self.line_starts = [0]
+        for line in io.StringIO(code):
+            self.line_starts.append(self.line_starts[-1] + len(line))
+
+        # NUMBER tokens per line: [(start_col, end_col, token_string)], columns in characters
+        self.numbers: Dict[int, List[Tuple[int, int, str]]] = {}
+        for token in tokenize.generate_tokens(io.StringIO(code).readline):
+            if token.type == tokenize.NUMBER:
+                (row, start_col), (_, end_col) = token.start, token.end
+                self.numbers.setdefault(row, []).append((start_col, end_col, token.string))
+
+    def line_text(self, line: int) -> str:
+        return self.code[self.line_starts[line - 1]:self.line_starts[line]]
+
+    def offset(self, line: int, col: int) -> int:
+        """Absolute character offset of a (1-based line, character column) position."""
+        return self.line_starts[line - 1] + col
+
+    def byte_col_to_char_col(self, line: int, col: int) -> int:
+        """AST col_offset values are UTF-8 byte offsets; tokenize columns are characters."""
+        prefix = self.line_text(line).encode('utf-8')[:col]
+        return len(prefix.decode('utf-8', errors='ignore'))
+
+    def find_number(self, line: int, col: Optional[int], value: Any) -> Optional[Tuple[int, int]]:
+        """
+        Locates the NUMBER token for a finding as (start, end) offsets.
+        The recorded column is tried first; if the file moved on since the
+        report was written, a single token with the same value on that line
+        is accepted. Anything ambiguous returns None.
+        """
+        if line < 1 or line >= len(self.line_starts):
+            return None
+        expected = literal_value(value)
+        candidates = [
+            (start, end) for start, end, text in self.numbers.get(line, [])
+            if literal_value(text) == expected
+        ]
+        if col is not None:
+            char_col = self.byte_col_to_char_col(line, col)
+            for start, end in candidates:
+                if start == char_col:
+                    return self.offset(line, start), self.offset(line, end)
+        if len(candidates) == 1:
+            start, end = candidates[0]
+            return self.offset(line, start), self.offset(line, end)
+        return None
+
+    def replace(self, start: int, end: int, text: str):
+        self.edits.append((start, end, text))
+
+    def insert(self, offset: int, text: str):
+        self.edits.append((offset, offset, text))
+
+    def render(self) -> str:
+        """Applies every edit in one pass over the original text."""
+        pieces = []
+        position = 0
+        previous = None
+        # Insertions at an offset go before a replacement starting there
+        for edit in sorted(set(self.edits), key=lambda e: (e[0], e[1] != e[0], e[1])):
+            start, end, text = edit
+            if start < position:
+                raise RewriteConflict(f"Edit at offset {start} overlaps edit {previous}")
+            pieces.append(self.code[position:start])
+            pieces.append(text)
+            position = end
+            previous = edit
+        pieces.append(self.code[position:])
+        return "".join(pieces)
@@ -0,0 +1,268 @@
+# ai-code-reviewer/core/autofix/rules.py
+import ast
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Dotted names a literal may be replaced with, e.g. math.pi or HTTPStatus.NOT_FOUND
+_REPLACEMENT = re.compile(r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$")
+
+_PI = (3.14, 3.1416, 3.14159, 3.141592, 3.1415926, 3.14159265, 3.141592653589793)
+_TAU = (6.28, 6.2832, 6.28318, 6.283185307179586)
+_E = (2.718, 2.7183, 2.71828, 2.718281828459045)
+
+# Status codes common enough in code to be worth a rule (http.HTTPStatus member names)
+_HTTP_STATUSES = {
+    200: "OK", 201: "CREATED", 202: "ACCEPTED", 204: "NO_CONTENT",
+    301: "MOVED_PERMANENTLY", 302: "FOUND", 304: "NOT_MODIFIED", 307: "TEMPORARY_REDIRECT",
+    308: "PERMANENT_REDIRECT", 400: "BAD_REQUEST", 401: "UNAUTHORIZED", 403: "FORBIDDEN",
+    404: "NOT_FOUND", 405: "METHOD_NOT_ALLOWED", 409: "CONFLICT", 410: "GONE",
+    422: "UNPROCESSABLE_ENTITY", 429: "TOO_MANY_REQUESTS", 500: "INTERNAL_SERVER_ERROR",
+    501: "NOT_IMPLEMENTED", 502: "BAD_GATEWAY", 503: "SERVICE_UNAVAILABLE", 504: "GATEWAY_TIMEOUT",
+}
+
+# Names that make the unit of a literal clear. Values such as 60 or 200 are far too common to
+# replace on sight, so these rules only apply where the literal is used with a matching name.
+_HTTP_STATUS_CONTEXT = r"(?:^|_)status(?:_code)?$"
+_SECONDS_CONTEXT = r"(?:^|_)(?:seconds?|secs?|ttl|timeout|sleep|max_age)(?:_s|_secs?|_seconds)?$"
+_BYTES_CONTEXT = r"(?:^|_)(?:n?bytes|bufsize|(?:buf|buffer|chunk|block)_?size|read|recv)(?:_bytes)?$"
+
+# Groups left out unless a rules file enables them: math.pi for 3.14 changes numeric results
+DISABLED_BY_DEFAULT = ("math-constants",)
+
+# Nodes a literal's meaning passes through unchanged: -60, 5 * 60, (200, 201)
+_TRANSPARENT = (ast.UnaryOp, ast.BinOp, ast.Tuple, ast.List, ast.Set)
+
+
+def _name_of(node: Optional[ast.AST]) -> Optional[str]:
+    """The name an expression is known by: status, response.status_code, sleep(), data["status"]."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Call):
+        return _name_of(node.func)
+    if isinstance(node, ast.Subscript):
+        return _name_of(node.slice)
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+class LiteralContexts:
+    """
+    The names each literal in a module is used with: the other side of a
+    comparison, the keyword or parameter it is passed as, the assignment
+    target, the called function or the dict key. Rules with a context match
+    against these names.
+    """
+    def __init__(self, tree: ast.AST):
+        self._parents: Dict[ast.AST, ast.AST] = {}
+        self._constants: Dict[Tuple[int, int], ast.Constant] = {}
+        for parent in ast.walk(tree):
+            for child in ast.iter_child_nodes(parent):
+                self._parents[child] = parent
+                if isinstance(child, ast.Constant):
+                    self._constants[(child.lineno, child.col_offset)] = child
+
+    def names(self, line: int, col: Optional[int]) -> Tuple[str, ...]:
+        node: Optional[ast.AST] = self._constants.get((line, col))
+        if node is None:
+            return ()
+        parent = self._parents.get(node)
+        while isinstance(parent, _TRANSPARENT):
+            node, parent = parent, self._parents.get(parent)
+
+        names: List[Optional[str]] = []
+        if isinstance(parent, ast.Compare):
+            names = [_name_of(operand) for operand in (parent.left, *parent.comparators) if operand is not node]
+        elif isinstance(parent, ast.keyword):
+            names = [parent.arg]
+        elif isinstance(parent, ast.Assign):
+            names = [_name_of(target) for target in parent.targets]
+        elif isinstance(parent, (ast.AnnAssign, ast.AugAssign, ast.NamedExpr)):
+            names = [_name_of(parent.target)]
+        elif isinstance(parent, ast.Call):
+            names = [_name_of(parent.func)] if any(arg is node for arg in parent.args) else []
+        elif isinstance(parent, ast.Dict):
+            names = [_name_of(key) for key, value in zip(parent.keys, parent.values) if value is node]
+        elif isinstance(parent, ast.arguments):
+            positional = parent.posonlyargs + parent.args
+            defaults = list(zip(positional[len(positional) - len(parent.defaults):], parent.defaults))
+            defaults += zip(parent.kwonlyargs, parent.kw_defaults)
+            names = [arg.arg for arg, default in defaults if default is node]
+        return tuple(name for name in names if name)
+
+
+class SuggestionRule:
+    """
+    A well-known literal with a deterministic answer. With an import, the
+    literal is replaced by an expression from that module (math.pi); without
+    one, it becomes a module constant with a conventional name (SECONDS_PER_HOUR).
+    With a context (a regular expression), the rule only applies where one of
+    the names the literal is used with matches it (see LiteralContexts).
+    """
+    __slots__ = ("name", "values", "replacement", "import_statement", "suggestion", "context", "_context")
+
+    def __init__(self, name: str, values: Iterable[Any], replacement: str,
+                 import_statement: Optional[str] = None, suggestion: Optional[str] = None,
+                 context: Optional[str] = None):
+        self.name = name
+        self.values = tuple(values)
+        self.replacement = replacement
+        self.import_statement = import_statement
+        self.suggestion = suggestion
+        self.context = context
+        self._context = None
+        self._validate()
+
+    def _validate(self):
+        if not self.values:
+            raise ValueError(f"Suggestion rule '{self.name}' matches no values.")
+        for value in self.values:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Suggestion rule '{self.name}': {value!r} is not a number.")
+        if not _REPLACEMENT.match(self.replacement):
+            raise ValueError(f"Suggestion rule '{self.name}': '{self.replacement}' is not a name or attribute.")
+        if self.context is not None:
+            try:
+                self._context = re.compile(self.context, re.IGNORECASE)
+            except (re.error, TypeError) as e:
+                raise ValueError(f"Suggestion rule '{self.name}': invalid context {self.context!r}: {e}")
+        if self.import_statement is None:
+            if "." in self.replacement:
+                raise ValueError(f"Suggestion rule '{self.name}': '{self.replacement}' needs an 'import'.")
+            return
+        try:
+            tree = ast.parse(self.import_statement)
+        except SyntaxError:
+            tree = None
+        if tree is None or len(tree.body) != 1 or not isinstance(tree.body[0], (ast.Import, ast.ImportFrom)):
+            raise ValueError(f"Suggestion rule '{self.name}': '{self.import_statement}' is not a single import.")
+
+    def applies_to(self, names: Iterable[str]) -> bool:
+        """Whether the rule holds for a literal used with these names; rules without a context always do."""
+        return self._context is None or any(self._context.search(name) for name in names)
+
+    def render_suggestion(self, value: Any) -> str:
+        if self.suggestion:
+            return self.suggestion.format(value=value, replacement=self.replacement)
+        if self.import_statement:
+            return (f"`{value}` is a well-known value: use `{self.replacement}` "
+                    f"(`{self.import_statement}`) instead of repeating the literal.")
+        return (f"`{value}` is a well-known value: name it `{self.replacement}` "
+                f"so its meaning is clear and it is defined once.")
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"name": self.name, "values": list(self.values), "replacement": self.replacement}
+        if self.import_statement:
+            data["import"] = self.import_statement
+        if self.suggestion:
+            data["suggestion"] = self.suggestion
+        if self.context:
+            data["context"] = self.context
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SuggestionRule":
+        try:
+            values = data["values"] if "values" in data else [data["value"]]
+            return cls(data.get("name") or data["replacement"], values, data["replacement"],
+                       data.get("import"), data.get("suggestion"), data.get("context"))
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid suggestion rule {data!r}: missing {e}")
+
+
+def default_rules() -> List[SuggestionRule]:
+    """
+    The built-in table: math constants, HTTP statuses, time units and byte
+    sizes. Only the math constants match on value alone, and they are in
+    DISABLED_BY_DEFAULT.
+    """
+    precision = ("`{value}` approximates `{replacement}`; use the exact constant "
+                 "(`import math`). Results change slightly, as `{replacement}` is more precise.")
+    rules = [
+        SuggestionRule("math-constants", _PI, "math.pi", "import math", precision),
+        SuggestionRule("math-constants", _TAU, "math.tau", "import math", precision),
+        SuggestionRule("math-constants", _E, "math.e", "import math", precision),
+    ]
+    for code, member in _HTTP_STATUSES.items():
+        rules.append(SuggestionRule(
+            "http-status", [code], f"HTTPStatus.{member}", "from http import HTTPStatus",
+            "`{value}` is used as an HTTP status code here: use `{replacement}` from the standard "
+            "library; it compares equal to the number and documents the intent.",
+            _HTTP_STATUS_CONTEXT,
+        ))
+    time_units = "`{value}` is a duration in seconds here: name the unit, `{replacement} = {value}`."
+    rules += [
+        SuggestionRule("time-units", [60], "SECONDS_PER_MINUTE", suggestion=time_units, context=_SECONDS_CONTEXT),
+        SuggestionRule("time-units", [3600], "SECONDS_PER_HOUR", suggestion=time_units, context=_SECONDS_CONTEXT),
+        SuggestionRule("time-units", [86400], "SECONDS_PER_DAY", suggestion=time_units, context=_SECONDS_CONTEXT),
+        SuggestionRule("time-units", [604800], "SECONDS_PER_WEEK", suggestion=time_units, context=_SECONDS_CONTEXT),
+    ]
+    byte_sizes = "`{value}` is a size in bytes here: name the unit, `{replacement} = {value}`."
+    rules += [
+        SuggestionRule("byte-sizes", [1024], "KIB", suggestion=byte_sizes, context=_BYTES_CONTEXT),
+        SuggestionRule("byte-sizes", [1024 ** 2], "MIB", suggestion=byte_sizes, context=_BYTES_CONTEXT),
+        SuggestionRule("byte-sizes", [1024 ** 3], "GIB", suggestion=byte_sizes, context=_BYTES_CONTEXT),
+    ]
+    return rules
+
+
+class RuleTable:
+    """
+    Lookup table from literal value to its rule, consulted before any LLM
+    request. Keys include the type, so 60 matches but 60.0 does not.
+    Later rules override earlier ones for the same value.
+    """
+    def __init__(self, rules: Iterable[SuggestionRule] = ()):
+        self.rules: List[SuggestionRule] = []
+        self._table: Dict[Tuple[type, Any], SuggestionRule] = {}
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: SuggestionRule):
+        self.rules.append(rule)
+        for value in rule.values:
+            self._table[(type(value), value)] = rule
+
+    def match(self, value: Any) -> Optional[SuggestionRule]:
+        try:
+            return self._table.get((type(value), value))
+        except TypeError:
+            # Unhashable values never match
+            return None
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the table, recorded in the analysis manifest version."""
+        payload = json.dumps([rule.to_dict() for rule in self.rules], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None) -> "RuleTable":
+        """
+        The built-in rules, extended or overridden by a JSON file of the form
+        {"include_defaults": true, "enable": ["math-constants"], "disable": ["time-units"],
+        "rules": [{"name": ..., "values": [...], "replacement": ..., "import": ...,
+        "suggestion": ..., "context": ...}]}. Groups in DISABLED_BY_DEFAULT need "enable".
+        """
+        config: Dict[str, Any] = {}
+        if path is not None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    config = json.load(f)
+            except (OSError, ValueError) as e:
+                raise ValueError(f"Could not load suggestion rules from {path}: {e}")
+            if not isinstance(config, dict):
+                raise ValueError(f"Suggestion rules in {path} must be a JSON object.")
+
+        disabled = (set(DISABLED_BY_DEFAULT) - set(config.get("enable", []))) | set(config.get("disable", []))
+        rules = default_rules() if config.get("include_defaults", True) else []
+        rules = [rule for rule in rules if rule.name not in disabled]
+        rules += [SuggestionRule.from_dict(entry) for entry in config.get("rules", [])]
+        return cls(rules)
@@ -0,0 +1,12 @@
+# ai-code-reviewer/core/detectors/__init__.py
+from core.detectors.base import Detector, DetectorSet, DetectionContext
+from core.detectors.registry import DETECTOR_REGISTRY, register_detector, create_detector_set
+
+# Importing the built-in detectors registers them
+from core.detectors import magic_number_detector
+
+__all__ = [
+    "Detector", "DetectorSet", "DetectionContext",
+    "DETECTOR_REGISTRY", "register_detector", "create_detector_set",
+    "magic_number_detector",
+]
@@ -0,0 +1,110 @@
+# ai-code-reviewer/core/detectors/base.py
+import ast
+from core.parser.source_document import SourceDocument
+from typing import Dict, Any, Callable, Iterator, List, Optional, Set, Type
+
+
+# Nodes that open a named scope; the Analyzer tracks them during the walk
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+MODULE_SCOPE = "<module>"
+
+
+class DetectionContext:
+    """Per-file information shared with every detector during a walk."""
+    __slots__ = ("filename", "document", "scopes")
+
+    def __init__(self, filename: str, document: SourceDocument):
+        self.filename = filename
+        self.document = document
+        # Names of the classes and functions enclosing the current node, outermost first
+        self.scopes: List[str] = []
+
+    @property
+    def code(self) -> str:
+        return self.document.text
+
+    @property
+    def scope(self) -> str:
+        """Qualified name of the enclosing function or class, e.g. 'Client.fetch'."""
+        return ".".join(self.scopes) if self.scopes else MODULE_SCOPE
+
+
+class Detector:
+    """
+    Base class for single-pass detectors.
+
+    Subclasses declare interest in node types by defining ``visit_<NodeType>``
+    methods (e.g. ``visit_Constant``), just like ``ast.NodeVisitor``. Unlike a
+    visitor they never walk the tree themselves: the Analyzer walks it once and
+    calls each handler with ``(node, context)``. Handlers are generators that
+    yield zero or more issues: ``core.models.Issue`` objects, or plain dicts
+    in the report schema that the Analyzer converts.
+    """
+    # Unique registry name, used to enable/disable the detector from the CLI
+    name: str = ""
+    # Bump when the detector's output changes so cached results are invalidated
+    version: str = "1"
+    enabled_by_default: bool = True
+
+    def __init__(self, **options: Any):
+        self.options = options
+
+    def handlers(self) -> Dict[Type[ast.AST], Callable[[ast.AST, DetectionContext], Iterator[Dict[str, Any]]]]:
+        """Maps each AST node class to the bound handler for it."""
+        table = {}
+        for attr in dir(self):
+            if not attr.startswith("visit_"):
+                continue
+            node_type = getattr(ast, attr[len("visit_"):], None)
+            if isinstance(node_type, type) and issubclass(node_type, ast.AST):
+                table[node_type] = getattr(self, attr)
+        return table
+
+    def candidate_lines(self, document: SourceDocument) -> Optional[Set[int]]:
+        """
+        Optional prefilter, run before the file is parsed: the lines the nodes
+        this detector reports on can start on, found with a cheap scan. An
+        empty set means the detector can't report anything in this file.
+        None (the default) means it can't tell, so every node is visited.
+        """
+        return None
+
+
+class DetectorSet:
+    """
+    An ordered set of detector instances plus a precomputed
+    node-type -> handlers dispatch table.
+    """
+    def __init__(self, detectors: List[Detector]):
+        self.detectors = detectors
+        self.dispatch: Dict[Type[ast.AST], List[Callable]] = {}
+        for detector in detectors:
+            for node_type, handler in detector.handlers().items():
+                self.dispatch.setdefault(node_type, []).append(handler)
+
+    def candidate_lines(self, document: SourceDocument) -> Optional[Set[int]]:
+        """
+        Union of the detectors' candidate lines, or None if any detector
+        needs the full walk. The Analyzer skips parsing when the set is empty
+        and skips statements that contain none of the lines.
+        """
+        lines: Set[int] = set()
+        for detector in self.detectors:
+            found = detector.candidate_lines(document)
+            if found is None:
+                return None
+            lines |= found
+        return lines
+
+    @property
+    def names(self) -> List[str]:
+        return [detector.name for detector in self.detectors]
+
+    @property
+    def version(self) -> str:
+        """Identifies the detector set and options; part of the analysis manifest key."""
+        parts = []
+        for detector in sorted(self.detectors, key=lambda d: d.name):
+            options = ",".join(f"{k}={v}" for k, v in sorted(detector.options.items()))
+            parts.append(f"{detector.name}@{detector.version}({options})")
+        return ";".join(parts)
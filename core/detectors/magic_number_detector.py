@@ -1,42 +1,53 @@
 # ai-code-reviewer/core/detectors/magic_number_detector.py
 import ast
-from typing import List, Dict, Any
+from typing import Any, Iterator, Set
 
-class MagicNumberDetector(ast.NodeVisitor):
+from core.detectors.base import Detector, DetectionContext
+from core.detectors.registry import register_detector
+from core.models import Issue
+from core.parser.literal_scan import iter_numbers, number_value
+from core.parser.source_document import SourceDocument
+
+
+@register_detector
+class MagicNumberDetector(Detector):
     """
     Detects "magic numbers" (unnamed numeric literals) in the code.
-    This class inherits from ast.NodeVisitor to efficiently traverse the AST.
     """
-    
-    def __init__(self):
-        # List to store the issues found
-        self.issues: List[Dict[str, Any]] = []
+    name = "magic-number"
+    version = "2"
+
+    def __init__(self, threshold: float = 2, **options: Any):
+        super().__init__(threshold=threshold, **options)
+        # Numbers whose magnitude is at or below this are common enough to ignore
+        # (0, 1, -1, 2 are often used for loops, booleans, halving, etc.)
+        self.threshold = threshold
+
+    def candidate_lines(self, document: SourceDocument) -> Set[int]:
+        """Lines holding a numeric literal above the threshold, from a token scan instead of a parse."""
+        lines = set()
+        for line, token in iter_numbers(document.text):
+            value = number_value(token)
+            if value is not None and abs(value) > self.threshold:
+                lines.add(line)
+        return lines
 
-    def visit_Constant(self, node):
-        """Called when an ast.Constant node is encountered (where numbers are stored)."""
-        
-        # We only care about numeric constants (integers or floats)
-        if isinstance(node.value, (int, float)):
-            
-            # 1. Ignore common numbers (0, 1, -1) often used for loop boundaries or checks
-            if abs(node.value) <= 1:
-                return
+    def visit_Constant(self, node: ast.Constant, context: DetectionContext) -> Iterator[Issue]:
+        """Called for literal constant values like 5, 100, "hello"."""
+        value = node.value
+        # We only care about numeric constants (integers or floats); bool is an int subclass
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return
+        if abs(value) <= self.threshold:
+            return
 
-            # --- Simplified Logic for MVP ---
-            # We treat any number > 1 or < -1 as a potential magic number.
-            
-            self.issues.append({
-                "type": "MagicNumber",
-                # ast nodes carry line and column info!
-                "line": node.lineno,
-                "col": node.col_offset,
-                "value": node.value,
-                "message": f"Found magic number: {node.value}. Consider using a named constant."
-            })
-        
-        # Ensure we continue traversing the rest of the AST
-        # This is required to process child nodes of the current node
-        self.generic_visit(node)
-        
-    def get_issues(self) -> List[Dict[str, Any]]:
-        return self.issues
\ No newline at end of file
+        # ast nodes carry line and column info! The message is rendered from
+        # the MagicNumber template in core.models when it is read.
+        yield Issue(
+            "MagicNumber",
+            line=node.lineno,
+            col=node.col_offset,
+            value=value,
+            # Enclosing function or class, for the project-wide literal index
+            scope=context.scope,
+        )
@@ -0,0 +1,42 @@
+# ai-code-reviewer/core/detectors/registry.py
+from typing import Dict, Any, List, Optional, Type
+
+from core.detectors.base import Detector, DetectorSet
+
+DETECTOR_REGISTRY: Dict[str, Type[Detector]] = {}
+
+
+def register_detector(cls: Type[Detector]) -> Type[Detector]:
+    """Class decorator that makes a detector available to the Analyzer."""
+    if not cls.name:
+        raise ValueError(f"Detector {cls.__name__} must define a name.")
+    DETECTOR_REGISTRY[cls.name] = cls
+    return cls
+
+
+def create_detector_set(
+    enabled: Optional[List[str]] = None,
+    disabled: Optional[List[str]] = None,
+    options: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> DetectorSet:
+    """
+    Instantiates registered detectors.
+    'enabled' restricts the set to the given names (default: every detector
+    enabled by default); 'disabled' removes names from it; 'options' maps
+    detector names to constructor keyword arguments.
+    """
+    options = options or {}
+    unknown = [name for name in (enabled or []) + (disabled or []) + list(options) if name not in DETECTOR_REGISTRY]
+    if unknown:
+        raise ValueError(
+            f"Unknown detector(s): {', '.join(sorted(set(unknown)))}. "
+            f"Available: {', '.join(sorted(DETECTOR_REGISTRY))}"
+        )
+
+    if enabled:
+        names = list(dict.fromkeys(enabled))
+    else:
+        names = [name for name, cls in DETECTOR_REGISTRY.items() if cls.enabled_by_default]
+    names = [name for name in names if name not in (disabled or [])]
+
+    return DetectorSet([DETECTOR_REGISTRY[name](**options.get(name, {})) for name in names])
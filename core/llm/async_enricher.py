@@ -0,0 +1,302 @@
+# ai-code-reviewer/core/llm/async_enricher.py
+import asyncio
+import random
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.llm.backends import LLMConnectionError, LLMTimeoutError
+from core.llm.prompt_builder import estimate_message_tokens
+from core.llm.scheduler import RequestScheduler
+from core.llm.suggestion_generator import SuggestionGenerator, DEFERRED_MESSAGE, is_failed_suggestion
+from core import telemetry
+
+# HTTP status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+# Completion tokens budgeted per issue in a request (suggestions are kept under 50 words)
+COMPLETION_TOKEN_ESTIMATE = 96
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """Extracts the HTTP status from backend (LLMError) or SDK errors if there is one."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Returns the server-provided Retry-After delay in seconds, if present."""
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        return retry_after
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Timeouts, connection failures, 429s and 5xx responses are retried."""
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError, LLMTimeoutError, LLMConnectionError)):
+        return True
+    status = _status_code(exc)
+    if status is None:
+        # SDK connection/timeout errors carry no status code
+        return "Connection" in type(exc).__name__ or "Timeout" in type(exc).__name__
+    return status in RETRYABLE_STATUS_CODES or status >= 500
+
+
+def dedup_key(issue: Dict[str, Any], context_line: str) -> Tuple[Any, ...]:
+    """Findings with the same type, value and (whitespace-normalized) context share one request."""
+    return (issue['type'], repr(issue.get('value')), " ".join(context_line.split()))
+
+
+def literal_dedup_key(issue: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """With per-literal enrichment, every occurrence of a literal value shares one request."""
+    if issue['type'] != "MagicNumber" or issue.get('value') is None:
+        return None
+    value = issue['value']
+    return ("literal", type(value).__name__, repr(value))
+
+
+class _IssueGroup:
+    """Duplicate findings that are answered by a single logical LLM request."""
+    __slots__ = ("key", "issues", "file_content", "messages", "cache_key")
+
+    def __init__(self, key: Tuple[Any, ...], issue: Dict[str, Any], file_content: str):
+        self.key = key
+        self.issues = [issue]
+        self.file_content = file_content
+        self.messages = None
+        self.cache_key = None
+
+    @property
+    def issue(self) -> Dict[str, Any]:
+        return self.issues[0]
+
+    @property
+    def priority(self) -> int:
+        """Issues answered by this request, weighting literals by their project-wide occurrences."""
+        return sum(issue.get('literal_occurrences') or 1 for issue in self.issues)
+
+    def resolve(self, suggestion: str):
+        for issue in self.issues:
+            issue['suggestion'] = suggestion
+
+
+class AsyncEnricher:
+    """
+    Enriches many issues concurrently with LLM suggestions.
+    Duplicate findings are collapsed into one request, and with batch_size > 1
+    up to that many distinct issues are packed into a single prompt.
+    Concurrency is capped by a bounded semaphore; failed requests are retried
+    with exponential backoff and full jitter. With a scheduler, requests are
+    sent highest-priority first within its TPM/RPM budget, and whatever
+    doesn't fit is marked deferred.
+    """
+    def __init__(
+        self,
+        generator: SuggestionGenerator,
+        concurrency: int = 8,
+        timeout: float = 30.0,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        batch_size: int = 1,
+        per_literal: bool = False,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        self.generator = generator
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.batch_size = max(1, batch_size)
+        # Enrich once per distinct literal value instead of once per occurrence and context
+        self.per_literal = per_literal
+        # Per-literal suggestions already answered, reused by later chunks
+        self._literal_suggestions: Dict[Tuple[Any, ...], str] = {}
+        self.scheduler = scheduler if scheduler is not None and scheduler.enabled else None
+        # Counters surfaced by the CLI
+        self.retries = 0
+        self.requests = 0
+        self.deduplicated = 0
+        self.batch_fallbacks = 0
+        self.deferred = 0
+        # One loop for the enricher's lifetime so the async client's pooled connections stay valid
+        self._loop = None
+
+    def enrich(self, jobs: List[Tuple[Dict[str, Any], str]]) -> None:
+        """
+        Fills in issue['suggestion'] for every (issue, file_content) pair.
+        Each task owns references to its issues, so completion order doesn't matter.
+        Issues already answered by a suggestion rule are left alone.
+        """
+        jobs = self._unanswered(jobs)
+        if not jobs:
+            return
+        if not self.generator.available:
+            # Nothing to wait for; skip the event loop entirely
+            for issue, file_content in jobs:
+                issue['suggestion'] = self.generator.generate_suggestion(issue, file_content)
+            return
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._enrich_all(jobs))
+
+    async def enrich_async(self, jobs: List[Tuple[Dict[str, Any], str]]) -> None:
+        """
+        Coroutine form of enrich() for callers that already run an event loop,
+        such as the review server. Pooled connections stay bound to that loop.
+        """
+        jobs = self._unanswered(jobs)
+        if not jobs:
+            return
+        if not self.generator.available:
+            for issue, file_content in jobs:
+                issue['suggestion'] = self.generator.generate_suggestion(issue, file_content)
+            return
+        await self._enrich_all(jobs)
+
+    def close(self):
+        """Closes the backend's pooled connections and the event loop they are bound to."""
+        self.generator.close()
+        if self._loop is None:
+            return
+        self._loop.run_until_complete(self.generator.aclose())
+        self._loop.close()
+        self._loop = None
+
+    @staticmethod
+    def _unanswered(jobs: List[Tuple[Dict[str, Any], str]]) -> List[Tuple[Dict[str, Any], str]]:
+        return [(issue, file_content) for issue, file_content in jobs if not issue.get('rule')]
+
+    def _group(self, jobs: List[Tuple[Dict[str, Any], str]]) -> List[_IssueGroup]:
+        groups: Dict[Tuple[Any, ...], _IssueGroup] = {}
+        for issue, file_content in jobs:
+            key = literal_dedup_key(issue) if self.per_literal else None
+            if key is None:
+                key = dedup_key(issue, self.generator.context_line(issue, file_content))
+            elif key in self._literal_suggestions:
+                # Answered in an earlier chunk; counted as deduplicated below
+                issue['suggestion'] = self._literal_suggestions[key]
+                continue
+            group = groups.get(key)
+            if group is None:
+                groups[key] = _IssueGroup(key, issue, file_content)
+            else:
+                group.issues.append(issue)
+        self.deduplicated += len(jobs) - len(groups)
+        return list(groups.values())
+
+    async def _enrich_all(self, jobs: List[Tuple[Dict[str, Any], str]]) -> None:
+        semaphore = asyncio.BoundedSemaphore(self.concurrency)
+
+        # The cache is keyed on single-issue prompts so results are reusable whatever the batching
+        groups = self._group(jobs)
+        pending = []
+        for group in groups:
+            group.messages = self.generator.build_messages(group.issue, group.file_content)
+            group.cache_key, cached = self.generator.lookup_cached(group.messages)
+            if cached is not None:
+                group.resolve(cached)
+            else:
+                pending.append(group)
+        if self.scheduler is not None:
+            # Requests acquire budget in submission order, so the most valuable go first
+            pending.sort(key=lambda group: group.priority, reverse=True)
+
+        if self.batch_size > 1:
+            batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+            await asyncio.gather(*(self._run_batch(semaphore, batch) for batch in batches))
+        else:
+            await asyncio.gather(*(self._run_single(semaphore, group) for group in pending))
+
+        if self.per_literal:
+            for group in groups:
+                suggestion = group.issue.get('suggestion')
+                if group.key[0] == "literal" and not is_failed_suggestion(suggestion):
+                    self._literal_suggestions[group.key] = suggestion
+
+    async def _run_single(self, semaphore: asyncio.BoundedSemaphore, group: _IssueGroup) -> None:
+        async with semaphore:
+            suggestion = await self._request_with_retries(group.messages)
+        if suggestion == DEFERRED_MESSAGE:
+            self.deferred += len(group.issues)
+        elif not is_failed_suggestion(suggestion):
+            self.generator.store_suggestion(group.cache_key, suggestion)
+        group.resolve(suggestion)
+
+    async def _run_batch(self, semaphore: asyncio.BoundedSemaphore, batch: List[_IssueGroup]) -> None:
+        if len(batch) == 1:
+            await self._run_single(semaphore, batch[0])
+            return
+
+        issue_ids = [str(index) for index in range(len(batch))]
+        messages = self.generator.build_batch_messages(
+            [(issue_id, group.issue, group.file_content) for issue_id, group in zip(issue_ids, batch)]
+        )
+        async with semaphore:
+            reply = await self._request_with_retries(messages, json_mode=True, issue_count=len(batch))
+        if reply == DEFERRED_MESSAGE:
+            for group in batch:
+                self.deferred += len(group.issues)
+                group.resolve(reply)
+            return
+        parsed = {} if is_failed_suggestion(reply) else self.generator.parse_batch_response(reply, issue_ids)
+
+        # Entries the model skipped or mangled fall back to individual requests
+        fallbacks = []
+        for issue_id, group in zip(issue_ids, batch):
+            suggestion = parsed.get(issue_id)
+            if suggestion is None:
+                fallbacks.append(group)
+            else:
+                self.generator.store_suggestion(group.cache_key, suggestion)
+                group.resolve(suggestion)
+
+        if fallbacks:
+            self.batch_fallbacks += len(fallbacks)
+            await asyncio.gather(*(self._run_single(semaphore, group) for group in fallbacks))
+
+    def _backoff_delay(self, attempt: int, exc: Exception) -> float:
+        # Honour the server's Retry-After when given, otherwise use full jitter
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def _request_with_retries(self, messages: List[Dict[str, str]], json_mode: bool = False,
+                                    issue_count: int = 1) -> str:
+        """
+        Returns the reply text, the generator's error placeholder once retries
+        are exhausted, or DEFERRED_MESSAGE when the scheduler's budget has run out.
+        """
+        estimate = estimate_message_tokens(messages) + COMPLETION_TOKEN_ESTIMATE * issue_count
+        for attempt in range(self.max_retries + 1):
+            if self.scheduler is not None and not await self.scheduler.acquire(estimate):
+                telemetry.incr("llm_deferred_total")
+                return DEFERRED_MESSAGE
+            self.requests += 1
+            telemetry.incr("llm_requests_total")
+            try:
+                reply = await asyncio.wait_for(
+                    self.generator.request_suggestion_async(messages, json_mode=json_mode),
+                    timeout=self.timeout,
+                )
+                telemetry.observe("llm_attempts", attempt + 1, telemetry.ATTEMPT_BUCKETS)
+                return reply
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    telemetry.observe("llm_attempts", attempt + 1, telemetry.ATTEMPT_BUCKETS)
+                    telemetry.incr("llm_failures_total")
+                    if isinstance(e, asyncio.TimeoutError):
+                        return self.generator.error_message(f"request timed out after {self.timeout}s")
+                    return self.generator.error_message(e)
+                self.retries += 1
+                telemetry.incr("llm_retries_total", status=_status_code(e) or type(e).__name__)
+                await asyncio.sleep(self._backoff_delay(attempt, e))
@@ -0,0 +1,298 @@
+# ai-code-reviewer/core/llm/backends.py
+import importlib.util
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Type
+
+GROQ_BASE_URL = "https://api.groq.com"
+DEFAULT_POOL_SIZE = 16
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+
+class LLMError(Exception):
+    """
+    Backend-neutral API error. status_code is None for connection failures and
+    timeouts; retry_after carries the server's Retry-After delay in seconds.
+    """
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class LLMTimeoutError(LLMError):
+    """The request did not complete within the configured timeout."""
+
+
+class LLMConnectionError(LLMError):
+    """The endpoint could not be reached."""
+
+
+class Completion:
+    """A chat completion reply with the token usage the API reported (if any)."""
+    __slots__ = ("text", "prompt_tokens", "completion_tokens")
+
+    def __init__(self, text: str, prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class ConnectionPool:
+    """
+    Keep-alive httpx clients (one sync, one async) shared by every HTTP backend,
+    so requests reuse TCP/TLS connections instead of setting up a new one each time.
+    Clients are created on first use and recreated after close().
+    """
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT):
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._client = None
+        self._async_client = None
+
+    def _options(self) -> Dict[str, Any]:
+        import httpx
+        return {
+            "limits": httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+        }
+
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.Client(**self._options())
+        return self._client
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            import httpx
+            self._async_client = httpx.AsyncClient(**self._options())
+        return self._async_client
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        """Closes the async client; must run on the event loop that used it."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+_shared_pools: Dict[tuple, ConnectionPool] = {}
+
+
+def get_connection_pool(pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT) -> ConnectionPool:
+    """The process-wide pool for these settings; backends created with the same settings share it."""
+    key = (pool_size, timeout, connect_timeout)
+    if key not in _shared_pools:
+        _shared_pools[key] = ConnectionPool(pool_size, timeout, connect_timeout)
+    return _shared_pools[key]
+
+
+class LLMBackend:
+    """
+    Base class for chat completion backends. Subclasses implement complete()
+    and acomplete() and raise LLMError subclasses on failure.
+    """
+    name = "base"
+    default_model = ""
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def unavailable_reason(self) -> str:
+        return ""
+
+    def describe(self) -> str:
+        return self.name
+
+    def complete(self, messages: List[Dict[str, str]], model: str, temperature: float = 0.3,
+                 json_mode: bool = False) -> Completion:
+        raise NotImplementedError
+
+    async def acomplete(self, messages: List[Dict[str, str]], model: str, temperature: float = 0.3,
+                        json_mode: bool = False) -> Completion:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """
+    Any server exposing POST {base_url}/chat/completions in the OpenAI format,
+    e.g. a local Ollama (http://localhost:11434/v1) or llama.cpp server.
+    """
+    name = "openai"
+    default_model = "llama3"
+    default_base_url = "http://localhost:11434/v1"
+    api_key_env = "LLM_API_KEY"
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 pool: Optional[ConnectionPool] = None):
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        # Read when the backend is created, never at import time
+        self.api_key = api_key if api_key is not None else os.environ.get(self.api_key_env)
+        self.pool = pool or get_connection_pool()
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.base_url}/chat/completions"
+
+    @property
+    def available(self) -> bool:
+        return not self.unavailable_reason
+
+    @property
+    def unavailable_reason(self) -> str:
+        # httpx is only imported once a request is made
+        return "" if importlib.util.find_spec("httpx") else "httpx is not installed"
+
+    def describe(self) -> str:
+        return f"{self.name} ({self.base_url})"
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    @staticmethod
+    def _payload(messages, model, temperature, json_mode) -> Dict[str, Any]:
+        payload = {"model": model, "messages": messages, "temperature": temperature}
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+    @staticmethod
+    def _parse(response) -> Completion:
+        if response.status_code >= 400:
+            retry_after = response.headers.get("retry-after")
+            try:
+                retry_after = float(retry_after) if retry_after is not None else None
+            except ValueError:
+                retry_after = None
+            raise LLMError(f"HTTP {response.status_code}: {response.text[:200]}",
+                           status_code=response.status_code, retry_after=retry_after)
+        try:
+            data = response.json()
+            text = data["choices"][0]["message"]["content"] or ""
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Malformed completion response: {e}", status_code=response.status_code)
+        usage = data.get("usage") or {}
+        return Completion(text.strip(), usage.get("prompt_tokens"), usage.get("completion_tokens"))
+
+    @staticmethod
+    def _translate(exc: Exception) -> LLMError:
+        import httpx
+        if isinstance(exc, httpx.TimeoutException):
+            return LLMTimeoutError(f"Request timed out: {exc}")
+        return LLMConnectionError(f"Connection failed: {exc}")
+
+    def complete(self, messages, model, temperature=0.3, json_mode=False) -> Completion:
+        import httpx
+        try:
+            response = self.pool.client.post(self.endpoint, headers=self._headers(),
+                                             json=self._payload(messages, model, temperature, json_mode))
+        except httpx.TransportError as e:
+            raise self._translate(e) from e
+        return self._parse(response)
+
+    async def acomplete(self, messages, model, temperature=0.3, json_mode=False) -> Completion:
+        import httpx
+        try:
+            response = await self.pool.async_client.post(self.endpoint, headers=self._headers(),
+                                                         json=self._payload(messages, model, temperature, json_mode))
+        except httpx.TransportError as e:
+            raise self._translate(e) from e
+        return self._parse(response)
+
+    def close(self):
+        self.pool.close()
+
+    async def aclose(self):
+        await self.pool.aclose()
+
+
+class GroqBackend(OpenAICompatibleBackend):
+    """Groq Cloud through its OpenAI-compatible endpoint; needs GROQ_API_KEY."""
+    name = "groq"
+    default_model = "llama-3.1-8b-instant"
+    default_base_url = GROQ_BASE_URL
+    api_key_env = "GROQ_API_KEY"
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 pool: Optional[ConnectionPool] = None):
+        super().__init__(base_url or os.environ.get("GROQ_BASE_URL"), api_key, pool)
+
+    @property
+    def endpoint(self) -> str:
+        # Same base URL convention as the Groq SDK (host root, without /openai/v1)
+        return f"{self.base_url}/openai/v1/chat/completions"
+
+    @property
+    def unavailable_reason(self) -> str:
+        return super().unavailable_reason if self.api_key else f"{self.api_key_env} not set"
+
+
+class StubBackend(LLMBackend):
+    """
+    In-process backend that answers instantly with a canned suggestion.
+    Useful offline, in CI and for benchmarking everything except the network.
+    """
+    name = "stub"
+    default_model = "stub"
+    # Batch prompts list issues as "[id] ..." lines (see SuggestionGenerator.build_batch_messages)
+    BATCH_ID_PATTERN = re.compile(r"^\[(\w+)\]", re.MULTILINE)
+
+    def __init__(self, latency: float = 0.0, reply: str = "Replace the literal with a descriptively named constant."):
+        self.latency = latency
+        self.reply = reply
+
+    def _completion(self, messages: List[Dict[str, str]], json_mode: bool) -> Completion:
+        prompt = messages[-1]["content"] if messages else ""
+        if json_mode:
+            text = json.dumps({issue_id: self.reply for issue_id in self.BATCH_ID_PATTERN.findall(prompt)})
+        else:
+            text = self.reply
+        return Completion(text, max(1, len(prompt) // 4), max(1, len(text) // 4))
+
+    def complete(self, messages, model, temperature=0.3, json_mode=False) -> Completion:
+        return self._completion(messages, json_mode)
+
+    async def acomplete(self, messages, model, temperature=0.3, json_mode=False) -> Completion:
+        if self.latency:
+            import asyncio
+            await asyncio.sleep(self.latency)
+        return self._completion(messages, json_mode)
+
+
+LLM_BACKENDS: Dict[str, Type[LLMBackend]] = {
+    GroqBackend.name: GroqBackend,
+    OpenAICompatibleBackend.name: OpenAICompatibleBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+def create_backend(name: str = "groq", base_url: Optional[str] = None, api_key: Optional[str] = None,
+                   pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                   connect_timeout: float = DEFAULT_CONNECT_TIMEOUT) -> LLMBackend:
+    """Builds a backend by name; HTTP backends share the process-wide connection pool."""
+    if name not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}'. Available: {', '.join(sorted(LLM_BACKENDS))}")
+    if name == StubBackend.name:
+        return StubBackend()
+    pool = get_connection_pool(pool_size, timeout, connect_timeout)
+    return LLM_BACKENDS[name](base_url=base_url, api_key=api_key, pool=pool)
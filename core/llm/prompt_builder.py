@@ -0,0 +1,183 @@
+# ai-code-reviewer/core/llm/prompt_builder.py
+import ast
+import re
+import textwrap
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from core.parser.source_document import SourceDocument, as_document
+
+# How much code around an issue goes into its prompt
+CONTEXT_MODES = ("line", "statement", "function")
+DEFAULT_CONTEXT_MODE = "statement"
+DEFAULT_CONTEXT_TOKENS = 256
+# Documents whose statement spans are kept parsed
+SPAN_CACHE_SIZE = 64
+# Marks the flagged line in multi-line context
+ISSUE_MARKER = "  # <-- issue"
+
+SYSTEM_PROMPT = (
+    "You are an expert static analysis tool and code reviewer. "
+    "Your task is to take a detected Python code smell and the surrounding code, "
+    "and provide a concise, actionable, and friendly suggestion to fix the issue. "
+    "DO NOT provide the fixed code, only the explanation and suggestion. Keep it under 50 words."
+)
+
+# Word pieces, single punctuation characters, line breaks with their indentation
+# and runs of spaces; a single space is merged into the following word by BPE vocabularies
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]|\n[ \t]*|[ \t]{2,}")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local approximation of a BPE token count: one token per punctuation
+    character, per line break or run of spaces, and per started 4 characters
+    of a word. Close enough to budget requests without a tokenizer dependency.
+    """
+    count = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        count += (len(piece) + 3) // 4 if piece[0].isalnum() or piece[0] == "_" else 1
+    return count
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    # Chat formats add a few tokens of framing per message
+    return sum(estimate_tokens(message["content"]) + 4 for message in messages)
+
+
+def _line_spans(tree: ast.Module, functions: bool) -> Dict[int, Tuple[int, int]]:
+    """
+    Maps each line to the inclusive line range of its innermost statement or,
+    with 'functions', of its innermost function (statements outside functions
+    still map to themselves). Compound statements contribute only their
+    header, so a flagged `if` condition doesn't pull in the whole block.
+    """
+    statements, function_spans = [], []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.stmt):
+            continue
+        body = getattr(node, "body", None)
+        if isinstance(body, list) and body:
+            statements.append((node.lineno, max(node.lineno, body[0].lineno - 1)))
+        else:
+            statements.append((node.lineno, node.end_lineno))
+        if functions and isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            function_spans.append((start, node.end_lineno))
+
+    spans: Dict[int, Tuple[int, int]] = {}
+    for group in (statements, function_spans):
+        # Outermost first, so nested spans overwrite their parents
+        for span in sorted(group, key=lambda span: span[0] - span[1]):
+            for number in range(span[0], span[1] + 1):
+                spans[number] = span
+    return spans
+
+
+class PromptBuilder:
+    """
+    Renders compact chat prompts: no template indentation, and a context window
+    (the flagged line, its statement or its enclosing function) trimmed to a
+    token cap around the flagged line.
+    """
+    def __init__(self, context: str = DEFAULT_CONTEXT_MODE, max_context_tokens: int = DEFAULT_CONTEXT_TOKENS,
+                 system_prompt: str = SYSTEM_PROMPT):
+        if context not in CONTEXT_MODES:
+            raise ValueError(f"Unknown prompt context '{context}'. Available: {', '.join(CONTEXT_MODES)}")
+        self.context = context
+        self.max_context_tokens = max(16, max_context_tokens)
+        self.system_prompt = system_prompt
+        # sha256 -> line spans (None for files that don't parse)
+        self._spans: "OrderedDict[str, Optional[Dict[int, Tuple[int, int]]]]" = OrderedDict()
+
+    def _document_spans(self, document: SourceDocument) -> Optional[Dict[int, Tuple[int, int]]]:
+        key = document.sha256
+        if key in self._spans:
+            self._spans.move_to_end(key)
+            return self._spans[key]
+        try:
+            spans = _line_spans(ast.parse(document.text), self.context == "function")
+        except (SyntaxError, ValueError):
+            spans = None
+        self._spans[key] = spans
+        if len(self._spans) > SPAN_CACHE_SIZE:
+            self._spans.popitem(last=False)
+        return spans
+
+    def _window(self, document: SourceDocument, line: int) -> Tuple[int, int]:
+        """The line range the configured context mode selects for a flagged line."""
+        if self.context == "line":
+            return line, line
+        spans = self._document_spans(document)
+        return spans.get(line, (line, line)) if spans else (line, line)
+
+    def context_snippet(self, issue: Dict[str, Any], file_content: Union[str, SourceDocument]) -> str:
+        """The dedented context for an issue, at most max_context_tokens long."""
+        document = as_document(file_content)
+        line = issue['line']
+        if not 1 <= line <= document.line_count:
+            return "Error loading context line."
+        start, end = self._window(document, line)
+        lines = {number: document.line(number).rstrip() for number in range(start, end + 1)}
+
+        # Grow outwards from the flagged line until the next line would exceed the cap
+        budget = self.max_context_tokens - estimate_tokens(lines[line])
+        first = last = line
+        full = False
+        while not full and (first > start or last < end):
+            for candidate in (first - 1, last + 1):
+                if not start <= candidate <= end:
+                    continue
+                cost = estimate_tokens(lines[candidate]) + 1
+                if cost > budget:
+                    full = True
+                    break
+                budget -= cost
+                first, last = min(first, candidate), max(last, candidate)
+
+        selected = [lines[number] for number in range(first, last + 1)]
+        if len(selected) > 1:
+            selected[line - first] += ISSUE_MARKER
+        snippet = textwrap.dedent("\n".join(selected)).strip("\n")
+        if first == last and estimate_tokens(snippet) > self.max_context_tokens:
+            # A single very long line: keep roughly the cap's worth of characters
+            snippet = snippet.strip()[:self.max_context_tokens * 4]
+        return snippet
+
+    def build_messages(self, issue: Dict[str, Any], file_content: Union[str, SourceDocument]) -> List[Dict[str, str]]:
+        """
+        Chat messages for one issue. The line number is left out: the prompt is
+        the suggestion cache key, and code moving down a file shouldn't miss it.
+        """
+        user_prompt = (
+            f"Analyze this issue detected in a Python file.\n"
+            f"Context:\n"
+            f"---\n{self.context_snippet(issue, file_content)}\n---\n"
+            f"Issue: {issue['type']} - {issue['message']} (value: {issue.get('value', 'N/A')})\n"
+            f"Provide a single paragraph suggestion on how to refactor this code to fix the smell."
+        )
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def build_batch_messages(self, entries: List[Tuple[str, Dict[str, Any], Union[str, SourceDocument]]]) -> List[Dict[str, str]]:
+        """
+        One prompt covering several (issue_id, issue, file_content) entries.
+        The model is asked for a JSON object mapping each issue id to its suggestion.
+        """
+        parts = []
+        for issue_id, issue, file_content in entries:
+            parts.append(
+                f"[{issue_id}] {issue['type']} (value: {issue.get('value', 'N/A')}): "
+                f"{issue['message']}\n```\n{self.context_snippet(issue, file_content)}\n```"
+            )
+        user_prompt = (
+            "Analyze each issue detected in a Python file and suggest how to refactor the code to fix the smell.\n"
+            "Reply with ONLY a JSON object mapping every issue id (as a string) to a single-paragraph suggestion.\n\n"
+            "Issues:\n" + "\n".join(parts)
+        )
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
@@ -0,0 +1,98 @@
+# ai-code-reviewer/core/llm/scheduler.py
+import time
+from typing import Optional
+
+# Longest a request may wait for budget before the rest of the run is deferred
+DEFAULT_MAX_WAIT = 60.0
+
+
+class TokenBucket:
+    """
+    Refills continuously at 'per_minute' units per minute up to 'capacity'
+    (one minute's worth by default), like the provider's own TPM/RPM windows.
+    """
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(per_minute)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until 'amount' is available (inf if it exceeds the capacity)."""
+        self._refill()
+        if amount > self.capacity:
+            return float("inf")
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def consume(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+
+class RequestScheduler:
+    """
+    Keeps LLM traffic within tokens-per-minute and requests-per-minute budgets.
+    Requests acquire budget in arrival order (the enricher submits the
+    highest-priority issues first) and sleep until the buckets can cover them.
+    Once a request would wait longer than max_wait, the scheduler is exhausted
+    and refuses requests until that wait is over, so a run defers its
+    remaining issues to the next run instead of failing with 429s.
+    """
+    def __init__(self, tpm: Optional[int] = None, rpm: Optional[int] = None, max_wait: float = DEFAULT_MAX_WAIT):
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.max_wait = max_wait
+        # Monotonic time until which requests are refused
+        self._resume_at = 0.0
+        # Counters surfaced by the CLI
+        self.waited = 0.0
+        # Created lazily so it binds to the running loop
+        self._lock = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.tokens is not None or self.requests is not None
+
+    @property
+    def exhausted(self) -> bool:
+        return time.monotonic() < self._resume_at
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = 0.0
+        if self.tokens is not None:
+            # A single request larger than the whole bucket waits for a full one
+            wait = max(wait, self.tokens.wait_time(min(tokens, self.tokens.capacity)))
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1))
+        return wait
+
+    async def acquire(self, tokens: int) -> bool:
+        """Waits until a request of ~'tokens' fits the budgets. False means: defer it."""
+        if not self.enabled:
+            return True
+        # Imported here so the CLI can read this module's defaults without loading asyncio
+        import asyncio
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                if self.exhausted:
+                    return False
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    break
+                if wait > self.max_wait:
+                    self._resume_at = time.monotonic() + wait
+                    return False
+                self.waited += wait
+                await asyncio.sleep(wait)
+            if self.tokens is not None:
+                self.tokens.consume(min(tokens, self.tokens.capacity))
+            if self.requests is not None:
+                self.requests.consume(1)
+            return True
@@ -0,0 +1,130 @@
+# ai-code-reviewer/core/llm/suggestion_cache.py
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Dict, Any, List, Optional
+
+DEFAULT_CACHE_DIR = ".code_reviewer_cache"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 50_000
+# Eviction needs a COUNT(*), so it is only checked every N writes
+EVICTION_CHECK_INTERVAL = 100
+# Evict down to this fraction of max_entries so we don't evict on every write
+EVICTION_LOW_WATERMARK = 0.9
+
+
+class SuggestionCache:
+    """
+    Persistent, content-addressed cache of LLM suggestions backed by SQLite.
+    Entries are keyed by a hash of (model, system prompt, user prompt), expire
+    after a TTL and are evicted least-recently-used once the cache is full.
+    SQLite's WAL mode lets several worker processes share one cache file.
+    """
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = os.path.join(cache_dir, "suggestions.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._conn = None
+        self._pid = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]]) -> str:
+        """Hashes the model and the fully rendered prompt into a cache key."""
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        for message in messages:
+            digest.update(b"\0")
+            digest.update(message["role"].encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(message["content"].encode("utf-8"))
+        return digest.hexdigest()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork, so each process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS suggestions ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_suggestions_last_access ON suggestions (last_access)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached suggestion, or None on a miss or an expired entry."""
+        now = time.time()
+        row = self.connection.execute(
+            "SELECT value, created_at FROM suggestions WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > self.ttl_seconds:
+            if row is not None:
+                self.connection.execute("DELETE FROM suggestions WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+
+        self.connection.execute("UPDATE suggestions SET last_access = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, value: str):
+        now = time.time()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO suggestions (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+            (key, value, now, now),
+        )
+        self._writes += 1
+        if self._writes % EVICTION_CHECK_INTERVAL == 0:
+            self.evict()
+
+    def evict(self):
+        """Drops expired entries, then the least recently used ones beyond max_entries."""
+        conn = self.connection
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM suggestions WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            (count,) = conn.execute("SELECT COUNT(*) FROM suggestions").fetchone()
+            if count > self.max_entries:
+                excess = count - int(self.max_entries * EVICTION_LOW_WATERMARK)
+                conn.execute(
+                    "DELETE FROM suggestions WHERE key IN ("
+                    " SELECT key FROM suggestions ORDER BY last_access ASC LIMIT ?)",
+                    (excess,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the report metadata."""
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "path": self.path,
+        }
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self.evict()
+            self._conn.close()
+        self._conn = None
@@ -1,78 +1,191 @@
-# ai-code-reviewer/core/llm/suggestion_generator.py (GROQ CLOUD VERSION)
-import os
-from typing import Dict, Any, Optional
-from groq import Groq
+# ai-code-reviewer/core/llm/suggestion_generator.py
+import json
+import time
+from typing import Dict, Any, List, Optional, Tuple, Union
+from core.llm.backends import LLMBackend, Completion, create_backend
+from core.llm.prompt_builder import PromptBuilder
+from core.llm.suggestion_cache import SuggestionCache
+from core.parser.source_document import SourceDocument
+from core import telemetry
 
-# Use the environment variable set above
-GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
+# Placeholder suggestions start with these, followed by the backend and the reason
+UNAVAILABLE_PREFIX = "LLM service is not available"
+ERROR_PREFIX = "Error communicating with"
+# Issues left over once the configured TPM/RPM budget ran out
+DEFERRED_MESSAGE = "Deferred: LLM rate budget exhausted; the suggestion will be requested on the next run."
+
+def is_failed_suggestion(suggestion: Optional[str]) -> bool:
+    """True for placeholder suggestions that should be retried on a later run."""
+    return (not suggestion or suggestion == DEFERRED_MESSAGE
+            or suggestion.startswith((UNAVAILABLE_PREFIX, ERROR_PREFIX)))
 
 class SuggestionGenerator:
     """
-    Handles communication with the Groq Cloud LLM for fast suggestions.
+    Turns detected issues into LLM prompts and suggestions.
+    Requests go through a pluggable backend (Groq Cloud by default, any
+    OpenAI-compatible server, or the in-process stub).
     """
-    # Using Llama 3 on Groq for excellent performance and code reasoning
-    def __init__(self, model: str = "llama-3.1-8b-instant"): 
-        self.model = model
-        self.client = None
-        
-        if GROQ_API_KEY:
-             try:
-                self.client = Groq(api_key=GROQ_API_KEY)
-                print(f"  ✅ Groq client initialized using model: {self.model}")
-             except Exception as e:
-                print(f"WARNING: Groq initialization failed. Error: {e}")
-                self.client = None
-        else:
-            print("WARNING: GROQ_API_KEY not set. LLM functionality disabled.")
-
-
-        self.system_prompt = (
-            "You are an expert static analysis tool and code reviewer. "
-            "Your task is to take a detected Python code smell and the surrounding code, "
-            "and provide a concise, actionable, and friendly suggestion to fix the issue. "
-            "DO NOT provide the fixed code, only the explanation and suggestion. Keep it under 50 words."
-        )
-
-    def generate_suggestion(self, issue: Dict[str, Any], file_content: str) -> Optional[str]:
-        if not self.client:
-            return "LLM service is not available (GROQ_API_KEY not set)."
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[SuggestionCache] = None,
+        backend: Optional[LLMBackend] = None,
+        prompt_builder: Optional[PromptBuilder] = None,
+    ):
+        # base_url lets the default Groq backend point at a self-hosted or fake endpoint
+        self.backend = backend or create_backend("groq", base_url=base_url)
+        # Llama 3 on Groq by default, for excellent performance and code reasoning
+        self.model = model or self.backend.default_model
+        # Optional persistent cache consulted before every API call
+        self.cache = cache
+
+        # Renders prompts with a token-capped context window
+        self.prompt_builder = prompt_builder or PromptBuilder()
+
+    @property
+    def available(self) -> bool:
+        return self.backend.available
+
+    @property
+    def unavailable_message(self) -> str:
+        """The placeholder suggestion when the backend can't be used, e.g. its API key is not set."""
+        return f"{UNAVAILABLE_PREFIX} ({self.backend.name}: {self.backend.unavailable_reason})."
 
+    def error_message(self, detail: Any) -> str:
+        """The placeholder suggestion for a request that failed for good."""
+        return f"{ERROR_PREFIX} {self.backend.describe()}: {detail}"
+
+    @staticmethod
+    def context_line(issue: Dict[str, Any], file_content: Union[str, SourceDocument]) -> str:
         try:
-            # Safely retrieve the context line
-            context_line = file_content.splitlines()[issue['line'] - 1].strip()
+            # Safely retrieve the context line; documents look it up via their line index
+            if isinstance(file_content, SourceDocument):
+                return file_content.line(issue['line']).strip()
+            return file_content.splitlines()[issue['line'] - 1].strip()
         except IndexError:
-            context_line = "Error loading context line."
+            return "Error loading context line."
 
-        # --- CONSTRUCTING THE USER PROMPT ---
-        user_prompt = f"""
-        Analyze this issue detected in a Python file.
+    @property
+    def system_prompt(self) -> str:
+        return self.prompt_builder.system_prompt
 
-        Context Line (Line {issue['line']}):
-        ---
-        {context_line}
-        ---
+    def build_messages(self, issue: Dict[str, Any], file_content: Union[str, SourceDocument]) -> List[Dict[str, str]]:
+        """Renders the chat messages sent to the LLM for one issue."""
+        return self.prompt_builder.build_messages(issue, file_content)
 
-        Issue Details:
-        - Type: {issue['type']}
-        - Message: {issue['message']}
-        - Detected Value: {issue.get('value', 'N/A')}
+    def build_batch_messages(self, entries: List[Tuple[str, Dict[str, Any], Union[str, SourceDocument]]]) -> List[Dict[str, str]]:
+        """
+        Renders one prompt covering several (issue_id, issue, file_content) entries.
+        The model is asked for a JSON object mapping each issue id to its suggestion.
+        """
+        return self.prompt_builder.build_batch_messages(entries)
 
-        Provide a single paragraph suggestion on how to refactor this code to fix the smell.
+    @staticmethod
+    def parse_batch_response(text: str, issue_ids: List[str]) -> Dict[str, str]:
         """
+        Extracts {issue_id: suggestion} from a batch reply. Ids that are missing
+        or malformed are simply left out so the caller can fall back for them.
+        """
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return {}
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+
+        parsed = {}
+        for issue_id in issue_ids:
+            suggestion = data.get(issue_id)
+            if isinstance(suggestion, str) and suggestion.strip():
+                parsed[issue_id] = suggestion.strip()
+        return parsed
+
+    def lookup_cached(self, messages: List[Dict[str, str]]) -> Tuple[Optional[str], Optional[str]]:
+        """Returns (cache_key, cached_suggestion); both are None when caching is off."""
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(self.model, messages)
+        return key, self.cache.get(key)
 
+    def generate_suggestion(self, issue: Dict[str, Any], file_content: Union[str, SourceDocument]) -> Optional[str]:
+        if not self.available:
+            return self.unavailable_message
+
+        messages = self.build_messages(issue, file_content)
+        cache_key, cached = self.lookup_cached(messages)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
         try:
-            # --- GROQ API CALL ---
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3, 
-            )
-            
-            # The response structure is simpler with Groq/OpenAI style APIs
-            return completion.choices[0].message.content.strip()
+            # --- LLM API CALL ---
+            completion = self.backend.complete(messages, self.model, temperature=0.3)
+            suggestion = completion.text
 
         except Exception as e:
-            return f"Error communicating with Groq: {e}"
\ No newline at end of file
+            self.record_request(time.perf_counter() - start, "error")
+            return self.error_message(e)
+        self.record_request(time.perf_counter() - start, "ok", completion)
+
+        # Only successful answers are cached; errors should be retried next run
+        self.store_suggestion(cache_key, suggestion)
+        return suggestion
+
+    async def generate_suggestion_async(self, issue: Dict[str, Any], file_content: Union[str, SourceDocument]) -> Optional[str]:
+        """
+        Async variant of generate_suggestion. API errors are raised, not swallowed,
+        so the caller can decide whether to retry.
+        """
+        if not self.available:
+            return self.unavailable_message
+
+        messages = self.build_messages(issue, file_content)
+        cache_key, cached = self.lookup_cached(messages)
+        if cached is not None:
+            return cached
+
+        suggestion = await self.request_suggestion_async(messages)
+        self.store_suggestion(cache_key, suggestion)
+        return suggestion
+
+    async def request_suggestion_async(self, messages: List[Dict[str, str]], json_mode: bool = False) -> str:
+        """
+        Sends already-rendered messages to the backend, bypassing the cache.
+        Retries are left to the caller.
+        """
+        start = time.perf_counter()
+        try:
+            completion = await self.backend.acomplete(messages, self.model, temperature=0.3, json_mode=json_mode)
+        except BaseException:
+            self.record_request(time.perf_counter() - start, "error")
+            raise
+        self.record_request(time.perf_counter() - start, "ok", completion)
+        return completion.text
+
+    @staticmethod
+    def record_request(elapsed: float, outcome: str, completion: Optional[Completion] = None):
+        """Records request latency and, when the API reports it, token usage."""
+        telemetry.observe("llm_request_seconds", elapsed, outcome=outcome)
+        if completion is None:
+            return
+        for kind in ("prompt", "completion"):
+            tokens = getattr(completion, f"{kind}_tokens")
+            if tokens is not None:
+                telemetry.observe("llm_tokens", tokens, telemetry.TOKEN_BUCKETS, kind=kind)
+                telemetry.incr("llm_tokens_total", tokens, kind=kind)
+
+    def close(self):
+        """Releases the backend's pooled sync connections."""
+        self.backend.close()
+
+    async def aclose(self):
+        """Releases the backend's pooled async connections (on the loop that used them)."""
+        await self.backend.aclose()
+
+    def store_suggestion(self, cache_key: Optional[str], suggestion: str):
+        if cache_key is not None:
+            self.cache.put(cache_key, suggestion)
@@ -0,0 +1,226 @@
+# ai-code-reviewer/core/models.py
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Issue messages rendered on demand instead of being stored on every issue
+MESSAGE_TEMPLATES = {
+    "MagicNumber": "Found magic number: {value}. Consider using a named constant.",
+}
+PREPARED = "Prepared"
+NOT_AVAILABLE = "Not Available"
+NOT_AVAILABLE_DESCRIPTION = "Automatic fix not supported for this issue type."
+
+
+class _SlottedMapping(MutableMapping):
+    """
+    Dict-style access to a slotted model, so code written against the JSON
+    schema (issue['line'], issue.get('suggestion'), 'fix_patch' in issue) keeps
+    working. Like a dict, unset (None) fields are missing keys; keys outside
+    FIELDS live in a small 'extra' dict that only exists when needed.
+    """
+    __slots__ = ()
+    # Serialized fields, in JSON key order
+    FIELDS: Tuple[str, ...] = ()
+    _FIELD_SET = frozenset()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+        else:
+            value = self.extra.get(key) if self.extra else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._FIELD_SET:
+            setattr(self, key, None)
+        else:
+            del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        if self.extra:
+            yield from (key for key, value in self.extra.items() if value is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for key in self.FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        if self.extra:
+            data.update((key, value) for key, value in self.extra.items() if value is not None)
+        return data
+
+
+class FixPatch(_SlottedMapping):
+    """Patch data for replacing one literal with a named constant."""
+    __slots__ = ("constant_name", "constant_value", "line_to_replace", "col", "old_code", "shared",
+                 "import_statement", "extra")
+    FIELDS = ("constant_name", "constant_value", "line_to_replace", "col", "old_code", "shared", "import_statement")
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, constant_name: str, constant_value: Any, line_to_replace: int, col: Optional[int] = None,
+                 old_code: Optional[str] = None, shared: Optional[bool] = None,
+                 import_statement: Optional[str] = None):
+        self.constant_name = constant_name
+        self.constant_value = constant_value
+        self.line_to_replace = line_to_replace
+        self.col = col
+        self.old_code = old_code
+        # True when the name is shared by every occurrence of the value (--consolidate-literals)
+        self.shared = shared or None
+        # Set by suggestion rules: constant_name is then an expression from this import (math.pi)
+        self.import_statement = import_statement
+        self.extra = None
+
+    @property
+    def description(self) -> str:
+        """The fix description shown in the report and dashboard."""
+        name, value = self.constant_name, self.constant_value
+        if self.import_statement:
+            return (f"Replace the detected value `{value}` on line {self.line_to_replace} with `{name}` "
+                    f"(adds `{self.import_statement}` if missing).")
+        description = (
+            f"Define a new constant: `{name} = {value}` (at the top of the file).\n"
+            f"Replace the detected value `{value}` on line {self.line_to_replace} with `{name}`."
+        )
+        if self.shared:
+            description += f"\nEvery occurrence of `{value}` in the project shares this constant."
+        return description
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FixPatch":
+        patch = cls(data["constant_name"], data["constant_value"], data["line_to_replace"],
+                    data.get("col"), data.get("old_code"), data.get("shared"), data.get("import_statement"))
+        for key, value in data.items():
+            if key not in cls._FIELD_SET:
+                patch[key] = value
+        return patch
+
+
+class Issue(_SlottedMapping):
+    """
+    One finding. Replaces the per-issue dict: field names are slots rather
+    than repeated keys, the message and fix description are rendered from
+    templates unless overridden, and file paths are interned.
+    """
+    __slots__ = (
+        "type", "line", "col", "value", "scope", "_message", "_file", "fix_patch", "autofix_status",
+        "_autofix_description", "suggestion", "rule", "literal_occurrences", "literal_files", "extra",
+    )
+    FIELDS = (
+        "type", "line", "col", "value", "scope", "message", "file", "fix_patch", "autofix_status",
+        "autofix_description", "suggestion", "rule", "literal_occurrences", "literal_files",
+    )
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, type: str, line: int, col: Optional[int] = None, value: Any = None,
+                 scope: Optional[str] = None, message: Optional[str] = None, file: Optional[str] = None):
+        self.type = type
+        self.line = line
+        self.col = col
+        self.value = value
+        self.scope = scope
+        self._message = None
+        self._file = None
+        self.fix_patch: Optional[FixPatch] = None
+        self.autofix_status: Optional[str] = None
+        self._autofix_description = None
+        self.suggestion: Optional[str] = None
+        # Name of the suggestion rule that answered this issue locally, instead of the LLM
+        self.rule: Optional[str] = None
+        self.literal_occurrences: Optional[int] = None
+        self.literal_files: Optional[int] = None
+        self.extra = None
+        if message is not None:
+            self.message = message
+        if file is not None:
+            self.file = file
+
+    @property
+    def file(self) -> Optional[str]:
+        return self._file
+
+    @file.setter
+    def file(self, path: Optional[str]):
+        # Every issue of a file shares one string object
+        self._file = sys.intern(path) if path is not None else None
+
+    def _default_message(self) -> Optional[str]:
+        template = MESSAGE_TEMPLATES.get(self.type)
+        return template.format(value=self.value) if template is not None else None
+
+    @property
+    def message(self) -> Optional[str]:
+        return self._message if self._message is not None else self._default_message()
+
+    @message.setter
+    def message(self, text: Optional[str]):
+        # Only text that differs from the template is stored
+        self._message = None if text == self._default_message() else text
+
+    def _default_autofix_description(self) -> Optional[str]:
+        if self.autofix_status == PREPARED and self.fix_patch is not None:
+            return self.fix_patch.description
+        if self.autofix_status == NOT_AVAILABLE:
+            return NOT_AVAILABLE_DESCRIPTION
+        return None
+
+    @property
+    def autofix_description(self) -> Optional[str]:
+        if self._autofix_description is not None:
+            return self._autofix_description
+        return self._default_autofix_description()
+
+    @autofix_description.setter
+    def autofix_description(self, text: Optional[str]):
+        self._autofix_description = None if text == self._default_autofix_description() else text
+
+    def __setitem__(self, key: str, value: Any):
+        if key == "fix_patch" and isinstance(value, dict):
+            value = FixPatch.from_dict(value)
+        super().__setitem__(key, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The issue in the report's JSON schema."""
+        data = super().to_dict()
+        if self.fix_patch is not None:
+            data["fix_patch"] = self.fix_patch.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Issue":
+        """Builds an issue from the report's JSON schema (or a detector's plain dict)."""
+        issue = cls(data["type"], data["line"], data.get("col"), data.get("value"), data.get("scope"))
+        for key, value in data.items():
+            if key not in ("type", "line", "col", "value", "scope", "autofix_description") and value is not None:
+                issue[key] = value
+        # Compared against the default rendering, which depends on the status and patch
+        issue.autofix_description = data.get("autofix_description")
+        return issue
+
+
+def as_dict(item: Any) -> Any:
+    """JSON-ready form of an Issue or FixPatch; plain dicts pass through unchanged."""
+    return item.to_dict() if isinstance(item, _SlottedMapping) else item
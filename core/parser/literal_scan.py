@@ -0,0 +1,112 @@
+# ai-code-reviewer/core/parser/literal_scan.py
+import re
+import sys
+import tokenize
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Python's own numeric literal grammar (tokenize.Number); a literal never starts inside a name
+_NUMBER = r"(?<!\w)(?=\.?[0-9])(?:" + tokenize.Number + r")"
+_STRING = (r"(?P<prefix>[rRbBuUfF]{0,2})(?:"
+           r"'''(?:[^'\\]|\\.|'(?!''))*'''|\"\"\"(?:[^\"\\]|\\.|\"(?!\"\"))*\"\"\""
+           r"|'(?:[^'\\\n]|\\.)*'|\"(?:[^\"\\\n]|\\.)*\")")
+# Comments and strings are consumed whole so digits inside them don't count. The lookahead
+# lets the scan skip every position that can't start a comment, string or number.
+_TOKEN = re.compile(r"(?=[#'\"rRbBuUfF0-9.])(?:(?P<comment>#[^\r\n]*)|(?P<string>" + _STRING + r")"
+                    r"|(?P<number>" + _NUMBER + r"))", re.S)
+_NUMBER_ONLY = re.compile(_NUMBER)
+# From 3.12 on, replacement fields may reuse the f-string's own quotes, so where it ends can't be found
+# lexically; the tokenizer splits f-strings into parts there, so it is asked instead
+_NESTED_FSTRINGS = sys.version_info >= (3, 12)
+
+
+def number_value(token: str) -> Optional[Union[int, float]]:
+    """The value of a numeric literal token; None for imaginary literals (and malformed ones)."""
+    token = token.replace("_", "")
+    if token[-1] in "jJ":
+        return None
+    try:
+        return int(token, 0)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        # Legacy octal such as 0777: a syntax error in Python 3, so the parse will report it
+        return None
+
+
+def _fstring_numbers(text: str, start: int) -> Optional[Tuple[List[Tuple[int, str]], int]]:
+    """
+    Tokenizes the f-string at start (3.12+). Returns the numbers in its
+    replacement fields as (lines after the start line, token), and the offset
+    just past its end; None if it doesn't tokenize.
+    """
+    position = start
+    line_starts: List[int] = []
+
+    def readline() -> str:
+        nonlocal position
+        end = text.find("\n", position) + 1 or len(text)
+        line_starts.append(position)
+        line, position = text[position:end], end
+        return line
+
+    numbers = []
+    depth = 0
+    try:
+        for token in tokenize.generate_tokens(readline):
+            if token.type == tokenize.FSTRING_START:
+                depth += 1
+            elif token.type == tokenize.FSTRING_END:
+                depth -= 1
+                if not depth:
+                    return numbers, line_starts[token.end[0] - 1] + token.end[1]
+            elif token.type == tokenize.NUMBER:
+                numbers.append((token.start[0] - 1, token.string))
+            elif not depth:
+                break
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    return None
+
+
+def iter_numbers(text: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yields (line, token) for every numeric literal in the source, without
+    parsing it. Comments and plain strings are skipped, and so is the literal
+    text of f-strings from Python 3.12 on (before that, f-strings are scanned
+    whole). The result is a superset of the ast.Constant numbers, so a file
+    with no candidate has no numeric constant.
+    """
+    if "\r" in text:
+        # The tokenizer treats \r\n and a lone \r as line ends, like \n
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    line, counted = 1, 0
+    position = 0
+    while True:
+        match = _TOKEN.search(text, position)
+        if match is None:
+            return
+        position = match.end()
+        if match.group("number") is not None:
+            line += text.count("\n", counted, match.start())
+            counted = match.start()
+            yield line, match.group("number")
+        elif match.group("string") is not None and "f" in match.group("prefix").lower():
+            line += text.count("\n", counted, match.start())
+            counted = match.start()
+            if _NESTED_FSTRINGS:
+                fstring = _fstring_numbers(text, match.start())
+                if fstring is not None:
+                    numbers, position = fstring
+                    yield from ((line + offset, token) for offset, token in numbers)
+                    continue
+            # Before 3.12 (or if the f-string doesn't tokenize) its literal text only adds false candidates.
+            # An f-string that doesn't tokenize leaves the rest of the file unscanned, so all of it is kept.
+            end = match.end() if not _NESTED_FSTRINGS else len(text)
+            for number in _NUMBER_ONLY.finditer(text, match.start(), end):
+                line += text.count("\n", counted, number.start())
+                counted = number.start()
+                yield line, number.group()
+            if _NESTED_FSTRINGS:
+                return
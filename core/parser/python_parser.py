@@ -1,21 +1,28 @@
 # ai-code-reviewer/core/parser/python_parser.py
 import ast
-from typing import List
+from typing import List, Union
+from core.parser.source_document import SourceDocument
 
 class PythonParser:
     """
     Parses Python code into an AST and extracts basic information.
     """
 
+    @staticmethod
+    def load_document(filepath: str) -> SourceDocument:
+        """Reads a file once into a SourceDocument shared by all later stages."""
+        return SourceDocument.from_path(filepath)
+
     @staticmethod
     def load_code(filepath: str) -> str:
         """Loads and returns the source code from a file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
+        return SourceDocument.from_path(filepath).text
 
     @staticmethod
-    def parse_ast(code: str) -> ast.AST:
-        """Parses the source code string into a Python AST."""
+    def parse_ast(code: Union[str, SourceDocument]) -> ast.AST:
+        """Parses the source code string (or document) into a Python AST."""
+        if isinstance(code, SourceDocument):
+            code = code.text
         # The 'type_comments=True' is useful for advanced static analysis
         return ast.parse(code, type_comments=True)
 
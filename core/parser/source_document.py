@@ -0,0 +1,115 @@
+# ai-code-reviewer/core/parser/source_document.py
+import hashlib
+import mmap
+import os
+from array import array
+from typing import Optional, Union
+
+# Files at least this large are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 1 << 20
+
+
+class SourceDocument:
+    """
+    A source file read once and shared by every stage (parser, analyzer,
+    fixer, LLM prompts).
+
+    The raw UTF-8 bytes are kept (memory-mapped for large files); the decoded
+    text and the line-offset index are only built when first needed. Lines,
+    column slices and context windows are looked up in O(1) through the index
+    without splitting or copying the whole text. Columns are UTF-8 byte
+    offsets, matching ast's col_offset.
+    """
+    def __init__(self, data: Union[bytes, mmap.mmap], path: str = "<unknown>",
+                 text: Optional[str] = None, mtime_ns: Optional[int] = None):
+        self.path = path
+        self.data = data
+        self.mtime_ns = mtime_ns
+        self._text = text
+        self._line_offsets: Optional[array] = None
+        self._sha256: Optional[str] = None
+
+    @classmethod
+    def from_path(cls, path: str) -> "SourceDocument":
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size >= MMAP_THRESHOLD:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+        return cls(data, path=path, mtime_ns=stat.st_mtime_ns)
+
+    @classmethod
+    def from_text(cls, text: str, path: str = "<unknown>") -> "SourceDocument":
+        return cls(text.encode('utf-8'), path=path, text=text)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def text(self) -> str:
+        """The full decoded text (raises UnicodeDecodeError for non-UTF-8 files)."""
+        if self._text is None:
+            self._text = self.data[:].decode('utf-8')
+        return self._text
+
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data).hexdigest()
+        return self._sha256
+
+    @property
+    def line_offsets(self) -> array:
+        """Byte offset at which each line starts, plus a final end-of-data sentinel."""
+        if self._line_offsets is None:
+            data = self.data
+            offsets = array('q', [0])
+            position = data.find(b"\n")
+            while position != -1:
+                offsets.append(position + 1)
+                position = data.find(b"\n", position + 1)
+            if offsets[-1] != len(data):
+                offsets.append(len(data))
+            self._line_offsets = offsets
+        return self._line_offsets
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_offsets) - 1
+
+    def line_bytes(self, line: int) -> bytes:
+        """Raw bytes of a 1-based line, without its line terminator."""
+        if line < 1 or line > self.line_count:
+            raise IndexError(f"line {line} out of range for {self.path}")
+        offsets = self.line_offsets
+        return self.data[offsets[line - 1]:offsets[line]].rstrip(b"\r\n")
+
+    def line(self, line: int) -> str:
+        return self.line_bytes(line).decode('utf-8', errors='replace')
+
+    def slice(self, line: int, col: int, end_line: int, end_col: int) -> str:
+        """Source text between two (line, byte column) positions, e.g. an AST node's span."""
+        offsets = self.line_offsets
+        start = offsets[line - 1] + col
+        end = offsets[end_line - 1] + end_col
+        return self.data[start:end].decode('utf-8', errors='replace')
+
+    def context(self, line: int, before: int = 0, after: int = 0) -> str:
+        """The given line plus up to 'before'/'after' surrounding lines."""
+        first = max(1, line - before)
+        last = min(self.line_count, line + after)
+        offsets = self.line_offsets
+        return self.data[offsets[first - 1]:offsets[last]].decode('utf-8', errors='replace').rstrip("\r\n")
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+
+def as_document(source: Union[str, SourceDocument], path: str = "<unknown>") -> SourceDocument:
+    """Accepts either raw source text or an existing document."""
+    if isinstance(source, SourceDocument):
+        return source
+    return SourceDocument.from_text(source, path=path)
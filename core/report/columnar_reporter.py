@@ -0,0 +1,119 @@
+# ai-code-reviewer/core/report/columnar_reporter.py
+import json
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.models import as_dict
+
+# Flat columns stored in the Parquet report; nested data (fix_patch) is kept as a JSON string
+COLUMNS = [
+    "file", "line", "col", "type", "value", "message",
+    "suggestion", "autofix_status", "autofix_description", "fix_patch",
+]
+# Issues buffered per Parquet row group
+ROW_GROUP_SIZE = 10_000
+
+
+def metadata_path(report_path: str) -> str:
+    """Run metadata is written next to the Parquet file, since it is only known at the end."""
+    return report_path + ".metadata.json"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("The parquet report format requires pyarrow (pip install pyarrow).")
+    return pyarrow, pyarrow.parquet
+
+
+def _schema(pa):
+    return pa.schema([
+        ("file", pa.string()),
+        ("line", pa.int64()),
+        ("col", pa.int64()),
+        ("type", pa.string()),
+        # Values are mixed int/float literals; strings keep them exact
+        ("value", pa.string()),
+        ("message", pa.string()),
+        ("suggestion", pa.string()),
+        ("autofix_status", pa.string()),
+        ("autofix_description", pa.string()),
+        ("fix_patch", pa.string()),
+    ])
+
+
+class ParquetReportWriter:
+    """
+    Writes issues into a columnar Parquet report in row groups, with the same
+    write_issue / close(metadata) interface as the JSON writers. Dashboards can
+    then load only the columns they display.
+    """
+    def __init__(self, output_path: str):
+        self._pa, pq = _require_pyarrow()
+        self.output_path = output_path
+        self._writer = pq.ParquetWriter(output_path, _schema(self._pa))
+        self._rows: Dict[str, List[Any]] = {column: [] for column in COLUMNS}
+        self._pending = 0
+
+    def write_issue(self, issue: Dict[str, Any]):
+        rows = self._rows
+        rows["file"].append(issue.get("file"))
+        rows["line"].append(issue.get("line"))
+        rows["col"].append(issue.get("col"))
+        rows["type"].append(issue.get("type"))
+        rows["value"].append(None if issue.get("value") is None else str(issue["value"]))
+        rows["message"].append(issue.get("message"))
+        rows["suggestion"].append(issue.get("suggestion"))
+        rows["autofix_status"].append(issue.get("autofix_status"))
+        rows["autofix_description"].append(issue.get("autofix_description"))
+        patch = issue.get("fix_patch")
+        rows["fix_patch"].append(None if patch is None else json.dumps(as_dict(patch)))
+        self._pending += 1
+        if self._pending >= ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        table = self._pa.table(self._rows, schema=_schema(self._pa))
+        self._writer.write_table(table)
+        self._rows = {column: [] for column in COLUMNS}
+        self._pending = 0
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None):
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+        if metadata is not None:
+            with open(metadata_path(self.output_path), 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, indent=4)
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def read_parquet_report(path: str, columns: Optional[List[str]] = None) -> Tuple[Dict[str, Any], Any]:
+    """Loads (metadata, pandas DataFrame) from a Parquet report, optionally only some columns."""
+    import pandas as pd
+
+    metadata: Dict[str, Any] = {}
+    try:
+        with open(metadata_path(path), 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        pass
+    return metadata, pd.read_parquet(path, columns=columns)
@@ -0,0 +1,292 @@
+# ai-code-reviewer/core/report/history_store.py
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_HISTORY_PATH = "code_reviewer_history.sqlite3"
+# Issue rows inserted per transaction while a run streams in
+BATCH_ROWS = 2000
+DEFAULT_PAGE_SIZE = 25
+DEFAULT_TREND_RUNS = 50
+
+# Issue columns stored per row, in insert order
+ISSUE_COLUMNS = ("file", "line", "col", "type", "value", "message", "suggestion",
+                 "autofix_status", "autofix_description", "rule", "scope")
+# Columns the dashboard may filter on or list distinct values of
+FILTER_COLUMNS = ("file", "type", "autofix_status", "rule")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " started_at TEXT NOT NULL,"
+    " finished_at TEXT,"
+    # running -> complete, or aborted; only complete runs are queried
+    " status TEXT NOT NULL,"
+    " tool_version TEXT,"
+    " analysis_version TEXT,"
+    " report_path TEXT,"
+    # Set for --diff runs, which only hold the changed lines' issues
+    " diff_spec TEXT,"
+    " total_files INTEGER,"
+    " total_issues INTEGER,"
+    " metadata TEXT)",
+    "CREATE TABLE IF NOT EXISTS files ("
+    " run_id INTEGER NOT NULL,"
+    " path TEXT NOT NULL,"
+    " total_issues INTEGER NOT NULL,"
+    " error TEXT,"
+    " sha256 TEXT,"
+    " PRIMARY KEY (run_id, path))",
+    "CREATE TABLE IF NOT EXISTS issues ("
+    " run_id INTEGER NOT NULL,"
+    " file TEXT, line INTEGER, col INTEGER, type TEXT,"
+    # No declared type: ints and floats keep their own storage class
+    " value,"
+    " message TEXT, suggestion TEXT, autofix_status TEXT, autofix_description TEXT, rule TEXT, scope TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_issues_run ON issues (run_id, file, line, col)",
+    "CREATE INDEX IF NOT EXISTS idx_issues_location ON issues (file, type, line)",
+    "CREATE INDEX IF NOT EXISTS idx_files_path ON files (path, run_id)",
+)
+
+
+def _now() -> str:
+    # UTC, in the format SQLite's datetime() functions compare against
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _sql_value(value: Any) -> Any:
+    """Numbers and strings are stored as they are; anything else as its repr."""
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return repr(value)
+
+
+class HistoryStore:
+    """
+    Review history in SQLite: one row per run, per analyzed file and per
+    issue, so questions across runs ("which files regressed since Monday")
+    are indexed queries instead of re-runs. Written by HistoryWriter during a
+    review and queried by the dashboard.
+    """
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, readonly: bool = False):
+        self.path = path
+        if readonly:
+            # Streamlit serves each rerun from a different thread
+            self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30.0,
+                                         isolation_level=None, check_same_thread=False)
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    # --- Writing ---
+
+    def begin_run(self, analysis_version: Optional[str] = None, report_path: Optional[str] = None,
+                  diff_spec: Optional[str] = None, tool_version: Optional[str] = None) -> int:
+        """Registers a run in progress and returns its id."""
+        cursor = self._conn.execute(
+            "INSERT INTO runs (started_at, status, tool_version, analysis_version, report_path, diff_spec)"
+            " VALUES (?, 'running', ?, ?, ?, ?)",
+            (_now(), tool_version, analysis_version, report_path, diff_spec),
+        )
+        return cursor.lastrowid
+
+    def add_issues(self, run_id: int, issues: Iterable[Dict[str, Any]]):
+        """Inserts a batch of issues in one transaction."""
+        rows = [(run_id, *(_sql_value(issue.get(column)) for column in ISSUE_COLUMNS)) for issue in issues]
+        self._transaction(
+            lambda conn: conn.executemany(
+                f"INSERT INTO issues (run_id, {', '.join(ISSUE_COLUMNS)})"
+                f" VALUES (?{', ?' * len(ISSUE_COLUMNS)})", rows,
+            )
+        )
+
+    def finish_run(self, run_id: int, metadata: Dict[str, Any]):
+        """Stores the per-file summaries and marks the run complete, in one transaction."""
+        files = metadata.get("files", [])
+        # The files table holds the per-file entries; the rest of the metadata is kept as JSON
+        extra = {key: value for key, value in metadata.items() if key != "files"}
+
+        def finish(conn):
+            conn.executemany(
+                "INSERT OR REPLACE INTO files (run_id, path, total_issues, error, sha256) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, entry["path"], entry.get("total_issues", 0), entry.get("error"), entry.get("sha256"))
+                 for entry in files],
+            )
+            conn.execute(
+                "UPDATE runs SET status = 'complete', finished_at = ?, total_files = ?, total_issues = ?,"
+                " metadata = ? WHERE id = ?",
+                (_now(), metadata.get("total_files", len(files)), metadata.get("total_issues"),
+                 json.dumps(extra, default=str), run_id),
+            )
+        self._transaction(finish)
+
+    def abort_run(self, run_id: int):
+        """Drops an interrupted run's rows; a partial run would skew every comparison."""
+        def abort(conn):
+            conn.execute("DELETE FROM issues WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM files WHERE run_id = ?", (run_id,))
+            conn.execute("UPDATE runs SET status = 'aborted', finished_at = ? WHERE id = ?", (_now(), run_id))
+        self._transaction(abort)
+
+    def _transaction(self, work):
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            work(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # --- Queries ---
+
+    def runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Complete runs, newest first."""
+        rows = self._conn.execute(
+            "SELECT id, started_at, finished_at, analysis_version, report_path, diff_spec, total_files, total_issues"
+            " FROM runs WHERE status = 'complete' ORDER BY id DESC LIMIT ?",
+            (-1 if limit is None else limit,),
+        )
+        keys = ("id", "started_at", "finished_at", "analysis_version", "report_path", "diff_spec",
+                "total_files", "total_issues")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def run_metadata(self, run_id: int) -> Dict[str, Any]:
+        row = self._conn.execute("SELECT metadata FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    @staticmethod
+    def _where(run_id: int, filters: Optional[Dict[str, Sequence[Any]]]) -> Tuple[str, List[Any]]:
+        clauses, params = ["run_id = ?"], [run_id]
+        for column, values in (filters or {}).items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter issues on '{column}'.")
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        return " AND ".join(clauses), params
+
+    def distinct(self, run_id: int, column: str) -> List[Any]:
+        """Distinct values of a filterable column in one run, for filter widgets."""
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Cannot list values of '{column}'.")
+        rows = self._conn.execute(
+            f"SELECT DISTINCT {column} FROM issues WHERE run_id = ? AND {column} IS NOT NULL ORDER BY {column}",
+            (run_id,),
+        )
+        return [value for (value,) in rows]
+
+    def count_issues(self, run_id: int, filters: Optional[Dict[str, Sequence[Any]]] = None) -> int:
+        where, params = self._where(run_id, filters)
+        return self._conn.execute(f"SELECT COUNT(*) FROM issues WHERE {where}", params).fetchone()[0]
+
+    def issues(self, run_id: int, filters: Optional[Dict[str, Sequence[Any]]] = None,
+               limit: int = DEFAULT_PAGE_SIZE, offset: int = 0) -> List[Dict[str, Any]]:
+        """One page of a run's issues in report order (file, line, column)."""
+        where, params = self._where(run_id, filters)
+        rows = self._conn.execute(
+            f"SELECT {', '.join(ISSUE_COLUMNS)} FROM issues WHERE {where}"
+            " ORDER BY file, line, col LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        )
+        return [dict(zip(ISSUE_COLUMNS, row)) for row in rows]
+
+    def compare_runs(self, base_id: int, head_id: int) -> List[Dict[str, Any]]:
+        """
+        Files whose issue count differs between two runs, biggest regression
+        first. Files missing from one run count as 0 there.
+        """
+        rows = self._conn.execute(
+            "SELECT path,"
+            " SUM(CASE WHEN run_id = ? THEN total_issues ELSE 0 END) AS base,"
+            " SUM(CASE WHEN run_id = ? THEN total_issues ELSE 0 END) AS head"
+            " FROM files WHERE run_id IN (?, ?) GROUP BY path HAVING base != head"
+            " ORDER BY head - base DESC, path",
+            (base_id, head_id, base_id, head_id),
+        )
+        return [{"file": path, "base": base, "head": head, "delta": head - base} for path, base, head in rows]
+
+    def trend(self, file: Optional[str] = None, limit: int = DEFAULT_TREND_RUNS) -> List[Dict[str, Any]]:
+        """
+        Issue counts of the last 'limit' full runs, oldest first; for one file
+        when given. Diff runs only cover changed lines, so they are left out.
+        """
+        if file is None:
+            rows = self._conn.execute(
+                "SELECT id, finished_at, total_issues FROM runs"
+                " WHERE status = 'complete' AND diff_spec IS NULL ORDER BY id DESC LIMIT ?",
+                (limit,),
+            )
+        else:
+            rows = self._conn.execute(
+                "SELECT runs.id, runs.finished_at, files.total_issues FROM files"
+                " JOIN runs ON runs.id = files.run_id"
+                " WHERE files.path = ? AND runs.status = 'complete' AND runs.diff_spec IS NULL"
+                " ORDER BY runs.id DESC LIMIT ?",
+                (file, limit),
+            )
+        return [{"run_id": run_id, "finished_at": finished_at, "total_issues": total}
+                for run_id, finished_at, total in reversed(rows.fetchall())]
+
+    def close(self):
+        self._conn.close()
+
+
+class HistoryWriter:
+    """
+    Report writer (write_issue / close(metadata)) that records a run in a
+    HistoryStore. Issues are buffered and inserted BATCH_ROWS at a time; the
+    run only becomes visible to queries once close() marks it complete.
+    """
+    def __init__(self, path: str, analysis_version: Optional[str] = None, report_path: Optional[str] = None,
+                 diff_spec: Optional[str] = None, tool_version: Optional[str] = None):
+        self.store = HistoryStore(path)
+        self.run_id = self.store.begin_run(analysis_version, report_path, diff_spec, tool_version)
+        self._pending: List[Dict[str, Any]] = []
+        self._closed = False
+
+    def write_issue(self, issue: Dict[str, Any]):
+        # Issue models and plain dicts both support .get(); rows are built at flush time
+        self._pending.append(issue)
+        if len(self._pending) >= BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self.store.add_issues(self.run_id, self._pending)
+            self._pending = []
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._flush()
+            self.store.finish_run(self.run_id, metadata or {})
+        finally:
+            self.store.close()
+
+    def abort(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.store.abort_run(self.run_id)
+        finally:
+            self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
@@ -1,6 +1,14 @@
 # ai-code-reviewer/core/report/json_reporter.py
 import json
-from typing import List, Dict, Any
+import os
+import stat
+import tempfile
+from typing import List, Dict, Any, Optional, Tuple
+
+from core.models import as_dict
+from core.report.update_log import apply_report_updates, read_report_updates
+
+TOOL_VERSION = "0.1.0"
 
 def generate_report(issues: List[Dict[str, Any]], filename: str) -> Dict[str, Any]:
     """
@@ -10,12 +18,50 @@ def generate_report(issues: List[Dict[str, Any]], filename: str) -> Dict[str, An
         "metadata": {
             "file": filename,
             "total_issues": len(issues),
-            "tool_version": "0.1.0" 
+            "tool_version": TOOL_VERSION
         },
         "issues": issues
     }
     return report
 
+def build_metadata(files: List[Dict[str, Any]], total_issues: int) -> Dict[str, Any]:
+    """
+    Summarizes a multi-file run. 'files' holds one {path, total_issues, error}
+    entry per analyzed file.
+    """
+    return {
+        # Kept for single-file consumers such as the dashboard header
+        "file": files[0]["path"] if len(files) == 1 else f"{len(files)} files",
+        "total_files": len(files),
+        "total_issues": total_issues,
+        "tool_version": TOOL_VERSION,
+        "files": files,
+    }
+
+def summarize_file_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The per-file metadata entry for one analysis result."""
+    summary = {
+        "path": result["file"],
+        "total_issues": len(result["issues"]),
+        "error": result.get("error"),
+    }
+    # Lets --fix detect files that changed after the report was written
+    if result.get("sha256"):
+        summary["sha256"] = result["sha256"]
+    return summary
+
+def generate_multi_file_report(file_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges per-file analysis results into one report.
+    Every issue carries its own 'file' key; the metadata summarizes all files.
+    """
+    issues = [issue for result in file_results for issue in result["issues"]]
+    files = [summarize_file_result(result) for result in file_results]
+    return {
+        "metadata": build_metadata(files, len(issues)),
+        "issues": issues
+    }
+
 def write_json_report(report_data: Dict[str, Any], output_path: str):
     """
     Writes the report data to a JSON file.
@@ -24,8 +70,183 @@ def write_json_report(report_data: Dict[str, Any], output_path: str):
         # 'w' mode for writing, 'utf-8' encoding for compatibility
         with open(output_path, 'w', encoding='utf-8') as f:
             # Use indent=4 for clean, human-readable JSON output
-            json.dump(report_data, f, indent=4)
+            json.dump(report_data, f, indent=4, default=as_dict)
         print(f"  ✅ Report written successfully to: {output_path}")
     except IOError as e:
         print(f"  ❌ Error writing report file: {e}")
-        
\ No newline at end of file
+
+
+class NDJSONReportWriter:
+    """
+    Streams a report as newline-delimited JSON: one issue object per line,
+    flushed as soon as it is written, followed by a single {"metadata": ...}
+    trailer line. A partially written file is still readable (and tail -f-able).
+    """
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self._file = open(output_path, 'w', encoding='utf-8')
+
+    def write_issue(self, issue: Dict[str, Any]):
+        self._file.write(json.dumps(as_dict(issue), separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None):
+        if self._file.closed:
+            return
+        if metadata is not None:
+            self._file.write(json.dumps({"metadata": metadata}, separators=(",", ":")) + "\n")
+        self._file.close()
+
+    def abort(self):
+        # Whatever was streamed so far stays usable; there is just no trailer
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def _replacement_mode(path: str) -> int:
+    """The permissions for a file replacing path: its current ones, or what open() would create."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+class JSONReportWriter:
+    """
+    Streams a regular (indented) JSON report issue by issue into a temp file,
+    so the issue list never has to be held in memory. The temp file replaces
+    the report atomically on close; an aborted run leaves the old report intact.
+    """
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, self._tmp_path = tempfile.mkstemp(dir=directory, prefix=".report-", suffix=".tmp")
+        self._file = os.fdopen(fd, 'w', encoding='utf-8')
+        self._file.write('{\n    "issues": [')
+        self._count = 0
+
+    def write_issue(self, issue: Dict[str, Any]):
+        separator = "," if self._count else ""
+        body = json.dumps(as_dict(issue), indent=4).replace("\n", "\n        ")
+        self._file.write(f"{separator}\n        {body}")
+        self._count += 1
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None):
+        if self._file.closed:
+            return
+        body = json.dumps(metadata or {}, indent=4).replace("\n", "\n    ")
+        closing = "\n    ]" if self._count else "]"
+        self._file.write(f'{closing},\n    "metadata": {body}\n}}\n')
+        self._file.close()
+        # mkstemp creates the file 0600; the report should stay as readable as before
+        os.chmod(self._tmp_path, _replacement_mode(self.output_path))
+        os.replace(self._tmp_path, self.output_path)
+
+    def abort(self):
+        self._file.close()
+        os.unlink(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class TeeReportWriter:
+    """Streams one report into several writers, e.g. the report file and the history store."""
+    def __init__(self, *writers):
+        self.writers = writers
+
+    def write_issue(self, issue: Dict[str, Any]):
+        for writer in self.writers:
+            writer.write_issue(issue)
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None):
+        for writer in self.writers:
+            writer.close(metadata)
+
+    def abort(self):
+        for writer in self.writers:
+            writer.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+REPORT_FORMATS = ("json", "ndjson", "parquet")
+REPORT_EXTENSIONS = {"json": ".json", "ndjson": ".ndjson", "parquet": ".parquet"}
+
+def open_report_writer(output_path: str, fmt: str = "json"):
+    """Returns a streaming writer (write_issue / close(metadata)) for the given format."""
+    if fmt == "parquet":
+        # pyarrow is optional and only imported when the columnar format is requested
+        from core.report.columnar_reporter import ParquetReportWriter
+        return ParquetReportWriter(output_path)
+    if fmt == "ndjson":
+        return NDJSONReportWriter(output_path)
+    return JSONReportWriter(output_path)
+
+def read_ndjson_report(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Reads an NDJSON report into (metadata, issues). A report from an interrupted
+    run has no trailer and may end in a truncated line; both are tolerated.
+    """
+    metadata: Dict[str, Any] = {}
+    issues = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "metadata" in record and "type" not in record:
+                metadata = record["metadata"]
+            else:
+                issues.append(record)
+    return metadata, issues
+
+def load_report(path: str, with_updates: bool = True) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Loads a JSON, NDJSON or Parquet report (detected by extension) into (metadata, issues).
+    Per-file updates appended by watch mode are applied unless with_updates is False.
+    """
+    if path.endswith((".ndjson", ".jsonl")):
+        metadata, issues = read_ndjson_report(path)
+    elif path.endswith(".parquet"):
+        from core.report.columnar_reporter import read_parquet_report
+        metadata, frame = read_parquet_report(path)
+        issues = frame.to_dict("records")
+        for issue in issues:
+            if issue.get("fix_patch"):
+                issue["fix_patch"] = json.loads(issue["fix_patch"])
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            report_data = json.load(f)
+        metadata, issues = report_data.get('metadata', {}), report_data.get('issues', [])
+    if with_updates:
+        updates, _ = read_report_updates(path)
+        metadata, issues = apply_report_updates(metadata, issues, updates)
+    return metadata, issues
@@ -0,0 +1,128 @@
+# ai-code-reviewer/core/report/update_log.py
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.models import as_dict
+
+UPDATES_SUFFIX = ".updates.ndjson"
+
+
+def updates_path(report_path: str) -> str:
+    """Per-file updates to a report are appended next to it."""
+    return report_path + UPDATES_SUFFIX
+
+
+def _report_identity(report_path: str) -> Optional[Dict[str, int]]:
+    try:
+        stat = os.stat(report_path)
+    except OSError:
+        return None
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class ReportUpdateLog:
+    """
+    Append-only journal of per-file replacements for a written report, used
+    by watch mode: re-analyzing one file appends one line instead of
+    rewriting the whole report. The header names the report it applies to
+    (size and mtime), so a journal left behind by an older report is ignored.
+    """
+    def __init__(self, report_path: str):
+        self.report_path = report_path
+        self.path = updates_path(report_path)
+        self.entries = 0
+        self._file = None
+        self.reset()
+
+    def reset(self):
+        """Starts an empty journal for the report as it is on disk now (after it was rewritten)."""
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write(json.dumps({"base": _report_identity(self.report_path)}) + "\n")
+        self._file.flush()
+        self.entries = 0
+
+    def append(self, file_path: str, issues: Optional[List[Dict[str, Any]]], summary: Optional[Dict[str, Any]] = None):
+        """Replaces every issue of file_path; issues=None records that the file was removed."""
+        entry: Dict[str, Any] = {"file": file_path}
+        if issues is None:
+            entry["removed"] = True
+        else:
+            entry["issues"] = [as_dict(issue) for issue in issues]
+            entry["summary"] = summary
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        # Readers poll the journal's mtime, so every entry is visible as soon as it is written
+        self._file.flush()
+        self.entries += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_report_updates(report_path: str, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Journal entries from byte 'offset' on, and the offset to resume from.
+    Only complete lines are consumed, so a reader racing the writer never
+    sees half an entry. A missing or stale journal yields nothing.
+    """
+    path = updates_path(report_path)
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return [], offset
+    entries = []
+    with f:
+        if offset == 0:
+            header = f.readline()
+            if not header.endswith(b"\n"):
+                return [], 0
+            try:
+                base = json.loads(header).get("base")
+            except ValueError:
+                return [], 0
+            if base != _report_identity(report_path):
+                return [], 0
+            offset = f.tell()
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries, offset
+
+
+def apply_report_updates(metadata: Dict[str, Any], issues: List[Dict[str, Any]],
+                         entries: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Replays journal entries onto a loaded report, one file at a time, keeping file order."""
+    if not entries:
+        return metadata, issues
+    by_file: Dict[str, List[Dict[str, Any]]] = {}
+    for issue in issues:
+        by_file.setdefault(issue.get('file') or metadata.get('file'), []).append(issue)
+    summaries = {summary["path"]: summary for summary in metadata.get("files", [])}
+
+    for entry in entries:
+        path = entry["file"]
+        if entry.get("removed"):
+            by_file.pop(path, None)
+            summaries.pop(path, None)
+        else:
+            by_file[path] = entry["issues"]
+            if entry.get("summary"):
+                summaries[path] = entry["summary"]
+
+    order = sorted(set(by_file) | set(summaries))
+    issues = [issue for path in order for issue in by_file.get(path, [])]
+    metadata = dict(metadata)
+    metadata["files"] = [summaries[path] for path in order if path in summaries]
+    metadata["total_files"] = len(metadata["files"])
+    metadata["total_issues"] = len(issues)
+    return metadata, issues
@@ -0,0 +1,158 @@
+# ai-code-reviewer/core/service.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.analysis.analyzer import Analyzer
+from core.analysis.parallel_runner import get_detector_set
+from core.analysis.pipeline import prepare_fixes
+from core.autofix.fixer import Fixer
+from core.autofix.rules import RuleTable
+from core.llm.async_enricher import AsyncEnricher
+from core.llm.suggestion_cache import SuggestionCache
+from core.llm.suggestion_generator import SuggestionGenerator
+from core.models import Issue
+from core.parser.source_document import SourceDocument
+from core import telemetry
+
+# Analysis results kept per distinct file content
+DEFAULT_PARSE_CACHE_SIZE = 512
+
+
+class ReviewService:
+    """
+    Warm state behind the review daemon: the detector set, the LLM client with
+    its connection pool, the suggestion cache and an LRU of per-file analysis
+    results keyed by content hash, so repeated requests for an unchanged file
+    or buffer skip parsing and detection entirely.
+    """
+    def __init__(
+        self,
+        detector_config: Optional[Dict[str, Any]] = None,
+        generator: Optional[SuggestionGenerator] = None,
+        cache: Optional[SuggestionCache] = None,
+        enricher_options: Optional[Dict[str, Any]] = None,
+        parse_cache_size: int = DEFAULT_PARSE_CACHE_SIZE,
+        rules: Optional[RuleTable] = None,
+    ):
+        self.detectors = get_detector_set(detector_config)
+        # Suggestion rules answer well-known literals during fix preparation
+        self.rules = rules
+        self.analysis_version = self.detectors.version + (f";rules={rules.version}" if rules is not None else "")
+        self.generator = generator
+        self.cache = cache
+        self.enricher = AsyncEnricher(generator, **(enricher_options or {})) if generator is not None else None
+        self.parse_cache_size = max(0, parse_cache_size)
+        self.parse_cache_hits = 0
+        self.parse_cache_misses = 0
+        self.started = time.time()
+        # (sha256, analysis version) -> issues with prepared fixes, without the 'file' tag
+        self._results: "OrderedDict[Tuple[str, str], List[Issue]]" = OrderedDict()
+        # Sync endpoints run in a thread pool
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load(path: Optional[str] = None, code: Optional[str] = None) -> SourceDocument:
+        """A document for either a file on disk or an in-memory buffer (exactly one of the two)."""
+        if (path is None) == (code is None):
+            raise ValueError("Provide exactly one of 'path' or 'code'.")
+        if path is not None:
+            return SourceDocument.from_path(path)
+        return SourceDocument.from_text(code)
+
+    def analyze(self, path: Optional[str] = None, code: Optional[str] = None,
+                filename: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Returns (issues with prepared fixes, served_from_cache) for a file or buffer."""
+        name = filename or path or "<buffer>"
+        document = self.load(path, code)
+        try:
+            key = (document.sha256, self.analysis_version)
+            with self._lock:
+                cached = self._results.get(key)
+                hit = cached is not None
+                if hit:
+                    self._results.move_to_end(key)
+                    self.parse_cache_hits += 1
+                else:
+                    self.parse_cache_misses += 1
+
+            if not hit:
+                with telemetry.span("service_analyze"):
+                    analyzer = Analyzer(document, filename=name, detectors=self.detectors)
+                    cached = list(prepare_fixes(analyzer.iter_issues(), Fixer(document, rules=self.rules)))
+                if self.parse_cache_size:
+                    with self._lock:
+                        self._results[key] = cached
+                        while len(self._results) > self.parse_cache_size:
+                            self._results.popitem(last=False)
+        finally:
+            document.close()
+
+        # Callers get their own JSON-ready copies; the cached Issue objects are never mutated
+        issues = [issue.to_dict() for issue in cached]
+        for issue in issues:
+            issue['file'] = name
+        return issues, hit
+
+    async def enrich(self, issues: List[Dict[str, Any]], path: Optional[str] = None,
+                     code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fills in LLM suggestions for issues found in the given file or buffer."""
+        if self.enricher is None:
+            raise RuntimeError("LLM enrichment is not configured for this server.")
+        document = self.load(path, code)
+        try:
+            with telemetry.span("service_enrich"):
+                await self.enricher.enrich_async([(issue, document) for issue in issues])
+        finally:
+            document.close()
+        return issues
+
+    def apply_fixes(self, path: Optional[str] = None, code: Optional[str] = None,
+                    issues: Optional[List[Dict[str, Any]]] = None) -> Tuple[int, Optional[str]]:
+        """
+        Applies prepared fixes (by default every fix the analysis prepares).
+        Files are rewritten in place and (applied, None) is returned; for a
+        buffer the rewritten code comes back as (applied, new_code) instead.
+        """
+        if issues is None:
+            issues, _ = self.analyze(path=path, code=code)
+        prepared = [issue for issue in issues if issue.get('autofix_status') == 'Prepared' and 'fix_patch' in issue]
+        if (path is None) == (code is None):
+            raise ValueError("Provide exactly one of 'path' or 'code'.")
+        with telemetry.span("service_fix_apply"):
+            if path is not None:
+                return Fixer.apply_fixes_to_file(path, prepared), None
+            new_code, applied = Fixer.apply_fixes_to_code(code, prepared)
+        return applied, new_code
+
+    def health(self) -> Dict[str, Any]:
+        generator = self.generator
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "detectors": self.detectors.names,
+            "detector_version": self.detectors.version,
+            "suggestion_rules": len(self.rules) if self.rules is not None else 0,
+            "llm": {
+                "configured": generator is not None,
+                "available": bool(generator and generator.available),
+                "backend": generator.backend.describe() if generator else None,
+                "model": generator.model if generator else None,
+            },
+            "llm_cache": self.cache.stats() if self.cache is not None else {"enabled": False},
+            "parse_cache": {
+                "entries": len(self._results),
+                "max_entries": self.parse_cache_size,
+                "hits": self.parse_cache_hits,
+                "misses": self.parse_cache_misses,
+            },
+        }
+
+    async def aclose(self):
+        """Releases the LLM connection pool (on the server's loop) and the cache."""
+        if self.generator is not None:
+            await self.generator.aclose()
+            self.generator.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,216 @@
+# ai-code-reviewer/core/telemetry.py
+import json
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+# Histogram upper bounds for durations, in seconds
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Histogram upper bounds for token counts
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+# Histogram upper bounds for attempts per LLM request (1 = no retries)
+ATTEMPT_BUCKETS = (1, 2, 3, 4, 5, 8)
+
+METRIC_PREFIX = "code_reviewer"
+
+
+def series_name(name: str, labels: Optional[Dict[str, Any]] = None) -> str:
+    """Prometheus-style series id, e.g. stage_seconds{stage="parse"}."""
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+def split_series(series: str) -> Tuple[str, str]:
+    """Splits a series id into (metric name, label block without braces)."""
+    name, _, labels = series.partition("{")
+    return name, labels.rstrip("}")
+
+
+class Histogram:
+    """Fixed-bucket histogram with exact count, sum, min and max."""
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, buckets: Sequence[float] = SECONDS_BUCKETS):
+        self.buckets = tuple(buckets)
+        # One slot per bucket plus the +Inf overflow slot
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None or value < self.min else self.min
+        self.max = value if self.max is None or value > self.max else self.max
+
+    def quantile(self, q: float) -> float:
+        """Estimates the q-quantile (0..1) by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= target:
+                lower = self.buckets[index - 1] if index else (self.min or 0.0)
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (target - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+
+    def merge(self, other: Dict[str, Any]):
+        """Adds a histogram exported with to_dict() (e.g. from a worker process)."""
+        if tuple(other["buckets"]) != self.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [a + b for a, b in zip(self.counts, other["counts"])]
+        self.count += other["count"]
+        self.sum += other["sum"]
+        for attr, pick in (("min", min), ("max", max)):
+            value = other[attr]
+            if value is not None:
+                current = getattr(self, attr)
+                setattr(self, attr, value if current is None else pick(current, value))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "count": self.count,
+                "sum": self.sum, "min": self.min, "max": self.max}
+
+
+class Telemetry:
+    """
+    In-process registry of counters and histograms.
+    Worker processes collect into their own registry and ship a snapshot()
+    back to the parent, which merge()s it.
+    """
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+    def incr(self, name: str, value: float = 1, **labels):
+        series = series_name(name, labels)
+        self.counters[series] = self.counters.get(series, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = SECONDS_BUCKETS, **labels):
+        series = series_name(name, labels)
+        histogram = self.histograms.get(series)
+        if histogram is None:
+            histogram = self.histograms[series] = Histogram(buckets)
+        histogram.observe(value)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Times the enclosed block into the stage_seconds histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "histograms": {series: histogram.to_dict() for series, histogram in self.histograms.items()},
+        }
+
+    def merge(self, snapshot: Dict[str, Any]):
+        for series, value in snapshot.get("counters", {}).items():
+            self.counters[series] = self.counters.get(series, 0) + value
+        for series, data in snapshot.get("histograms", {}).items():
+            histogram = self.histograms.get(series)
+            if histogram is None:
+                histogram = self.histograms[series] = Histogram(data["buckets"])
+            histogram.merge(data)
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Total seconds recorded per span stage."""
+        totals = {}
+        for series, histogram in self.histograms.items():
+            name, labels = split_series(series)
+            if name == "stage_seconds":
+                totals[labels.partition('"')[2].rstrip('"')] = histogram.sum
+        return totals
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact view for report metadata: counters plus count/sum/mean/p50/p99/max per histogram."""
+        histograms = {}
+        for series, histogram in sorted(self.histograms.items()):
+            histograms[series] = {
+                "count": histogram.count,
+                "sum": round(histogram.sum, 6),
+                "mean": round(histogram.sum / histogram.count, 6) if histogram.count else 0.0,
+                "p50": round(histogram.quantile(0.5), 6),
+                "p99": round(histogram.quantile(0.99), 6),
+                "max": round(histogram.max, 6) if histogram.max is not None else None,
+            }
+        return {"counters": dict(sorted(self.counters.items())), "histograms": histograms}
+
+    def to_prometheus(self, prefix: str = METRIC_PREFIX) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        typed = set()
+        for series, value in sorted(self.counters.items()):
+            name, labels = split_series(series)
+            if name not in typed:
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                typed.add(name)
+            lines.append(f"{prefix}_{name}{{{labels}}} {value}" if labels else f"{prefix}_{name} {value}")
+
+        for series, histogram in sorted(self.histograms.items()):
+            name, labels = split_series(series)
+            if name not in typed:
+                lines.append(f"# TYPE {prefix}_{name} histogram")
+                typed.add(name)
+            label_prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, bucket_count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'{prefix}_{name}_bucket{{{label_prefix}le="{bound}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{prefix}_{name}_sum{suffix} {histogram.sum}")
+            lines.append(f"{prefix}_{name}_count{suffix} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Exports to a Prometheus text file (.prom) or, for any other extension, JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith(".prom"):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.snapshot(), f, indent=4)
+
+
+# The registry instrumented code records into; swapped per chunk in worker processes
+_current = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    return _current
+
+
+@contextmanager
+def collect() -> Iterator[Telemetry]:
+    """Routes all recording inside the block into a fresh registry."""
+    global _current
+    previous, _current = _current, Telemetry()
+    try:
+        yield _current
+    finally:
+        _current = previous
+
+
+def incr(name: str, value: float = 1, **labels):
+    _current.incr(name, value, **labels)
+
+
+def observe(name: str, value: float, buckets: Sequence[float] = SECONDS_BUCKETS, **labels):
+    _current.observe(name, value, buckets, **labels)
+
+
+def span(stage: str):
+    return _current.span(stage)
@@ -3,67 +3,154 @@ import streamlit as st
 import json
 import pandas as pd
 import os
+import sys
+import time
+
+# `streamlit run dashboard/app.py` only puts dashboard/ on sys.path; the report readers live in core/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 REPORT_PATH = "code_reviewer_report.json"
+# Written by `python -m cli.main --history-db`; queried with SQL instead of being loaded into pandas
+HISTORY_PATH = "code_reviewer_history.sqlite3"
+# Runs offered in the run pickers
+HISTORY_RUNS = 200
+# Tried in order when the configured report doesn't exist
+FALLBACK_REPORT_PATHS = ["code_reviewer_report.parquet", "code_reviewer_report.ndjson"]
+PAGE_SIZES = [10, 25, 50, 100]
+# Seconds between reruns while "Live updates" is on
+LIVE_REFRESH_SECONDS = 1.0
+
+# Report fields -> dashboard column names
+COLUMN_NAMES = {
+    "file": "File",
+    "line": "Line",
+    "type": "Type",
+    "value": "Detected Value",
+    "message": "Message",
+    "suggestion": "AI Suggestion",
+    "autofix_status": "Fix Status",
+    "autofix_description": "Fix Description",
+}
+
+def resolve_report_path(path):
+    """Returns the configured report, or the first existing fallback format."""
+    if os.path.exists(path):
+        return path
+    for candidate in FALLBACK_REPORT_PATHS:
+        if os.path.exists(candidate):
+            return candidate
+    return path
+
+def issues_frame(metadata, issues):
+    """Builds the dashboard's DataFrame from issue dicts, one column per displayed field."""
+    # Build columns directly instead of copying each issue dict into a new row dict
+    return prepare_frame(pd.DataFrame.from_records(issues, columns=list(COLUMN_NAMES)), metadata)
+
+def prepare_frame(df, metadata):
+    df = df.rename(columns=COLUMN_NAMES)
+    # Older single-file reports don't tag issues with a file
+    df["File"] = df["File"].fillna(metadata.get("file", "N/A"))
+    # Mixed int/float literals are displayed as text
+    df["Detected Value"] = df["Detected Value"].fillna("N/A").astype(str)
+    return df.fillna({"AI Suggestion": "N/A", "Fix Status": "N/A", "Fix Description": "N/A", "Message": ""})
+
+@st.cache_data(show_spinner="Loading report...", max_entries=4)
+def load_report_frame(path, mtime_ns):
+    """
+    Loads a report into (metadata, DataFrame) with one column per field.
+    Cached per (path, mtime_ns), so Streamlit reruns reuse the parsed report
+    until the file on disk changes. Watch-mode updates are applied separately
+    (see apply_live_updates).
+    """
+    if path.endswith(".parquet"):
+        from core.report.columnar_reporter import read_parquet_report
+        # Columnar reports load only the columns the dashboard displays
+        metadata, df = read_parquet_report(path, columns=list(COLUMN_NAMES))
+        return metadata, prepare_frame(df, metadata)
+    from core.report.json_reporter import load_report
+    metadata, issues = load_report(path, with_updates=False)
+    return metadata, issues_frame(metadata, issues)
+
+def apply_live_updates(path, mtime_ns, metadata, df):
+    """
+    Applies the per-file updates `--watch` appends next to the report. Only
+    the bytes added since the last rerun are read (tracked in the session,
+    per report version), and only the changed files' rows are replaced.
+    """
+    from core.report.update_log import apply_report_updates, read_report_updates, updates_path
+    try:
+        journal_mtime = os.stat(updates_path(path)).st_mtime_ns
+    except OSError:
+        return metadata, df
+    state = st.session_state.get("live_updates")
+    if state is None or state["report"] != (path, mtime_ns):
+        state = {"report": (path, mtime_ns), "journal_mtime": None, "offset": 0, "metadata": metadata, "df": df}
+        st.session_state["live_updates"] = state
+    if state["journal_mtime"] == journal_mtime:
+        return state["metadata"], state["df"]
+
+    entries, state["offset"] = read_report_updates(path, state["offset"])
+    state["journal_mtime"] = journal_mtime
+    if entries:
+        frame = state["df"]
+        changed = {entry["file"] for entry in entries}
+        latest = {entry["file"]: entry for entry in entries}
+        parts = [frame[~frame["File"].isin(changed)]]
+        # Every entry replaces one file, so its rows default to that file
+        parts += [issues_frame({"file": path}, entry["issues"])
+                  for path, entry in latest.items() if not entry.get("removed")]
+        frame = pd.concat(parts, ignore_index=True).sort_values(["File", "Line"], kind="stable", ignore_index=True)
+        updated, _ = apply_report_updates(state["metadata"], [], entries)
+        updated["total_issues"] = len(frame)
+        state["metadata"], state["df"] = updated, frame
+    return state["metadata"], state["df"]
 
 def load_report(path):
-    """Loads the JSON report and returns the metadata and issues."""
+    """Loads the report and returns the metadata and the issue DataFrame."""
+    path = resolve_report_path(path)
     if not os.path.exists(path):
         st.error(f"Error: Report file not found at {path}. Please run the CLI analysis first.")
-        return None, []
-    
+        return None, pd.DataFrame()
+
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            report_data = json.load(f)
-            return report_data.get('metadata', {}), report_data.get('issues', [])
+        mtime_ns = os.stat(path).st_mtime_ns
+        metadata, df = load_report_frame(path, mtime_ns)
+        return apply_live_updates(path, mtime_ns, metadata, df)
     except json.JSONDecodeError:
         st.error(f"Error: Invalid JSON format in {path}.")
-        return None, []
+        return None, pd.DataFrame()
     except Exception as e:
         st.error(f"An error occurred while loading the report: {e}")
-        return None, []
-
-def create_issue_dataframe(issues):
-    """Converts the list of issues into a DataFrame for display."""
-    if not issues:
-        return pd.DataFrame()
-
-    data = []
-    for issue in issues:
-        data.append({
-            "Line": issue.get('line', 'N/A'),
-            "Type": issue.get('type', 'N/A'),
-            "Detected Value": issue.get('value', 'N/A'),
-            "Message": issue.get('message', ''),
-            "AI Suggestion": issue.get('suggestion', 'N/A'),
-            "Fix Status": issue.get('autofix_status', 'N/A'),
-            "Fix Description": issue.get('autofix_description', 'N/A'),
-        })
-    
-    df = pd.DataFrame(data)
-    
-    return df
+        return None, pd.DataFrame()
 
-st.set_page_config(
-    page_title="AI Code Review Dashboard", 
-    page_icon="🤖", 
-    layout="wide"
-)
+def filter_issues(df, files, types, statuses):
+    """Applies the sidebar filters with one vectorized mask."""
+    mask = pd.Series(True, index=df.index)
+    if files:
+        mask &= df["File"].isin(files)
+    if types:
+        mask &= df["Type"].isin(types)
+    if statuses:
+        mask &= df["Fix Status"].isin(statuses)
+    return df[mask]
 
-# --- Main Dashboard Logic ---
-st.title("🤖 AI Code Reviewer Dashboard")
+@st.cache_resource
+def open_history(path):
+    """One read-only connection per history database, shared by reruns (new runs show up through WAL)."""
+    from core.report.history_store import HistoryStore
+    return HistoryStore(path, readonly=True)
 
-metadata, issues = load_report(REPORT_PATH)
+def paginate(total, label="Issues per page"):
+    """Page controls; returns (offset, limit) of the visible page."""
+    page_col, size_col = st.columns([3, 1])
+    page_size = size_col.selectbox(label, PAGE_SIZES, index=1)
+    total_pages = max(1, -(-total // page_size))
+    page = page_col.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1, step=1)
+    return (page - 1) * page_size, page_size
 
-if issues:
-    st.subheader(f"Results for: `{metadata.get('file', 'N/A')}`")
-    st.metric(label="Total Issues Found", value=metadata.get('total_issues', 0))
-    st.markdown("---")
-    
-    df = create_issue_dataframe(issues)
-    
+def show_issue_table(df):
     st.dataframe(
-        df[['Line', 'Type', 'Detected Value', 'Message', 'Fix Status']],
+        df[['File', 'Line', 'Type', 'Detected Value', 'Message', 'Fix Status']],
         use_container_width=True,
         hide_index=True,
         column_config={
@@ -71,19 +158,17 @@ if issues:
             "Detected Value": st.column_config.TextColumn("Value", help="The detected numerical value"),
         }
     )
-    
 
-    st.subheader("Detailed Review & Solutions")
-    
-    # Display details using expanders
-    for index, row in df.iterrows():
-        with st.expander(f"Code Smell L{row['Line']}: {row['Type']} ({row['Detected Value']})"):
+def show_issue_details(rows):
+    """One expander per issue with its suggestion and fix status."""
+    for row in rows:
+        with st.expander(f"Code Smell {row['File']}:L{row['Line']}: {row['Type']} ({row['Detected Value']})"):
             st.markdown(f"**Issue:** {row['Message']}")
-            
+
             # --- AI Suggestion ---
             st.markdown("##### 🧠 AI Suggestion")
             st.info(row['AI Suggestion'])
-            
+
             # --- Auto-Fix Status ---
             if row['Fix Status'] == 'Prepared':
                 st.markdown("##### 🔧 Auto-Fix Patch")
@@ -93,16 +178,146 @@ if issues:
                 st.markdown("##### ❌ Auto-Fix Status")
                 st.warning(f"**Status:** {row['Fix Status']}. Manual refactoring is required.")
 
+def show_report(report_path):
+    """The latest report file, loaded into a DataFrame and filtered in memory."""
+    metadata, df = load_report(report_path)
+    if df.empty:
+        st.info("No issues found in the latest report, or the report file is missing/empty.")
+        return
+
+    st.subheader(f"Results for: `{metadata.get('file', 'N/A')}`")
+    st.metric(label="Total Issues Found", value=metadata.get('total_issues', len(df)))
+    st.markdown("---")
+
+    # --- Filters ---
+    st.sidebar.title("Filters")
+    selected_files = st.sidebar.multiselect("File", sorted(df["File"].unique()))
+    selected_types = st.sidebar.multiselect("Type", sorted(df["Type"].unique()))
+    selected_statuses = st.sidebar.multiselect("Fix Status", sorted(df["Fix Status"].unique()))
+    filtered = filter_issues(df, selected_files, selected_types, selected_statuses)
+
+    st.caption(f"Showing {len(filtered)} of {len(df)} issue(s).")
+    # --- Pagination: only the visible page is sent to the browser, table and expanders alike ---
+    offset, limit = paginate(len(filtered))
+    page = filtered.iloc[offset:offset + limit]
+    show_issue_table(page)
+
+    st.subheader("Detailed Review & Solutions")
+    show_issue_details(page.to_dict("records"))
+
+def run_label(run):
+    kind = f"diff {run['diff_spec']}" if run["diff_spec"] else "full"
+    return f"#{run['id']} · {run['finished_at']} UTC · {run['total_issues']} issue(s) · {kind}"
+
+def show_history(history_path):
+    """
+    Runs recorded in the review history. Filters, counts and pages are SQL
+    queries against the indexed store, so only the visible page is loaded.
+    """
+    if not os.path.exists(history_path):
+        st.info(f"No review history at {history_path}. Record runs with `python -m cli.main <paths> --history-db`.")
+        return
+    try:
+        store = open_history(history_path)
+        runs = store.runs(limit=HISTORY_RUNS)
+    except Exception as e:
+        st.error(f"An error occurred while opening the review history: {e}")
+        return
+    if not runs:
+        st.info("The review history has no completed runs yet.")
+        return
+
+    by_id = {run["id"]: run for run in runs}
+    run_id = st.sidebar.selectbox("Run", list(by_id), format_func=lambda key: run_label(by_id[key]))
+    run = by_id[run_id]
+    # Diff runs hold only changed lines, so the previous full run is the natural baseline for a full run
+    earlier = [other for other in runs if other["id"] < run_id and bool(other["diff_spec"]) == bool(run["diff_spec"])]
+    previous = earlier[0] if earlier else None
+
+    st.subheader(f"Run #{run_id}: {run['finished_at']} UTC")
+    issues_col, files_col = st.columns(2)
+    issues_col.metric(label="Total Issues Found", value=run["total_issues"],
+                      delta=run["total_issues"] - previous["total_issues"] if previous else None,
+                      delta_color="inverse")
+    files_col.metric(label="Files Analyzed", value=run["total_files"])
+    st.markdown("---")
+
+    st.sidebar.title("Filters")
+    filters = {
+        "file": st.sidebar.multiselect("File", store.distinct(run_id, "file")),
+        "type": st.sidebar.multiselect("Type", store.distinct(run_id, "type")),
+        "autofix_status": st.sidebar.multiselect("Fix Status", store.distinct(run_id, "autofix_status")),
+    }
+    issues_tab, compare_tab, trend_tab = st.tabs(["Issues", "Compare runs", "Trends"])
+
+    with issues_tab:
+        total = store.count_issues(run_id, filters)
+        st.caption(f"{total} of {run['total_issues']} issue(s) match the filters.")
+        offset, limit = paginate(total)
+        page = issues_frame({}, store.issues(run_id, filters, limit=limit, offset=offset))
+        show_issue_table(page)
+        st.subheader("Detailed Review & Solutions")
+        show_issue_details(page.to_dict("records"))
+
+    with compare_tab:
+        others = [other["id"] for other in runs if other["id"] != run_id]
+        if not others:
+            st.info("Record another run to compare against.")
+        else:
+            default = others.index(previous["id"]) if previous else 0
+            base_id = st.selectbox("Compare with", others, index=default, format_func=lambda key: run_label(by_id[key]))
+            changes = pd.DataFrame(store.compare_runs(base_id, run_id), columns=["file", "base", "head", "delta"])
+            regressed = int((changes["delta"] > 0).sum())
+            st.caption(f"{regressed} file(s) regressed and {len(changes) - regressed} improved since run #{base_id}.")
+            st.dataframe(
+                changes.rename(columns={"file": "File", "base": f"Run #{base_id}", "head": f"Run #{run_id}",
+                                        "delta": "Change"}),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+    with trend_tab:
+        # A single selected file gets its own trend; otherwise the whole project's
+        trend_file = filters["file"][0] if len(filters["file"]) == 1 else None
+        trend = pd.DataFrame(store.trend(file=trend_file), columns=["run_id", "finished_at", "total_issues"])
+        st.caption(f"Issues per full run{f' in {trend_file}' if trend_file else ''} (diff runs are left out).")
+        if not trend.empty:
+            st.line_chart(trend.set_index("run_id")["total_issues"])
+
+st.set_page_config(
+    page_title="AI Code Review Dashboard",
+    page_icon="🤖",
+    layout="wide"
+)
+
+# --- Main Dashboard Logic ---
+st.title("🤖 AI Code Reviewer Dashboard")
+
+sources = ["Latest report", "Review history"]
+source = st.sidebar.radio("Source", sources, index=1 if os.path.exists(HISTORY_PATH) else 0)
+live_updates = False
+if source == "Review history":
+    history_path = st.sidebar.text_input("History database", value=HISTORY_PATH)
+    show_history(history_path)
 else:
-    st.info("No issues found in the latest report, or the report file is missing/empty.")
+    report_path = st.sidebar.text_input("Report path", value=REPORT_PATH)
+    live_updates = st.sidebar.checkbox("Live updates", value=False,
+                                       help="Follow a `--watch` session: re-check the report every second.")
+    show_report(report_path)
 
 # Add instructions for running the dashboard
 st.sidebar.title("App Instructions")
 st.sidebar.markdown(
     """
-    1.  Run the CLI tool to generate the report:  
+    1.  Run the CLI tool to generate the report:
         `python -m cli.main sample_project/example.py`
-    2.  Start this dashboard:  
+        (add `--history-db` to keep every run for comparisons and trends)
+    2.  Start this dashboard:
         `streamlit run dashboard/app.py`
     """
-)
\ No newline at end of file
+)
+
+if live_updates:
+    # Unchanged reruns cost two stat() calls: the report and its update journal are only re-read when modified
+    time.sleep(LIVE_REFRESH_SECONDS)
+    (st.rerun if hasattr(st, "rerun") else st.experimental_rerun)()